@@ -1,155 +1,356 @@
+import os
+import copy
 import sys
+import uuid
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
-from threading import Lock
-from crewai import Crew, Process
+from threading import Event, Lock
 
 
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root / "jobapp_agent" / "src"))
 from jobapp_agent.crew import JobappAgent
+from jobapp_agent.optimization import optimize_unprocessed_jobs
+from jobapp_agent.events import event_bus, current_run_id, JOBS_SAVED, CV_SAVED, AGENT_STATUS, SEARCH_CACHE_LOOKUP
+from jobapp_agent.tracing import tracer
+from database import DatabaseManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class AgentRunner:
-    """Handles background execution of the CrewAI agent system"""
+RUN_QUEUED = "queued"
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_ERROR = "error"
+RUN_CANCELLED = "cancelled"
+FINISHED_STATES = (RUN_COMPLETED, RUN_ERROR, RUN_CANCELLED)
+
+RUN_KIND_AGENT = "agent"
+RUN_KIND_CV_GENERATION = "cv_generation"
+
+DEFAULT_MAX_CONCURRENT_RUNS = 1
+MAX_TRACKED_RUNS = 100  # finished runs kept in memory; older ones are read from agent_runs
+
+class RunCancelled(Exception):
+    """Raised inside a running crew once cancellation of its run was requested"""
+
+class AgentRun:
+    """A single queued or executed agent run with its timings and progress counters"""
     
-    def __init__(self):
-        self.executor = ThreadPoolExecutor(max_workers=1)
-        self.status = "idle"  # idle, running, completed, error
-        self.status_lock = Lock()
-        self.current_task = None
-        self.error_message = None
+    def __init__(self, kind: str):
+        self.run_id = uuid.uuid4().hex
+        self.kind = kind
+        self.state = RUN_QUEUED
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
         self.jobs_found = 0
         self.cvs_created = 0
+        self.error: Optional[str] = None
+        self.summary: Dict = {"search_cache": {"hits": 0, "misses": 0}}
+        self.cancel_requested = Event()
+        self.future = None
+    
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+    
+    def to_dict(self) -> Dict:
+        duration = None
+        if self.started_at is not None:
+            duration = ((self.finished_at or datetime.now()) - self.started_at).total_seconds()
+        return {
+            "run_id": self.run_id,
+            "kind": self.kind,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": duration,
+            "jobs_found": self.jobs_found,
+            "cvs_created": self.cvs_created,
+            "error": self.error,
+            "summary": copy.deepcopy(self.summary)
+        }
+
+class AgentRunner:
+    """Queues agent runs and executes them in the background, several at a time if configured.
+
+    Each start request becomes an AgentRun with its own id, counters and state
+    (queued -> running -> completed/error/cancelled). Runs are persisted to the
+    agent_runs table on every state change so history survives restarts.
+    """
+    
+    def __init__(self, max_concurrent_runs: int = None):
+        if max_concurrent_runs is None:
+            max_concurrent_runs = int(os.getenv("AGENT_MAX_CONCURRENT_RUNS", DEFAULT_MAX_CONCURRENT_RUNS))
+        self.max_concurrent_runs = max(1, max_concurrent_runs)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrent_runs, thread_name_prefix="agent-run")
+        self.runs: "OrderedDict[str, AgentRun]" = OrderedDict()
+        self.status_lock = Lock()
+        self.db = DatabaseManager()
+        event_bus.subscribe(self._on_progress_event)
+        logger.info(f"Agent runner started with {self.max_concurrent_runs} concurrent run slot(s)")
+        
+    def _on_progress_event(self, event: Dict):
+        """Aggregate save and search cache events published by the tools into the counters of their run"""
+        if event["type"] not in (JOBS_SAVED, CV_SAVED, SEARCH_CACHE_LOOKUP):
+            return
+        with self.status_lock:
+            run = self.runs.get(event["data"].get("run_id"))
+            if run is None:
+                # Unattributed event: only safe to count when a single run is active
+                running = [r for r in self.runs.values() if r.state == RUN_RUNNING]
+                run = running[0] if len(running) == 1 else None
+            if run is None or run.state != RUN_RUNNING:
+                return
+            if event["type"] == SEARCH_CACHE_LOOKUP:
+                # Counted into the run summary only; too frequent to push a status update for
+                run.summary["search_cache"]["hits" if event["data"].get("hit") else "misses"] += 1
+                return
+            if event["type"] == JOBS_SAVED:
+                run.jobs_found += event["data"].get("inserted", 0)
+            else:
+                run.cvs_created += 1
+        self._publish_status(run)
+    
+    def _publish_status(self, run: AgentRun):
+        """Push the overall status and the changed run to event subscribers (e.g. SSE clients)"""
+        with self.status_lock:
+            run_data = run.to_dict()
+        event_bus.publish(AGENT_STATUS, run=run_data, **self.get_status())
+    
+    def _persist(self, run: AgentRun):
+        """Write the run to agent_runs; a failed write must not fail the run itself"""
+        with self.status_lock:
+            run_data = run.to_dict()
+        try:
+            self.db.save_agent_run(run_data)
+        except Exception as e:
+            logger.warning(f"Failed to persist agent run {run.run_id}: {e}")
+    
+    def _transition(self, run: AgentRun, state: str, error_message: str = None):
+        with self.status_lock:
+            run.state = state
+            if state == RUN_RUNNING:
+                run.started_at = datetime.now()
+            elif state in FINISHED_STATES:
+                run.finished_at = datetime.now()
+                # Per tool/LLM/task/db span totals, slowest first, to see where the time went
+                run.summary["spans"] = tracer.run_summary(run.run_id)
+                if error_message is not None:
+                    run.error = error_message
+        self._persist(run)
+        self._publish_status(run)
         
     def get_status(self) -> Dict:
-        """Get current agent execution status"""
+        """Get the overall agent status, summed over the active runs"""
         with self.status_lock:
+            running = [r for r in self.runs.values() if r.state == RUN_RUNNING]
+            queued = sum(1 for r in self.runs.values() if r.state == RUN_QUEUED)
+            
+            if running or queued:
+                return {
+                    "status": "running",
+                    "message": self._get_status_message(running, queued),
+                    "jobs_found": sum(r.jobs_found for r in running),
+                    "cvs_created": sum(r.cvs_created for r in running),
+                    "active_runs": len(running),
+                    "queued_runs": queued,
+                    "error": None
+                }
+            
+            finished = [r for r in self.runs.values() if r.finished]
+            if not finished:
+                return {
+                    "status": "idle",
+                    "message": "Agent is ready to start",
+                    "jobs_found": 0,
+                    "cvs_created": 0,
+                    "active_runs": 0,
+                    "queued_runs": 0,
+                    "error": None
+                }
+            
+            last = max(finished, key=lambda r: r.finished_at)
             return {
-                "status": self.status,
-                "message": self._get_status_message(),
-                "jobs_found": self.jobs_found,
-                "cvs_created": self.cvs_created,
-                "error": self.error_message if self.status == "error" else None
+                "status": last.state,
+                "message": self._get_finished_message(last),
+                "jobs_found": last.jobs_found,
+                "cvs_created": last.cvs_created,
+                "active_runs": 0,
+                "queued_runs": 0,
+                "error": last.error if last.state == RUN_ERROR else None
             }
     
-    def _get_status_message(self) -> str:
-        """Get human-readable status message"""
-        if self.status == "idle":
-            return "Agent is ready to start"
-        elif self.status == "running":
-            return "Agent is currently processing jobs and creating CVs"
-        elif self.status == "completed":
-            return f"Agent completed successfully. Found {self.jobs_found} jobs, created {self.cvs_created} CVs"
-        elif self.status == "error":
-            return f"Agent encountered an error: {self.error_message}"
+    def _get_status_message(self, running: List[AgentRun], queued: int) -> str:
+        """Get human-readable status message for active runs"""
+        if not running:
+            return f"{queued} run(s) waiting to start"
+        message = f"{len(running)} run(s) processing jobs and creating CVs"
+        if queued:
+            message += f", {queued} queued"
+        return message
+    
+    def _get_finished_message(self, run: AgentRun) -> str:
+        """Get human-readable status message for the most recently finished run"""
+        if run.state == RUN_COMPLETED:
+            return f"Agent completed successfully. Found {run.jobs_found} jobs, created {run.cvs_created} CVs"
+        elif run.state == RUN_ERROR:
+            return f"Agent encountered an error: {run.error}"
+        elif run.state == RUN_CANCELLED:
+            return "Last agent run was cancelled"
         return "Unknown status"
     
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        """Get live state of a run tracked by this process"""
+        with self.status_lock:
+            run = self.runs.get(run_id)
+            return run.to_dict() if run else None
+    
+    def get_active_runs(self) -> Dict[str, Dict]:
+        """Get live state of all queued and running runs, keyed by run id"""
+        with self.status_lock:
+            return {run_id: run.to_dict() for run_id, run in self.runs.items() if not run.finished}
+    
     def start_agent(self) -> Dict:
-        """Start the agent execution in background"""
+        """Queue a full agent run (job research followed by CV optimization)"""
+        return self._submit(RUN_KIND_AGENT, self._run_agent, "Agent execution")
+    
+    def start_cv_generation(self) -> Dict:
+        """Queue CV generation for unprocessed jobs only"""
+        return self._submit(RUN_KIND_CV_GENERATION, self._run_cv_generation, "CV generation")
+    
+    def _submit(self, kind: str, target, label: str) -> Dict:
+        run = AgentRun(kind)
         with self.status_lock:
-            if self.status == "running":
-                return {
-                    "message": "Agent is already running",
-                    "status": "running"
-                }
-            
-            self.jobs_found = 0
-            self.cvs_created = 0
-            self.error_message = None
-            self.status = "running"
+            self.runs[run.run_id] = run
+            self._trim_finished_runs()
+        self._persist(run)
         
-        self.current_task = self.executor.submit(self._run_agent)
+        run.future = self.executor.submit(self._execute, run, target)
         
-        logger.info("Agent execution started in background")
+        with self.status_lock:
+            state = run.state
+        self._publish_status(run)
+        logger.info(f"{label} run {run.run_id} submitted ({state})")
         return {
-            "message": "Agent execution started successfully",
-            "status": "running"
+            "message": f"{label} {'started' if state == RUN_RUNNING else 'queued'} successfully",
+            "status": state,
+            "task_id": run.run_id
         }
     
-    def start_cv_generation(self) -> Dict:
-        """Start CV generation for unprocessed jobs only"""
+    def _trim_finished_runs(self):
+        finished = [run_id for run_id, run in self.runs.items() if run.finished]
+        for run_id in finished[:max(0, len(finished) - MAX_TRACKED_RUNS)]:
+            del self.runs[run_id]
+    
+    def cancel_run(self, run_id: str) -> Dict:
+        """Cancel a queued run immediately, or ask a running one to stop at its next agent step"""
         with self.status_lock:
-            if self.status == "running":
-                return {
-                    "message": "Agent is already running",
-                    "status": "running"
-                }
-            
-            self.jobs_found = 0
-            self.cvs_created = 0
-            self.error_message = None
-            self.status = "running"
+            run = self.runs.get(run_id)
+            if run is None:
+                raise ValueError(f"Run {run_id} is not active in this process")
+            if run.finished:
+                return run.to_dict()
+            run.cancel_requested.set()
+            # A run still being submitted has no future yet; _execute sees the flag and cancels it
+            cancelled_before_start = (run.state == RUN_QUEUED and run.future is not None
+                                      and run.future.cancel())
         
-        self.current_task = self.executor.submit(self._run_cv_generation)
+        if cancelled_before_start:
+            self._transition(run, RUN_CANCELLED)
+        logger.info(f"Cancellation requested for run {run_id}")
+        return self.get_run(run_id)
+    
+    def _execute(self, run: AgentRun, target):
+        """Run one queued AgentRun on an executor thread"""
+        if run.cancel_requested.is_set():
+            self._transition(run, RUN_CANCELLED)
+            return
         
-        logger.info("CV generation started in background")
+        # Events published by tools on this thread are attributed to this run
+        token = current_run_id.set(run.run_id)
+        self._transition(run, RUN_RUNNING)
+        try:
+            target(run)
+            self._transition(run, RUN_COMPLETED)
+            search_cache = run.summary["search_cache"]
+            logger.info(f"Run {run.run_id} completed successfully "
+                        f"(search cache: {search_cache['hits']} hits, {search_cache['misses']} misses)")
+        except RunCancelled:
+            self._transition(run, RUN_CANCELLED)
+            logger.info(f"Run {run.run_id} cancelled")
+        except Exception as e:
+            if run.cancel_requested.is_set():
+                # The crew may wrap our RunCancelled in its own exception types
+                self._transition(run, RUN_CANCELLED)
+                logger.info(f"Run {run.run_id} cancelled")
+            else:
+                logger.error(f"Run {run.run_id} failed: {e}")
+                self._transition(run, RUN_ERROR, str(e))
+        finally:
+            current_run_id.reset(token)
+    
+    def _cancellation_check(self, run: AgentRun):
+        """Crew step callback that stops the run once cancellation was requested"""
+        def check(step_output):
+            if run.cancel_requested.is_set():
+                raise RunCancelled(f"Run {run.run_id} was cancelled")
+        return check
+    
+    def _crew_inputs(self) -> Dict:
         return {
-            "message": "CV generation started successfully",
-            "status": "running"
+            'topic': 'AI LLMs',
+            'current_year': str(datetime.now().year),
+            'current_date': datetime.now().strftime('%Y-%m-%d'),
+            'current_month': datetime.now().strftime('%Y-%m')
         }
     
-    def _run_cv_generation(self):
-        """Internal method to run only CV generation (optimizer agent)"""
-        try:
-            logger.info("Starting CV generation for unprocessed jobs")
-            
-            inputs = {
-                'topic': 'AI LLMs',
-                'current_year': str(datetime.now().year),
-                'current_date': datetime.now().strftime('%Y-%m-%d'),
-                'current_month': datetime.now().strftime('%Y-%m')
-            }
-            
-            agent_instance = JobappAgent()
-            optimizer_crew = Crew(
-                agents=[agent_instance.optimizer()],
-                tasks=[agent_instance.optimization_task()],
-                process=Process.sequential,
-                verbose=True,
-            )
-            
-            result = optimizer_crew.kickoff(inputs=inputs)
-            
-            with self.status_lock:
-                self.status = "completed"
-                
-            logger.info("CV generation completed successfully")
-            
-        except Exception as e:
-            logger.error(f"CV generation failed: {e}")
+    def _optimize_unprocessed_jobs(self, run: AgentRun):
+        """Fan out one optimizer execution per unprocessed job; failed jobs do not fail the run"""
+        results = optimize_unprocessed_jobs(
+            self._crew_inputs(),
+            step_callback=self._cancellation_check(run),
+            should_stop=run.cancel_requested.is_set
+        )
+        if run.cancel_requested.is_set():
+            raise RunCancelled(f"Run {run.run_id} was cancelled")
+        
+        failed = [result for result in results if not result.success]
+        if failed:
             with self.status_lock:
-                self.status = "error"
-                self.error_message = str(e)
+                run.error = "; ".join(f"job {result.job_id}: {result.error}" for result in failed)
+        logger.info(f"Optimized CVs for {len(results) - len(failed)}/{len(results)} jobs (run {run.run_id})")
+    
+    def _run_cv_generation(self, run: AgentRun):
+        """Internal method to run only CV generation (optimizer agent per job)"""
+        logger.info(f"Starting CV generation for unprocessed jobs (run {run.run_id})")
+        self._optimize_unprocessed_jobs(run)
 
-    def _run_agent(self):
-        """Internal method to run the agent"""
-        try:
-            logger.info("Starting CrewAI agent execution")
-            
-            inputs = {
-                'topic': 'AI LLMs',
-                'current_year': str(datetime.now().year),
-                'current_date': datetime.now().strftime('%Y-%m-%d'),
-                'current_month': datetime.now().strftime('%Y-%m')
-            }
-            
-            crew_instance = JobappAgent().crew()
-            result = crew_instance.kickoff(inputs=inputs)
-            
-            with self.status_lock:
-                self.status = "completed"
-                # TODO: Extract actual counts from result if available
-                
-            logger.info("Agent execution completed successfully")
-            
-        except Exception as e:
-            logger.error(f"Agent execution failed: {e}")
-            with self.status_lock:
-                self.status = "error"
-                self.error_message = str(e)
+    def _run_agent(self, run: AgentRun):
+        """Internal method to run the agent: job research, then per-job CV generation"""
+        logger.info(f"Starting CrewAI agent execution (run {run.run_id})")
+        
+        research_crew = JobappAgent().research_crew(step_callback=self._cancellation_check(run))
+        # jobs_found/cvs_created are aggregated from save events during the run
+        research_crew.kickoff(inputs=self._crew_inputs())
+        self._optimize_unprocessed_jobs(run)
+    
+    def recover_interrupted_runs(self):
+        """Fail persisted runs a previous process left queued or running; call once at startup"""
+        interrupted = self.db.mark_interrupted_runs()
+        if interrupted:
+            logger.warning(f"Marked {interrupted} agent run(s) interrupted by a restart as failed")
+    
+    def shutdown(self):
+        """Cancel queued runs and ask running ones to stop"""
+        with self.status_lock:
+            active = [run.run_id for run in self.runs.values() if not run.finished]
+        for run_id in active:
+            self.cancel_run(run_id)
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,92 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from database import DatabaseManager
+from pagination import DEFAULT_PAGE_SIZE
+from jobapp_agent.db.pool import load_pool_settings
+from jobapp_agent.storage import get_blob_store
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AsyncDatabaseManager:
+    """Awaitable facade over DatabaseManager for use inside FastAPI handlers.
+
+    psycopg2 is blocking, so each query runs on a bounded executor sized to the
+    connection pool. The event loop stays free while queries wait on I/O and
+    concurrent requests overlap instead of queueing behind each other.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.db = DatabaseManager()
+        if max_workers is None:
+            # One worker per pooled connection, so workers never wait on checkout
+            max_workers = int(load_pool_settings()["maxconn"])
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        logger.info(f"Async database executor started with {max_workers} workers")
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def get_all_jobs_cvs(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of jobs and the cursor for the next page"""
+        return await self._run(self.db.get_all_jobs_cvs, limit=limit, cursor=cursor)
+
+    async def get_jobs_filtered(self, company: str = None, title: str = None, source: str = None,
+                                limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of jobs with optional filtering"""
+        return await self._run(self.db.get_jobs_filtered, company=company, title=title, source=source,
+                               limit=limit, cursor=cursor)
+
+    async def search_jobs(self, q: str, limit: int = DEFAULT_PAGE_SIZE) -> List[Dict]:
+        """Full-text search over title, company and description, tolerant to typos"""
+        return await self._run(self.db.search_jobs, q, limit=limit)
+
+    async def get_job_by_id(self, job_id: int) -> Dict:
+        """Get a single job with its full description and all of its CVs"""
+        return await self._run(self.db.get_job_by_id, job_id)
+
+    async def get_cv_meta(self, cv_id: int) -> Dict:
+        """Get the content hash and byte size of a CV"""
+        return await self._run(self.db.get_cv_meta, cv_id)
+
+    async def get_cv_chunk(self, cv_id: int, offset: int, length: int) -> bytes:
+        """Read a byte range of an inline CV"""
+        return await self._run(self.db.get_cv_chunk, cv_id, offset, length)
+
+    async def stream_cv_blob(self, sha256: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """Stream the inclusive byte range [start, end] of a CV from the blob store"""
+        chunks = get_blob_store().iter_range(sha256, start, end)
+        while True:
+            chunk = await self._run(next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+
+    async def get_all_cvs(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of CVs with their associated job information"""
+        return await self._run(self.db.get_all_cvs, limit=limit, cursor=cursor)
+
+    async def get_basic_stats(self) -> Dict:
+        """Get basic job and CV statistics"""
+        return await self._run(self.db.get_basic_stats)
+
+    async def get_agent_runs(self, limit: int = DEFAULT_PAGE_SIZE, state: Optional[str] = None) -> List[Dict]:
+        """Get the most recent persisted agent runs"""
+        return await self._run(self.db.get_agent_runs, limit=limit, state=state)
+
+    async def get_agent_run(self, run_id: str) -> Dict:
+        """Get the persisted record of a single agent run"""
+        return await self._run(self.db.get_agent_run, run_id)
+
+    def get_pool_stats(self) -> Dict:
+        """Get connection pool size and usage metrics"""
+        return self.db.get_pool_stats()
+
+    def shutdown(self):
+        """Stop accepting new queries and wait for running ones to finish"""
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,95 @@
+"""Benchmark /api/jobs/search against a synthetic jobs table.
+
+Creates a session-local TEMP table named ``jobs`` (it shadows the real table on this
+connection only), fills it with synthetic postings, runs the exact search query used
+by DatabaseManager and reports latency plus whether the GIN indexes were used.
+
+Usage:
+    cd backend
+    python benchmarks/search_benchmark.py --rows 100000
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import psycopg2
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(backend_dir.parent / "jobapp_agent" / "src"))
+
+from jobapp_agent.db.config import GenerateConfig
+from database import JOB_SEARCH_QUERY
+
+QUERIES = ["data engineer", "machine lerning", "pyhton fastapi", "Trendyol", "llm langchain istanbul"]
+
+def populate(cursor, rows: int) -> None:
+    cursor.execute("CREATE TEMP TABLE jobs (LIKE public.jobs INCLUDING ALL)")
+    cursor.execute("""
+        INSERT INTO jobs (title, company, link, descript, source, created_at)
+        SELECT
+            (ARRAY['Senior','Junior','Lead','Mid-level',''])[1 + g % 5] || ' ' ||
+            (ARRAY['Data Engineer','Machine Learning Engineer','AI Engineer','Data Scientist',
+                   'Python Developer','Backend Developer','MLOps Engineer'])[1 + (g / 5) % 7],
+            (ARRAY['Trendyol','Getir','Hepsiburada','Insider','Peak Games','Papara','Garanti BBVA',
+                   'Turkcell','Yemeksepeti','Logo Yazilim'])[1 + (g / 35) % 10] || ' ' || (g % 997),
+            'https://example.com/jobs/' || g,
+            repeat('We build products with Python, SQL and cloud services. ', 5) ||
+            (ARRAY['LangChain and OpenAI API experience','PostgreSQL and Airflow pipelines',
+                   'PyTorch model training','FastAPI microservices','Spark and Kafka streaming'])[1 + g % 5] ||
+            ' Location: ' || (ARRAY['Istanbul','Ankara','Izmir','Remote'])[1 + g % 4],
+            (ARRAY['linkedin','kariyer','indeed','glassdoor'])[1 + g % 4],
+            NOW() - (g || ' minutes')::interval
+        FROM generate_series(1, %s) AS g
+    """, (rows,))
+    cursor.execute("ANALYZE jobs")
+
+def index_names(plan: dict) -> set:
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+def run(rows: int, repeats: int, limit: int) -> None:
+    conn = psycopg2.connect(**GenerateConfig.config())
+    try:
+        with conn.cursor() as cursor:
+            start = time.perf_counter()
+            populate(cursor, rows)
+            print(f"Loaded {rows} synthetic jobs in {time.perf_counter() - start:.1f}s")
+
+            for q in QUERIES:
+                params = {"q": q, "limit": limit}
+                cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + JOB_SEARCH_QUERY, params)
+                plan = cursor.fetchone()[0][0]["Plan"]
+
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    cursor.execute(JOB_SEARCH_QUERY, params)
+                    hits = cursor.fetchall()
+                    timings.append((time.perf_counter() - start) * 1000)
+
+                print(json.dumps({
+                    "query": q,
+                    "hits": len(hits),
+                    "p50_ms": round(statistics.median(timings), 2),
+                    "max_ms": round(max(timings), 2),
+                    "indexes_used": sorted(index_names(plan)),
+                }))
+    finally:
+        conn.rollback()
+        conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    run(args.rows, args.repeats, args.limit)
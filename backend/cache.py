@@ -0,0 +1,156 @@
+import logging
+import select
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, Optional
+
+import psycopg2
+from psycopg2 import extensions
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "jobapp_agent" / "src"))
+from jobapp_agent.db.config import GenerateConfig
+from jobapp_agent.db.notify import DATA_CHANGED_CHANNEL
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+class ResponseCache:
+    """In-process LRU cache of serialized responses, bounded by total body size.
+
+    Entries are tagged with the data version they were built from. Bumping the
+    version (on every job/CV write) makes all older entries misses at once.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.version = 0
+        self.enabled = False  # only serve hits while invalidations can be received
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached body for key if it was built from the current data version"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if not self.enabled or entry is None or entry[0] != self.version:
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: int, body: bytes) -> None:
+        """Store a body built from data at the given version, evicting least recently used entries"""
+        size = len(body)
+        with self._lock:
+            # Skip results built from data that changed while they were being built
+            if not self.enabled or version != self.version or size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[key] = (version, body)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._metrics["evictions"] += 1
+
+    def bump_version(self) -> None:
+        """Invalidate every cached entry and release their memory"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._metrics["invalidations"] += 1
+
+    def set_enabled(self, enabled: bool) -> None:
+        with self._lock:
+            if self.enabled != enabled:
+                self.enabled = enabled
+                # Anything cached before a listener outage may be stale
+                self.version += 1
+                self._entries.clear()
+                self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss metrics"""
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                "enabled": self.enabled,
+                "version": self.version,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self._metrics["hits"] / lookups if lookups else 0.0,
+                **self._metrics
+            }
+
+class DataVersionListener:
+    """Background LISTEN on the data-changed channel that bumps the cache version.
+
+    Every backend worker runs its own listener, so a write made by any process
+    invalidates all workers' caches together. The cache is disabled while the
+    listener is disconnected, since invalidations could be missed.
+    """
+
+    def __init__(self, cache: ResponseCache, poll_timeout: float = 5.0, max_backoff: float = 30.0):
+        self.cache = cache
+        self.poll_timeout = poll_timeout
+        self.max_backoff = max_backoff
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="data-version-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                # A dedicated connection: LISTEN holds it for the process lifetime
+                conn = psycopg2.connect(**GenerateConfig.config())
+                conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {DATA_CHANGED_CHANNEL}")
+                self.cache.set_enabled(True)
+                logger.info(f"Listening for data changes on channel '{DATA_CHANGED_CHANNEL}'")
+                backoff = 1.0
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self.cache.bump_version()
+            except Exception as e:
+                logger.warning(f"Data change listener disconnected, response cache disabled: {e}")
+            finally:
+                self.cache.set_enabled(False)
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
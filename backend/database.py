@@ -1,17 +1,42 @@
 import sys
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import List, Dict
+import threading
+from psycopg2.extras import Json, RealDictCursor
+from typing import List, Dict, Optional, Tuple
 import logging
 from pathlib import Path
 
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root / "jobapp_agent" / "src"))
 from jobapp_agent.db.config import GenerateConfig
+from jobapp_agent.db.pool import get_pool
+from pagination import DEFAULT_PAGE_SIZE, decode_cursor, split_page
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Ranked full-text search with trigram fallback for typos. The tsvector match uses
+# idx_jobs_search_vector and the %> (word similarity) matches use the *_trgm GIN indexes.
+JOB_SEARCH_QUERY = """
+    SELECT j.job_id, j.title, j.company, j.link, j.source,
+           cv.match_score, j.scraped_date, j.is_processed, j.created_at,
+           ts_rank_cd(j.search_vector, websearch_to_tsquery('simple', %(q)s))
+             + GREATEST(word_similarity(%(q)s, j.title),
+                        word_similarity(%(q)s, coalesce(j.company, ''))) AS rank
+    FROM jobs j
+    LEFT JOIN LATERAL (
+        SELECT match_score
+        FROM optimized_cvs
+        WHERE job_id = j.job_id
+        ORDER BY created_at DESC, cv_id DESC
+        LIMIT 1
+    ) cv ON TRUE
+    WHERE j.search_vector @@ websearch_to_tsquery('simple', %(q)s)
+       OR j.title %%> %(q)s
+       OR j.company %%> %(q)s
+    ORDER BY rank DESC, j.created_at DESC, j.job_id DESC
+    LIMIT %(limit)s
+"""
+
 class DatabaseManager:
     """Database manager that reuses existing AI agent database configuration"""
     
@@ -22,102 +47,232 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to load database config: {e}")
             raise
+        self._local = threading.local()
     
     def __enter__(self):
         try:
-            self.conn = psycopg2.connect(**self.db_config)
-            return self.conn
+            conn = get_pool().getconn()
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
             raise
+        # The manager is shared by all requests, so checked-out connections are per thread
+        if not hasattr(self._local, 'conns'):
+            self._local.conns = []
+        self._local.conns.append(conn)
+        return conn
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        conn = self._local.conns.pop()
+        get_pool().putconn(conn, discard=conn.closed)
+    
+    def get_pool_stats(self) -> Dict:
+        """Get connection pool size and usage metrics"""
+        return get_pool().stats()
     
-    def get_all_jobs_cvs(self) -> List[Dict]:
-        """Get all jobs from the database"""
+    def get_all_jobs_cvs(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of jobs, newest first, and the cursor for the next page"""
         try:
+            where_conditions = []
+            params = []
+            if cursor:
+                created_at, job_id = decode_cursor(cursor)
+                where_conditions.append("(j.created_at, j.job_id) < (%s, %s)")
+                params.extend([created_at, job_id])
+            
+            where_clause = ""
+            if where_conditions:
+                where_clause = "WHERE " + " AND ".join(where_conditions)
+            
             with self as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                    cursor.execute("""
-                        SELECT j.job_id, j.title, j.company, j.link, j.descript, j.source,
+                with conn.cursor(cursor_factory=RealDictCursor) as db_cursor:
+                    # LATERAL keeps one row per job so the keyset stays unique
+                    db_cursor.execute(f"""
+                        SELECT j.job_id, j.title, j.company, j.link, j.source,
                                cv.match_score, j.scraped_date, j.is_processed, 
                                j.created_at, cv.created_at as cv_created_at
                         FROM jobs j
-                        LEFT JOIN optimized_cvs cv ON j.job_id = cv.job_id
-                        ORDER BY j.created_at DESC
-                    """)
+                        LEFT JOIN LATERAL (
+                            SELECT match_score, created_at
+                            FROM optimized_cvs
+                            WHERE job_id = j.job_id
+                            ORDER BY created_at DESC, cv_id DESC
+                            LIMIT 1
+                        ) cv ON TRUE
+                        {where_clause}
+                        ORDER BY j.created_at DESC, j.job_id DESC
+                        LIMIT %s
+                    """, params + [limit + 1])
+                    jobs = [dict(job) for job in db_cursor.fetchall()]
+                    page, next_cursor = split_page(jobs, limit, 'created_at', 'job_id')
+                    logger.info(f"Retrieved {len(page)} jobs from database")
+                    return page, next_cursor
+        except Exception as e:
+            logger.error(f"Error fetching jobs: {e}")
+            raise
+    
+    def get_jobs_filtered(self, company: str = None, title: str = None, source: str = None,
+                          limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of jobs with optional filtering and the cursor for the next page"""
+        try:
+            where_conditions = []
+            params = []
+            
+            if company:
+                where_conditions.append("j.company ILIKE %s")
+                params.append(f"%{company}%")
+            
+            if title:
+                where_conditions.append("j.title ILIKE %s")
+                params.append(f"%{title}%")
+            
+            if source:
+                where_conditions.append("j.source ILIKE %s")
+                params.append(f"%{source}%")
+            
+            if cursor:
+                created_at, job_id = decode_cursor(cursor)
+                where_conditions.append("(j.created_at, j.job_id) < (%s, %s)")
+                params.extend([created_at, job_id])
+            
+            where_clause = ""
+            if where_conditions:
+                where_clause = "WHERE " + " AND ".join(where_conditions)
+            
+            query = f"""
+                SELECT j.job_id, j.title, j.company, j.link, j.source,
+                       cv.match_score, j.scraped_date, j.is_processed, 
+                       j.created_at, cv.created_at as cv_created_at
+                FROM jobs j
+                JOIN LATERAL (
+                    SELECT match_score, created_at
+                    FROM optimized_cvs
+                    WHERE job_id = j.job_id
+                    ORDER BY created_at DESC, cv_id DESC
+                    LIMIT 1
+                ) cv ON TRUE
+                {where_clause}
+                ORDER BY j.created_at DESC, j.job_id DESC
+                LIMIT %s
+            """
+            
+            with self as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as db_cursor:
+                    db_cursor.execute(query, params + [limit + 1])
+                    jobs = [dict(job) for job in db_cursor.fetchall()]
+                    page, next_cursor = split_page(jobs, limit, 'created_at', 'job_id')
+                    logger.info(f"Retrieved {len(page)} filtered jobs from database")
+                    return page, next_cursor
+        except Exception as e:
+            logger.error(f"Error fetching filtered jobs: {e}")
+            raise
+    
+    def search_jobs(self, q: str, limit: int = DEFAULT_PAGE_SIZE) -> List[Dict]:
+        """Full-text search over title, company and description, tolerant to typos"""
+        try:
+            with self as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(JOB_SEARCH_QUERY, {"q": q, "limit": limit})
                     jobs = cursor.fetchall()
-                    logger.info(f"Retrieved {len(jobs)} jobs from database")
+                    logger.info(f"Search '{q}' matched {len(jobs)} jobs")
                     return [dict(job) for job in jobs]
         except Exception as e:
-            logger.error(f"Error fetching jobs: {e}")
+            logger.error(f"Error searching jobs: {e}")
             raise
     
-    def get_jobs_filtered(self, company: str = None, title: str = None, source: str = None) -> List[Dict]:
-        """Get jobs with optional filtering"""
+    def get_job_by_id(self, job_id: int) -> Dict:
+        """Get a single job with its full description and all of its CVs"""
         try:
             with self as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                    where_conditions = []
-                    params = []
-                    
-                    if company:
-                        where_conditions.append("j.company ILIKE %s")
-                        params.append(f"%{company}%")
-                    
-                    if title:
-                        where_conditions.append("j.title ILIKE %s")
-                        params.append(f"%{title}%")
+                    cursor.execute("""
+                        SELECT job_id, title, company, link, descript, source,
+                               scraped_date, is_processed, created_at, duplicate_of
+                        FROM jobs
+                        WHERE job_id = %s
+                    """, (job_id,))
+                    job = cursor.fetchone()
+                    if not job:
+                        raise ValueError(f"Job with ID {job_id} not found")
                     
-                    if source:
-                        where_conditions.append("j.source ILIKE %s")
-                        params.append(f"%{source}%")
+                    cursor.execute("""
+                        SELECT cv_id, job_id, match_score, created_at as cv_created_at
+                        FROM optimized_cvs
+                        WHERE job_id = %s
+                        ORDER BY created_at DESC, cv_id DESC
+                    """, (job_id,))
+                    cvs = cursor.fetchall()
                     
-                    where_clause = ""
-                    if where_conditions:
-                        where_clause = "WHERE " + " AND ".join(where_conditions)
+                    result = dict(job)
+                    result['cvs'] = [dict(cv) for cv in cvs]
+                    return result
+        except Exception as e:
+            logger.error(f"Error fetching job {job_id}: {e}")
+            raise
+    
+    def get_cv_meta(self, cv_id: int) -> Dict:
+        """Get the content hash, byte size and storage location of a CV, backfilling older rows"""
+        try:
+            with self as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute("""
+                        SELECT cv_sha256, cv_size, cv_data IS NOT NULL AS inline
+                        FROM optimized_cvs
+                        WHERE cv_id = %s
+                    """, (cv_id,))
+                    result = cursor.fetchone()
+                    if not result:
+                        raise ValueError(f"CV with ID {cv_id} not found")
                     
-                    query = f"""
-                        SELECT j.job_id, j.title, j.company, j.link, j.descript, j.source,
-                               cv.match_score, j.scraped_date, j.is_processed, 
-                               j.created_at, cv.created_at as cv_created_at
-                        FROM jobs j
-                        JOIN optimized_cvs cv ON j.job_id = cv.job_id
-                        {where_clause}
-                        ORDER BY j.created_at DESC
-                    """
+                    if result['cv_sha256'] is None or result['cv_size'] is None:
+                        cursor.execute("""
+                            UPDATE optimized_cvs
+                            SET cv_sha256 = encode(sha256(cv_data), 'hex'),
+                                cv_size = octet_length(cv_data)
+                            WHERE cv_id = %s
+                            RETURNING cv_sha256, cv_size, TRUE AS inline
+                        """, (cv_id,))
+                        result = cursor.fetchone()
+                        conn.commit()
                     
-                    cursor.execute(query, params)
-                    jobs = cursor.fetchall()
-                    logger.info(f"Retrieved {len(jobs)} filtered jobs from database")
-                    return [dict(job) for job in jobs]
+                    return {
+                        "sha256": result['cv_sha256'].strip(),
+                        "size": result['cv_size'],
+                        "inline": result['inline']
+                    }
         except Exception as e:
-            logger.error(f"Error fetching filtered jobs: {e}")
+            logger.error(f"Error fetching CV metadata: {e}")
             raise
     
-    def get_cv_data_by_id(self, cv_id: int) -> bytes:
-        """Get CV data by CV ID for download"""
+    def get_cv_chunk(self, cv_id: int, offset: int, length: int) -> bytes:
+        """Read length bytes of an inline (not yet migrated) CV without loading the whole PDF"""
         try:
             with self as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute("SELECT cv_data FROM optimized_cvs WHERE cv_id = %s", (cv_id,))
+                    cursor.execute(
+                        "SELECT substring(cv_data FROM %s FOR %s) FROM optimized_cvs WHERE cv_id = %s",
+                        (offset + 1, length, cv_id)
+                    )
                     result = cursor.fetchone()
-                    if result:
-                        return result[0]
-                    else:
+                    if not result:
                         raise ValueError(f"CV with ID {cv_id} not found")
+                    return bytes(result[0])
         except Exception as e:
             logger.error(f"Error fetching CV data: {e}")
             raise
     
-    def get_all_cvs(self) -> List[Dict]:
-        """Get all CVs with their associated job information"""
+    def get_all_cvs(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of CVs with their associated job information and the cursor for the next page"""
         try:
+            where_clause = ""
+            params = []
+            if cursor:
+                created_at, cv_id = decode_cursor(cursor)
+                where_clause = "WHERE (cv.created_at, cv.cv_id) < (%s, %s)"
+                params.extend([created_at, cv_id])
+            
             with self as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                    cursor.execute("""
+                with conn.cursor(cursor_factory=RealDictCursor) as db_cursor:
+                    db_cursor.execute(f"""
                         SELECT 
                             cv.cv_id,
                             cv.job_id,
@@ -130,58 +285,148 @@ class DatabaseManager:
                             j.scraped_date
                         FROM optimized_cvs cv
                         LEFT JOIN jobs j ON cv.job_id = j.job_id
-                        ORDER BY cv.created_at DESC
-                    """)
-                    cvs = cursor.fetchall()
-                    logger.info(f"Retrieved {len(cvs)} CVs from database")
-                    return [dict(cv) for cv in cvs]
+                        {where_clause}
+                        ORDER BY cv.created_at DESC, cv.cv_id DESC
+                        LIMIT %s
+                    """, params + [limit + 1])
+                    cvs = [dict(cv) for cv in db_cursor.fetchall()]
+                    page, next_cursor = split_page(cvs, limit, 'cv_created_at', 'cv_id')
+                    logger.info(f"Retrieved {len(page)} CVs from database")
+                    return page, next_cursor
         except Exception as e:
             logger.error(f"Error fetching CVs: {e}")
             raise
 
     def get_basic_stats(self) -> Dict:
-        """Get basic job and CV statistics"""
+        """Get basic job and CV statistics from the trigger-maintained counters"""
         try:
             with self as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                     cursor.execute("""
                         SELECT 
-                            COUNT(*) as total_jobs,
-                            COUNT(CASE WHEN is_processed = true THEN 1 END) as processed_jobs,
-                            COUNT(DISTINCT company) as unique_companies,
-                            COUNT(DISTINCT source) as unique_sources
-                        FROM jobs
-                    """)
-                    job_stats = cursor.fetchone()
-                    
-                    cursor.execute("""
-                        SELECT 
-                            COUNT(*) as total_cvs,
-                            AVG(match_score) as avg_match_score,
-                            MAX(match_score) as max_match_score,
-                            MIN(match_score) as min_match_score
-                        FROM optimized_cvs
-                        WHERE match_score IS NOT NULL
+                            total_jobs,
+                            processed_jobs,
+                            unique_companies,
+                            unique_sources,
+                            scored_cvs AS total_cvs,
+                            match_score_sum::numeric / NULLIF(scored_cvs, 0) AS avg_match_score,
+                            max_match_score,
+                            min_match_score
+                        FROM job_stats
+                        WHERE id = 1
                     """)
-                    cv_stats = cursor.fetchone()
+                    stats = cursor.fetchone() or {}
                     
                     cursor.execute("""
-                        SELECT company, COUNT(*) as job_count
-                        FROM jobs
-                        WHERE company IS NOT NULL
-                        GROUP BY company
-                        ORDER BY job_count DESC
+                        SELECT company, job_count
+                        FROM company_job_counts
+                        ORDER BY job_count DESC, company
                         LIMIT 10
                     """)
                     company_stats = cursor.fetchall()
                     
                     return {
-                        "jobs": dict(job_stats),
-                        "cvs": dict(cv_stats),
+                        "jobs": {
+                            "total_jobs": stats.get("total_jobs", 0),
+                            "processed_jobs": stats.get("processed_jobs", 0),
+                            "unique_companies": stats.get("unique_companies", 0),
+                            "unique_sources": stats.get("unique_sources", 0)
+                        },
+                        "cvs": {
+                            "total_cvs": stats.get("total_cvs", 0),
+                            "avg_match_score": stats.get("avg_match_score"),
+                            "max_match_score": stats.get("max_match_score"),
+                            "min_match_score": stats.get("min_match_score")
+                        },
                         "top_companies": [dict(company) for company in company_stats]
                     }
         except Exception as e:
             logger.error(f"Error fetching statistics: {e}")
             raise
     
-    
\ No newline at end of file
+    def save_agent_run(self, run: Dict) -> None:
+        """Insert or update the persisted record of an agent run"""
+        try:
+            with self as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        INSERT INTO agent_runs (run_id, kind, state, created_at, started_at, finished_at,
+                                                jobs_found, cvs_created, error, summary)
+                        VALUES (%(run_id)s, %(kind)s, %(state)s, %(created_at)s, %(started_at)s, %(finished_at)s,
+                                %(jobs_found)s, %(cvs_created)s, %(error)s, %(summary)s)
+                        ON CONFLICT (run_id) DO UPDATE SET
+                            state = EXCLUDED.state,
+                            started_at = EXCLUDED.started_at,
+                            finished_at = EXCLUDED.finished_at,
+                            jobs_found = EXCLUDED.jobs_found,
+                            cvs_created = EXCLUDED.cvs_created,
+                            error = EXCLUDED.error,
+                            summary = EXCLUDED.summary
+                    """, {**run, "summary": Json(run.get("summary") or {})})
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error saving agent run {run.get('run_id')}: {e}")
+            raise
+    
+    def mark_interrupted_runs(self) -> int:
+        """Mark runs left queued or running by a crash or restart as failed and release their job claims; returns how many"""
+        try:
+            with self as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        UPDATE jobs SET claimed_by = NULL, claimed_at = NULL
+                        WHERE claimed_by IN (SELECT run_id FROM agent_runs WHERE state IN ('queued', 'running'))
+                    """)
+                    cursor.execute("""
+                        UPDATE agent_runs
+                        SET state = 'error', error = 'interrupted by restart', finished_at = NOW()
+                        WHERE state IN ('queued', 'running')
+                    """)
+                    interrupted = cursor.rowcount
+                conn.commit()
+                return interrupted
+        except Exception as e:
+            logger.error(f"Error marking interrupted agent runs: {e}")
+            raise
+    
+    def get_agent_runs(self, limit: int = DEFAULT_PAGE_SIZE, state: Optional[str] = None) -> List[Dict]:
+        """Get the most recent agent runs, optionally only those in one state"""
+        try:
+            where_clause = "WHERE state = %s" if state else ""
+            params = [state] if state else []
+            with self as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(f"""
+                        SELECT run_id, kind, state, created_at, started_at, finished_at,
+                               EXTRACT(EPOCH FROM (COALESCE(finished_at, NOW()) - started_at)) AS duration_seconds,
+                               jobs_found, cvs_created, error, summary
+                        FROM agent_runs
+                        {where_clause}
+                        ORDER BY created_at DESC
+                        LIMIT %s
+                    """, params + [limit])
+                    return [dict(run) for run in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error fetching agent runs: {e}")
+            raise
+    
+    def get_agent_run(self, run_id: str) -> Dict:
+        """Get the persisted record of a single agent run"""
+        try:
+            with self as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute("""
+                        SELECT run_id, kind, state, created_at, started_at, finished_at,
+                               EXTRACT(EPOCH FROM (COALESCE(finished_at, NOW()) - started_at)) AS duration_seconds,
+                               jobs_found, cvs_created, error, summary
+                        FROM agent_runs
+                        WHERE run_id = %s
+                    """, (run_id,))
+                    run = cursor.fetchone()
+                    if not run:
+                        raise ValueError(f"Agent run {run_id} not found")
+                    return dict(run)
+        except Exception as e:
+            logger.error(f"Error fetching agent run {run_id}: {e}")
+            raise
+    
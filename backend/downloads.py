@@ -0,0 +1,58 @@
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# CV content never changes for a given hash, so clients may keep it for a year
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against a strong ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range 'bytes=' header into an inclusive (start, end) pair.
+
+    Returns None when the header is absent or not a byte range we serve (the full
+    body is sent instead) and raises ValueError when the range is unsatisfiable.
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+
+    start_text, end_text = (part.strip() for part in spec.split("-", 1))
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise ValueError("Empty suffix range")
+            start = max(size - suffix, 0)
+            end = size - 1
+    except ValueError as e:
+        raise ValueError(f"Invalid range: {range_header}") from e
+
+    if start >= size or start > end:
+        raise ValueError(f"Range not satisfiable: {range_header}")
+    return start, min(end, size - 1)
+
+async def iter_chunks(read_chunk: Callable[[int, int], Awaitable[bytes]], start: int, end: int,
+                      chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield the inclusive byte range [start, end] one chunk-sized read at a time"""
+    offset = start
+    while offset <= end:
+        length = min(chunk_size, end - offset + 1)
+        chunk = await read_chunk(offset, length)
+        if not chunk:
+            break
+        yield chunk
+        offset += len(chunk)
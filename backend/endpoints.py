@@ -1,27 +1,59 @@
-from fastapi import APIRouter, HTTPException, Query, Response
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Hashable, Optional, Union
+import json
 import logging
 
-from database import DatabaseManager
+from async_database import AsyncDatabaseManager
 from models import (
-    JobListResponse, JobResponse, CVListResponse, CVResponse,
-    AgentStatusResponse, StartAgentResponse
+    JobListResponse, JobSummaryResponse, JobDetailResponse, JobSearchResponse, JobSearchResult,
+    CVListResponse, CVResponse,
+    AgentStatusResponse, AgentRunResponse, AgentRunListResponse, StartAgentResponse
 )
 from agent_runner import AgentRunner
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from downloads import IMMUTABLE_CACHE_CONTROL, etag_matches, parse_range_header, iter_chunks
+from cache import ResponseCache, DataVersionListener
+from sse import SSE_HEADERS, event_stream
+from jobapp_agent.events import AGENT_STATUS
+from jobapp_agent.render import get_render_cache
+from jobapp_agent.search import get_search_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["api"])
 
-db_manager = DatabaseManager()
+db_manager = AsyncDatabaseManager()
 agent_runner = AgentRunner()
+response_cache = ResponseCache()
+data_version_listener = DataVersionListener(response_cache)
+
+def cached_json(key: Hashable) -> Optional[Response]:
+    """Return a cached JSON response for key, or None on a miss"""
+    body = response_cache.get(key)
+    if body is None:
+        return None
+    return Response(content=body, media_type="application/json")
+
+def cache_json(key: Hashable, version: int, payload: Union[BaseModel, dict]) -> Response:
+    """Serialize payload once, cache it under the data version it was built from and return it"""
+    if isinstance(payload, BaseModel):
+        body = payload.model_dump_json().encode("utf-8")
+    else:
+        body = json.dumps(jsonable_encoder(payload)).encode("utf-8")
+    response_cache.put(key, version, body)
+    return Response(content=body, media_type="application/json")
 
 @router.post("/agent/start", response_model=StartAgentResponse)
 async def start_agent():
     """Start the CrewAI agent system in background"""
     try:
-        result = agent_runner.start_agent()
+        # Submitting persists the run through psycopg2, so it must not run on the event loop
+        result = await run_in_threadpool(agent_runner.start_agent)
         return StartAgentResponse(**result)
     except Exception as e:
         logger.error(f"Failed to start agent: {e}")
@@ -31,7 +63,7 @@ async def start_agent():
 async def start_cv_generation():
     """Start CV generation for unprocessed jobs only"""
     try:
-        result = agent_runner.start_cv_generation()
+        result = await run_in_threadpool(agent_runner.start_cv_generation)
         return StartAgentResponse(**result)
     except Exception as e:
         logger.error(f"Failed to start CV generation: {e}")
@@ -47,48 +79,211 @@ async def get_agent_status():
         logger.error(f"Failed to get agent status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/agent/runs", response_model=AgentRunListResponse)
+async def get_agent_runs(
+    state: Optional[str] = Query(None, description="Only runs in this state"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Number of most recent runs")
+):
+    """Get the run history, most recent first"""
+    try:
+        runs = await db_manager.get_agent_runs(limit=limit, state=state)
+        # Persisted counters of active runs lag behind; prefer the live state
+        live = agent_runner.get_active_runs()
+        runs = [live.get(run['run_id'], run) for run in runs]
+        return AgentRunListResponse(
+            runs=[AgentRunResponse(**run) for run in runs],
+            total=len(runs),
+            message=f"Retrieved {len(runs)} agent runs"
+        )
+    except Exception as e:
+        logger.error(f"Failed to get agent runs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/agent/runs/{run_id}", response_model=AgentRunResponse)
+async def get_agent_run(run_id: str):
+    """Get a single agent run"""
+    try:
+        run = agent_runner.get_run(run_id)
+        if run is None:
+            run = await db_manager.get_agent_run(run_id)
+        return AgentRunResponse(**run)
+    except ValueError as ve:
+        raise HTTPException(status_code=404, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Failed to get agent run {run_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/agent/runs/{run_id}/cancel", response_model=AgentRunResponse)
+async def cancel_agent_run(run_id: str):
+    """Cancel a queued run, or stop a running one at its next agent step"""
+    try:
+        return AgentRunResponse(**await run_in_threadpool(agent_runner.cancel_run, run_id))
+    except ValueError as ve:
+        raise HTTPException(status_code=404, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Failed to cancel agent run {run_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/agent/events")
+async def agent_events(request: Request):
+    """Stream agent status changes and save progress as Server-Sent Events"""
+    initial_status = {"type": AGENT_STATUS, "data": agent_runner.get_status()}
+    return StreamingResponse(
+        event_stream(request, [initial_status]),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
 @router.get("/jobs", response_model=JobListResponse)
 async def get_jobs(
     company: Optional[str] = Query(None, description="Filter by company name"),
     title: Optional[str] = Query(None, description="Filter by job title"),
-    source: Optional[str] = Query(None, description="Filter by job source")
+    source: Optional[str] = Query(None, description="Filter by job source"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page")
 ):
-    """Get all jobs with optional filtering"""
+    """Get a page of jobs with optional filtering"""
+    cache_key = ("jobs", company, title, source, limit, cursor)
+    cached = cached_json(cache_key)
+    if cached is not None:
+        return cached
+    version = response_cache.version
+    
     try:
         if company or title or source:
-            jobs_data = db_manager.get_jobs_filtered(company=company, title=title, source=source)
+            jobs_data, next_cursor = await db_manager.get_jobs_filtered(
+                company=company, title=title, source=source, limit=limit, cursor=cursor
+            )
         else:
-            jobs_data = db_manager.get_all_jobs_cvs()
+            jobs_data, next_cursor = await db_manager.get_all_jobs_cvs(limit=limit, cursor=cursor)
         
         jobs = []
         for job_data in jobs_data:
-            job = JobResponse(
+            job = JobSummaryResponse(
                 job_id=job_data['job_id'],
                 title=job_data['title'],
                 company=job_data['company'],
                 link=job_data['link'],
-                descript=job_data['descript'],
                 source=job_data['source'],
+                match_score=job_data['match_score'],
                 scraped_date=job_data['scraped_date'],
                 is_processed=job_data['is_processed'],
                 created_at=job_data['created_at']
             )
             jobs.append(job)
         
-        return JobListResponse(
+        return cache_json(cache_key, version, JobListResponse(
             jobs=jobs,
             total=len(jobs),
+            next_cursor=next_cursor,
             message=f"Retrieved {len(jobs)} jobs"
-        )
+        ))
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Failed to get jobs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/jobs/search", response_model=JobSearchResponse)
+async def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms; typos are tolerated"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of results")
+):
+    """Search jobs by title, company and description, best matches first"""
+    cache_key = ("jobs/search", q, limit)
+    cached = cached_json(cache_key)
+    if cached is not None:
+        return cached
+    version = response_cache.version
+    
+    try:
+        jobs_data = await db_manager.search_jobs(q, limit=limit)
+        
+        jobs = [
+            JobSearchResult(
+                job_id=job_data['job_id'],
+                title=job_data['title'],
+                company=job_data['company'],
+                link=job_data['link'],
+                source=job_data['source'],
+                match_score=job_data['match_score'],
+                scraped_date=job_data['scraped_date'],
+                is_processed=job_data['is_processed'],
+                created_at=job_data['created_at'],
+                rank=job_data['rank']
+            )
+            for job_data in jobs_data
+        ]
+        
+        return cache_json(cache_key, version, JobSearchResponse(
+            jobs=jobs,
+            total=len(jobs),
+            query=q,
+            message=f"Found {len(jobs)} jobs matching '{q}'"
+        ))
+    except Exception as e:
+        logger.error(f"Failed to search jobs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Declared after /jobs/search so that path is not captured as a job_id
+@router.get("/jobs/{job_id}", response_model=JobDetailResponse)
+async def get_job(job_id: int):
+    """Get a single job with its full description and CVs"""
+    cache_key = ("jobs/detail", job_id)
+    cached = cached_json(cache_key)
+    if cached is not None:
+        return cached
+    version = response_cache.version
+    
+    try:
+        job_data = await db_manager.get_job_by_id(job_id)
+        
+        cvs = [
+            CVResponse(
+                cv_id=cv_data['cv_id'],
+                job_id=cv_data['job_id'],
+                match_score=cv_data['match_score'],
+                created_at=cv_data['cv_created_at'],
+                job_title=job_data['title'],
+                company=job_data['company']
+            )
+            for cv_data in job_data['cvs']
+        ]
+        
+        return cache_json(cache_key, version, JobDetailResponse(
+            job_id=job_data['job_id'],
+            title=job_data['title'],
+            company=job_data['company'],
+            link=job_data['link'],
+            descript=job_data['descript'],
+            source=job_data['source'],
+            scraped_date=job_data['scraped_date'],
+            is_processed=job_data['is_processed'],
+            created_at=job_data['created_at'],
+            duplicate_of=job_data['duplicate_of'],
+            cvs=cvs
+        ))
+    except ValueError as ve:
+        logger.error(f"Job not found: {ve}")
+        raise HTTPException(status_code=404, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Failed to get job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/cvs", response_model=CVListResponse)
-async def get_cvs():
-    """Get all CVs with their associated job information"""
+async def get_cvs(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page")
+):
+    """Get a page of CVs with their associated job information"""
+    cache_key = ("cvs", limit, cursor)
+    cached = cached_json(cache_key)
+    if cached is not None:
+        return cached
+    version = response_cache.version
+    
     try:
-        cvs_data = db_manager.get_all_cvs()
+        cvs_data, next_cursor = await db_manager.get_all_cvs(limit=limit, cursor=cursor)
         
         cvs = []
         for cv_data in cvs_data:
@@ -102,55 +297,101 @@ async def get_cvs():
             )
             cvs.append(cv)
         
-        return CVListResponse(
+        return cache_json(cache_key, version, CVListResponse(
             cvs=cvs,
             total=len(cvs),
+            next_cursor=next_cursor,
             message=f"Retrieved {len(cvs)} CVs"
-        )
+        ))
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Failed to get CVs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/cvs/{cv_id}/download")
-async def download_cv(cv_id: int):
-    """Download specific CV file as PDF"""
+async def download_cv(cv_id: int, request: Request):
+    """Stream a CV file as PDF with ETag, conditional GET and Range support"""
     try:
-        cv_data = db_manager.get_cv_data_by_id(cv_id)
-        
-        if not cv_data:
-            raise HTTPException(status_code=404, detail=f"CV with ID {cv_id} not found")
-
-        # CV data should be stored as PDF bytes in BYTEA
-        if isinstance(cv_data, (bytes, memoryview)):
-            pdf_content = bytes(cv_data)
-        else:
-            # If it's text, we need to handle it differently
-            logger.warning(f"CV {cv_id} appears to be text data, not PDF")
-            pdf_content = str(cv_data).encode('utf-8')
-
-        return Response(
-            content=pdf_content,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=optimized_cv_{cv_id}.pdf"
-            }
-        )
+        meta = await db_manager.get_cv_meta(cv_id)
     except ValueError as ve:
         logger.error(f"CV not found: {ve}")
         raise HTTPException(status_code=404, detail=str(ve))
     except Exception as e:
         logger.error(f"Failed to download CV: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    etag = f'"{meta["sha256"]}"'
+    size = meta["size"]
+    headers = {
+        "Content-Disposition": f"attachment; filename=optimized_cv_{cv_id}.pdf",
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range.strip() == etag:
+        try:
+            byte_range = parse_range_header(request.headers.get("range"), size)
+        except ValueError as ve:
+            logger.warning(f"CV {cv_id}: {ve}")
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    
+    if byte_range:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    else:
+        start, end = 0, size - 1
+        status_code = 200
+    headers["Content-Length"] = str(end - start + 1)
+    
+    if meta["inline"]:
+        async def read_chunk(offset: int, length: int) -> bytes:
+            return await db_manager.get_cv_chunk(cv_id, offset, length)
+        
+        body = iter_chunks(read_chunk, start, end)
+    else:
+        body = db_manager.stream_cv_blob(meta["sha256"], start, end)
+    
+    return StreamingResponse(
+        body,
+        status_code=status_code,
+        media_type="application/pdf",
+        headers=headers
+    )
 
 @router.get("/stats")
 async def get_stats():
     """Get basic job and CV statistics"""
+    cache_key = ("stats",)
+    cached = cached_json(cache_key)
+    if cached is not None:
+        return cached
+    version = response_cache.version
+    
     try:
-        stats = db_manager.get_basic_stats()
-        return {
+        stats = await db_manager.get_basic_stats()
+        return cache_json(cache_key, version, {
             "status": "success",
             "data": stats
-        }
+        })
     except Exception as e:
         logger.error(f"Failed to get stats: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get response cache, PDF render cache and web search cache hit/miss metrics"""
+    # The render and search caches read their on-disk stores, so they are queried off the event loop
+    return {
+        "status": "success",
+        "data": response_cache.stats(),
+        "render_cache": await run_in_threadpool(lambda: get_render_cache().stats()),
+        "search_cache": await run_in_threadpool(lambda: get_search_cache().stats())
+    }
\ No newline at end of file
@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 import sys
 from pathlib import Path
 
@@ -9,7 +9,10 @@ project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root / "jobapp_agent" / "src"))
 
 from jobapp_agent.db.config import GenerateConfig
-from endpoints import router
+from jobapp_agent.db.pool import close_pool
+from jobapp_agent.db.migrations import migrate
+from endpoints import router, db_manager, agent_runner, data_version_listener
+from metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
 
 # Frontend directory
 frontend_dir = project_root / "frontend"
@@ -31,6 +34,29 @@ app.add_middleware(
 app.include_router(router)
 app.mount("/static", StaticFiles(directory=str(frontend_dir)), name="static")
 
+@app.on_event("startup")
+def apply_migrations():
+    """Bring the database schema up to date before serving requests"""
+    migrate()
+
+@app.on_event("startup")
+def recover_agent_runs():
+    """Fail agent runs left queued or running by a previous crash or restart"""
+    agent_runner.recover_interrupted_runs()
+
+@app.on_event("startup")
+def start_cache_invalidation():
+    """Start listening for data changes that invalidate the response cache"""
+    data_version_listener.start()
+
+@app.on_event("shutdown")
+def shutdown_pool():
+    """Stop queued agent runs, drain the database executor and close pooled connections on shutdown"""
+    agent_runner.shutdown()
+    data_version_listener.stop()
+    db_manager.shutdown()
+    close_pool()
+
 @app.get("/")
 async def serve_frontend():
     """Serve the frontend index.html"""
@@ -53,7 +79,8 @@ async def health_check():
             "status": "healthy",
             "database": "connected",
             "ai_agent": "available",
-            "database_host": db_config.get("host", "unknown")
+            "database_host": db_config.get("host", "unknown"),
+            "database_pool": db_manager.get_pool_stats()
         }
     except Exception as e:
         return {
@@ -61,6 +88,12 @@ async def health_check():
             "error": str(e)
         }
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: tool, LLM, task, search, embedding, render and db span timings"""
+    body = render_metrics(agent_runner.get_status(), db_manager.get_pool_stats())
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
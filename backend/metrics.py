@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "jobapp_agent" / "src"))
+
+from jobapp_agent.tracing import tracer
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Pool stats that describe its current state; every other pool stat is a cumulative counter
+POOL_GAUGE_STATS = ("minconn", "maxconn", "idle", "in_use")
+
+def _samples(name: str, help_text: str, metric_type: str, samples: Dict[str, float], label: str = None) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for key, value in samples.items():
+        labels = f'{{{label}="{key}"}}' if label else ""
+        lines.append(f"{name}{labels} {value}")
+    return lines
+
+def _gauge(name: str, help_text: str, samples: Dict[str, float], label: str = None) -> List[str]:
+    return _samples(name, help_text, "gauge", samples, label)
+
+def _counter(name: str, help_text: str, samples: Dict[str, float], label: str = None) -> List[str]:
+    return _samples(name, help_text, "counter", samples, label)
+
+def render_metrics(agent_status: Dict, pool_stats: Dict[str, int]) -> str:
+    """Prometheus text exposition of span metrics plus run queue and connection pool gauges"""
+    lines = tracer.render_prometheus()
+    lines += _gauge("jobapp_agent_runs", "Agent runs currently running or queued",
+                    {"running": agent_status.get("active_runs", 0), "queued": agent_status.get("queued_runs", 0)},
+                    label="state")
+    numeric = {key: value for key, value in pool_stats.items() if isinstance(value, (int, float))}
+    lines += _gauge("jobapp_db_pool", "Database connection pool size and connections idle or in use",
+                    {key: value for key, value in numeric.items() if key in POOL_GAUGE_STATS},
+                    label="stat")
+    lines += _counter("jobapp_db_pool_events_total", "Database connection pool events since startup",
+                      {key: value for key, value in numeric.items() if key not in POOL_GAUGE_STATS},
+                      label="event")
+    return "\n".join(lines) + "\n"
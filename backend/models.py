@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 class JobResponse(BaseModel):
@@ -14,6 +14,22 @@ class JobResponse(BaseModel):
     is_processed: bool = False
     created_at: Optional[datetime] = None
 
+class JobSummaryResponse(BaseModel):
+    """Model for job list rows, without the full description"""
+    job_id: int
+    title: str
+    company: Optional[str] = None
+    link: str
+    source: Optional[str] = None
+    match_score: Optional[int] = None
+    scraped_date: Optional[datetime] = None
+    is_processed: bool = False
+    created_at: Optional[datetime] = None
+
+class JobSearchResult(JobSummaryResponse):
+    """Model for a ranked job search hit"""
+    rank: float = 0.0
+
 class CVResponse(BaseModel):
     """Model for CV data returned by the API"""
     cv_id: int
@@ -23,16 +39,30 @@ class CVResponse(BaseModel):
     job_title: Optional[str] = None
     company: Optional[str] = None
 
+class JobDetailResponse(JobResponse):
+    """Model for job detail endpoint response"""
+    duplicate_of: Optional[int] = None  # canonical job when this posting is a near-duplicate
+    cvs: List[CVResponse] = []
+
 class JobListResponse(BaseModel):
     """Model for job list endpoint response"""
-    jobs: List[JobResponse]
+    jobs: List[JobSummaryResponse]
     total: int
+    next_cursor: Optional[str] = None
     message: str = "Jobs retrieved successfully"
 
+class JobSearchResponse(BaseModel):
+    """Model for job search endpoint response"""
+    jobs: List[JobSearchResult]
+    total: int
+    query: str
+    message: str = "Search completed successfully"
+
 class CVListResponse(BaseModel):
     """Model for CV list endpoint response"""
     cvs: List[CVResponse]
     total: int
+    next_cursor: Optional[str] = None
     message: str = "CVs retrieved successfully"
 
 class AgentStatusResponse(BaseModel):
@@ -41,6 +71,28 @@ class AgentStatusResponse(BaseModel):
     message: str
     jobs_found: int = 0
     cvs_created: int = 0
+    active_runs: int = 0
+    queued_runs: int = 0
+
+class AgentRunResponse(BaseModel):
+    """Model for a single agent run"""
+    run_id: str
+    kind: str  # "agent", "cv_generation"
+    state: str  # "queued", "running", "completed", "error", "cancelled"
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    jobs_found: int = 0
+    cvs_created: int = 0
+    error: Optional[str] = None
+    summary: Dict[str, Any] = {}  # e.g. {"search_cache": {"hits": 3, "misses": 1}}
+
+class AgentRunListResponse(BaseModel):
+    """Model for agent run history endpoint response"""
+    runs: List[AgentRunResponse]
+    total: int
+    message: str = "Agent runs retrieved successfully"
 
 class StartAgentResponse(BaseModel):
     """Model for start agent endpoint response"""
@@ -0,0 +1,49 @@
+import asyncio
+import json
+from typing import AsyncIterator, Dict, Iterable
+
+from fastapi import Request
+
+from jobapp_agent.events import event_bus
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # disable proxy buffering so events arrive immediately
+}
+
+def format_sse(event: Dict) -> str:
+    """Encode an event bus event as a Server-Sent Events message"""
+    payload = json.dumps(event["data"], default=str)
+    return f"event: {event['type']}\ndata: {payload}\n\n"
+
+async def event_stream(request: Request, initial_events: Iterable[Dict] = (),
+                       heartbeat: float = 15.0, queue_size: int = 100) -> AsyncIterator[str]:
+    """Forward event bus events to one SSE client until it disconnects.
+
+    The bus publishes from worker threads, so events are handed to this client's
+    event loop with call_soon_threadsafe. A slow client drops its oldest events
+    rather than growing the queue without bound.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def put(event: Dict):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    unsubscribe = event_bus.subscribe(lambda event: loop.call_soon_threadsafe(put, event))
+    try:
+        for event in initial_events:
+            yield format_sse(event)
+
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        unsubscribe()
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from downloads import etag_matches, iter_chunks, parse_range_header
+
+ETAG = '"3f2a"'
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ("*", True),
+    ('"3f2a"', True),
+    ('"0000", "3f2a"', True),
+    ('W/"3f2a"', True),
+    ('"0000"', False),
+    ('"3f2a-gzip"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, ETAG) is expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=-200", (800, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes= 10 - 20 ", (10, 20)),
+])
+def test_parse_range_header(header, expected):
+    assert parse_range_header(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [None, "", "items=0-10", "bytes=0-10,20-30", "bytes=10"])
+def test_parse_range_header_serves_full_body(header):
+    assert parse_range_header(header, 1000) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=500-100", "bytes=-0", "bytes=a-b"])
+def test_parse_range_header_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range_header(header, 1000)
+
+
+def test_iter_chunks_reads_inclusive_range():
+    data = bytes(range(256)) * 4
+    reads = []
+
+    async def read_chunk(offset, length):
+        reads.append((offset, length))
+        return data[offset:offset + length]
+
+    async def collect():
+        return [chunk async for chunk in iter_chunks(read_chunk, 10, 109, chunk_size=32)]
+
+    chunks = asyncio.run(collect())
+    assert b"".join(chunks) == data[10:110]
+    assert reads == [(10, 32), (42, 32), (74, 32), (106, 4)]
+
+
+def test_iter_chunks_stops_at_end_of_data():
+    async def read_chunk(offset, length):
+        return b"x" * max(0, min(length, 50 - offset))
+
+    async def collect():
+        return [chunk async for chunk in iter_chunks(read_chunk, 0, 99, chunk_size=40)]
+
+    assert sum(len(chunk) for chunk in asyncio.run(collect())) == 50
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pagination import decode_cursor, encode_cursor, split_page
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2024, 5, 1, 12, 30, 15, 123456),
+    datetime(2024, 5, 1, 12, 30, 15, tzinfo=timezone.utc),
+])
+def test_cursor_round_trip(created_at):
+    cursor = encode_cursor(created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(datetime(2024, 1, 1), 1)[:-3]])
+def test_decode_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_split_page_returns_cursor_of_last_row_when_more_remain():
+    rows = [{"created_at": datetime(2024, 1, day), "id": day} for day in range(1, 5)]
+    page, next_cursor = split_page(rows, 3, "created_at", "id")
+    assert page == rows[:3]
+    assert decode_cursor(next_cursor) == (datetime(2024, 1, 3), 3)
+
+
+def test_split_page_last_page_has_no_cursor():
+    rows = [{"created_at": datetime(2024, 1, 1), "id": 1}]
+    assert split_page(rows, 3, "created_at", "id") == (rows, None)
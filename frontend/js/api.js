@@ -94,6 +94,14 @@ class API {
         return this.get('/agent/status');
     }
     
+    async getAgentRuns(limit = 20) {
+        return this.get(`/agent/runs?limit=${limit}`);
+    }
+    
+    async cancelAgentRun(runId) {
+        return this.post(`/agent/runs/${encodeURIComponent(runId)}/cancel`, {});
+    }
+    
     // Jobs API methods
     async getJobs(filters = {}) {
         const params = new URLSearchParams();
@@ -101,6 +109,8 @@ class API {
         if (filters.company) params.append('company', filters.company);
         if (filters.title) params.append('title', filters.title);
         if (filters.source) params.append('source', filters.source);
+        if (filters.limit) params.append('limit', filters.limit);
+        if (filters.cursor) params.append('cursor', filters.cursor);
         
         const queryString = params.toString();
         const endpoint = queryString ? `/jobs?${queryString}` : '/jobs';
@@ -108,9 +118,26 @@ class API {
         return this.get(endpoint);
     }
     
+    async searchJobs(query, limit = 50) {
+        const params = new URLSearchParams({ q: query, limit });
+        return this.get(`/jobs/search?${params.toString()}`);
+    }
+    
+    async getJob(jobId) {
+        return this.get(`/jobs/${jobId}`);
+    }
+    
     // CVs API methods
-    async getCVs() {
-        return this.get('/cvs');
+    async getCVs(options = {}) {
+        const params = new URLSearchParams();
+        
+        if (options.limit) params.append('limit', options.limit);
+        if (options.cursor) params.append('cursor', options.cursor);
+        
+        const queryString = params.toString();
+        const endpoint = queryString ? `/cvs?${queryString}` : '/cvs';
+        
+        return this.get(endpoint);
     }
     
     async downloadCV(cvId) {
@@ -3,6 +3,14 @@ class JobAppAI {
     constructor() {
         this.agentStatusInterval = null;
         this.statsInterval = null;
+        this.eventSource = null;
+        
+        // Loaded pages for the keyset-paginated lists
+        this.jobs = [];
+        this.jobsFilters = {};
+        this.jobsNextCursor = null;
+        this.cvs = [];
+        this.cvsNextCursor = null;
         
         this.init();
     }
@@ -14,8 +22,8 @@ class JobAppAI {
         // Setup event listeners
         this.setupEventListeners();
         
-        // Start periodic updates
-        this.startPeriodicUpdates();
+        // Subscribe to pushed agent events (falls back to polling)
+        this.connectEvents();
         
         // Initial agent status check
         this.updateAgentStatus();
@@ -65,6 +73,29 @@ class JobAppAI {
         });
     }
     
+    connectEvents() {
+        if (!window.EventSource) {
+            this.startPeriodicUpdates();
+            return;
+        }
+        
+        // The browser reconnects automatically; the server re-sends the status on connect
+        this.eventSource = new EventSource(`${api.baseURL}/agent/events`);
+        
+        this.eventSource.addEventListener('agent_status', (e) => {
+            this.displayAgentStatus(JSON.parse(e.data));
+        });
+        
+        const refreshStats = debounce(() => {
+            if (router.getCurrentRoute() === 'dashboard') {
+                this.loadDashboardStats();
+            }
+        }, 1000);
+        
+        this.eventSource.addEventListener('jobs_saved', refreshStats);
+        this.eventSource.addEventListener('cv_saved', refreshStats);
+    }
+    
     startPeriodicUpdates() {
         // Update agent status every 5 seconds
         this.agentStatusInterval = setInterval(() => {
@@ -198,6 +229,10 @@ class JobAppAI {
         contentBody.innerHTML = `
             <div class="filters-container">
                 <div class="filters-grid">
+                    <div class="form-group">
+                        <label class="form-label">Search</label>
+                        <input type="text" class="form-input" id="searchFilter" placeholder="Search title, company, description...">
+                    </div>
                     <div class="form-group">
                         <label class="form-label">Company</label>
                         <input type="text" class="form-input" id="companyFilter" placeholder="Filter by company...">
@@ -232,14 +267,27 @@ class JobAppAI {
         this.setupJobsFilters();
     }
     
-    async loadJobsList(filters = {}) {
+    async loadJobsList(filters = {}, append = false) {
         try {
-            const response = await api.getJobs(filters);
+            if (!append) {
+                this.jobs = [];
+                this.jobsFilters = filters;
+                this.jobsNextCursor = null;
+            }
+            
+            const response = this.jobsFilters.q ?
+                await api.searchJobs(this.jobsFilters.q) :
+                await api.getJobs({ ...this.jobsFilters, cursor: this.jobsNextCursor });
             const container = document.getElementById('jobsContainer');
             
-            if (response && response.jobs && response.jobs.length > 0) {
+            if (response && response.jobs) {
+                this.jobs = this.jobs.concat(response.jobs);
+                this.jobsNextCursor = response.next_cursor || null;
+            }
+            
+            if (this.jobs.length > 0) {
                 const tableHeaders = ['Title', 'Company', 'Source', 'Date', 'Status', 'Actions'];
-                const tableRows = response.jobs.map(job => [
+                const tableRows = this.jobs.map(job => [
                     `<strong>${escapeHtml(job.title)}</strong>`,
                     escapeHtml(job.company || 'N/A'),
                     createBadge(job.source || 'unknown', 'info'),
@@ -257,7 +305,8 @@ class JobAppAI {
                     `
                 ]);
                 
-                container.innerHTML = createTable(tableHeaders, tableRows);
+                container.innerHTML = createTable(tableHeaders, tableRows) +
+                    this.createLoadMoreButton(this.jobsNextCursor, 'jobApp.loadJobsList(jobApp.jobsFilters, true)');
             } else {
                 container.innerHTML = createEmptyState(
                     'No Jobs Found', 
@@ -274,15 +323,18 @@ class JobAppAI {
     setupJobsFilters() {
         const companyFilter = document.getElementById('companyFilter');
         const titleFilter = document.getElementById('titleFilter');
+        const searchFilter = document.getElementById('searchFilter');
         
         const debouncedFilter = debounce(() => this.filterJobs(), 500);
         
         if (companyFilter) companyFilter.addEventListener('input', debouncedFilter);
         if (titleFilter) titleFilter.addEventListener('input', debouncedFilter);
+        if (searchFilter) searchFilter.addEventListener('input', debouncedFilter);
     }
     
     filterJobs() {
         const filters = {
+            q: document.getElementById('searchFilter')?.value.trim() || '',
             company: document.getElementById('companyFilter')?.value || '',
             title: document.getElementById('titleFilter')?.value || '',
             source: document.getElementById('sourceFilter')?.value || ''
@@ -293,8 +345,7 @@ class JobAppAI {
     
     async viewJobDetails(jobId) {
         try {
-            const response = await api.getJobs();
-            const job = response.jobs.find(j => j.job_id === jobId);
+            const job = await api.getJob(jobId);
             
             if (job) {
                 const content = `
@@ -364,14 +415,24 @@ class JobAppAI {
         await this.loadCVsList();
     }
     
-    async loadCVsList() {
+    async loadCVsList(append = false) {
         try {
-            const response = await api.getCVs();
+            if (!append) {
+                this.cvs = [];
+                this.cvsNextCursor = null;
+            }
+            
+            const response = await api.getCVs({ cursor: this.cvsNextCursor });
             const container = document.getElementById('cvsContainer');
             
-            if (response && response.cvs && response.cvs.length > 0) {
+            if (response && response.cvs) {
+                this.cvs = this.cvs.concat(response.cvs);
+                this.cvsNextCursor = response.next_cursor || null;
+            }
+            
+            if (this.cvs.length > 0) {
                 const tableHeaders = ['Job Title', 'Company', 'Match Score', 'Created', 'Actions'];
-                const tableRows = response.cvs.map(cv => [
+                const tableRows = this.cvs.map(cv => [
                     `<strong>${escapeHtml(cv.job_title || 'N/A')}</strong>`,
                     escapeHtml(cv.company || 'N/A'),
                     cv.match_score ? 
@@ -388,7 +449,8 @@ class JobAppAI {
                     `
                 ]);
                 
-                container.innerHTML = createTable(tableHeaders, tableRows);
+                container.innerHTML = createTable(tableHeaders, tableRows) +
+                    this.createLoadMoreButton(this.cvsNextCursor, 'jobApp.loadCVsList(true)');
             } else {
                 container.innerHTML = createEmptyState(
                     'No CVs Found', 
@@ -408,6 +470,18 @@ class JobAppAI {
         }
     }
     
+    createLoadMoreButton(nextCursor, onClick) {
+        if (!nextCursor) return '';
+        
+        return `
+            <div style="display: flex; justify-content: center; margin-top: 1rem;">
+                <button class="btn btn-secondary" onclick="${onClick}">
+                    Load More
+                </button>
+            </div>
+        `;
+    }
+    
     getScoreBadgeType(score) {
         if (score >= 80) return 'badge-success';
         if (score >= 60) return 'badge-warning';
@@ -467,8 +541,7 @@ class JobAppAI {
     
     async viewCVDetails(cvId) {
         try {
-            const response = await api.getCVs();
-            const cv = response.cvs.find(c => c.cv_id === cvId);
+            const cv = this.cvs.find(c => c.cv_id === cvId);
             
             if (cv) {
                 const content = `
@@ -551,7 +624,7 @@ class JobAppAI {
             showLoading(false);
             
             if (response) {
-                showToast('Agent started successfully', 'success');
+                showToast(response.message || 'Agent started successfully', 'success');
                 this.updateAgentStatus();
             }
         } catch (error) {
@@ -590,8 +663,9 @@ class JobAppAI {
         const startBtn = document.getElementById('startAgentBtn');
         const startControlBtn = document.getElementById('startAgentControlBtn');
         
-        const buttonText = status.status === 'running' ? 'Agent Running' : 'Start Agent';
-        const isDisabled = status.status === 'running';
+        // Runs are queued server-side, so starting another one while busy is allowed
+        const buttonText = status.status === 'running' ? 'Queue Another Run' : 'Start Agent';
+        const isDisabled = false;
         
         if (startBtn) {
             startBtn.textContent = buttonText;
@@ -606,6 +680,9 @@ class JobAppAI {
     
     // Cleanup
     destroy() {
+        if (this.eventSource) {
+            this.eventSource.close();
+        }
         if (this.agentStatusInterval) {
             clearInterval(this.agentStatusInterval);
         }
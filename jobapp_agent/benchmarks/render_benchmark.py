@@ -0,0 +1,70 @@
+"""Benchmark CV PDF rendering throughput (PDFs/sec) against the number of worker processes.
+
+Renders a batch of synthetic CVs once in-process with render_cv_pdf and then with
+render_many at 1, 2, 4, ... workers up to the core count. Pool start-up is warmed
+before timing, since the pool is kept alive between batches in normal use.
+
+Usage:
+    cd jobapp_agent
+    python benchmarks/render_benchmark.py --cvs 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from jobapp_agent.render import render_cv_pdf, render_many, shutdown_render_pool
+
+SKILLS = ["Python", "FastAPI", "PostgreSQL", "LangChain", "OpenAI API", "Docker", "Airflow", "PyTorch",
+          "Kafka", "Spark", "AWS", "Redis", "SQL", "Go", "Kubernetes"]
+
+def synthetic_cv(i: int) -> str:
+    lines = [f"Candidate {i}", f"candidate{i}@example.com | +90 555 000 {i % 10000:04d}", "",
+             "SUMMARY", "Engineer building data platforms and LLM applications. " * 3, "",
+             "EXPERIENCE"]
+    for job in range(4):
+        lines.append(f"Data Engineer at Company {job} (2020 - 2024)")
+        for bullet in range(6):
+            skill = SKILLS[(i + job + bullet) % len(SKILLS)]
+            lines.append(f"- Built {skill} pipelines serving {bullet + 1}M requests per day with monitoring")
+    lines += ["", "TECHNICAL SKILLS", ", ".join(SKILLS), "", "EDUCATION", "BSc Computer Engineering"]
+    return "\n".join(lines)
+
+def worker_counts(max_workers: int) -> list:
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    return counts + [max_workers]
+
+def run(cvs: int, max_workers: int) -> None:
+    texts = [synthetic_cv(i) for i in range(cvs)]
+
+    start = time.perf_counter()
+    for text in texts:
+        render_cv_pdf(text)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"mode": "in_process", "workers": 1, "cvs": cvs,
+                      "seconds": round(elapsed, 2), "pdfs_per_sec": round(cvs / elapsed, 1)}))
+
+    for workers in worker_counts(max_workers):
+        render_many(texts[:workers * 2], max_workers=workers)  # start and warm the pool
+        start = time.perf_counter()
+        pdfs = render_many(texts, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(json.dumps({"mode": "render_many", "workers": workers, "cvs": cvs,
+                          "seconds": round(elapsed, 2), "pdfs_per_sec": round(cvs / elapsed, 1),
+                          "avg_kb": round(sum(len(pdf) for pdf in pdfs) / len(pdfs) / 1024, 1)}))
+    shutdown_render_pool()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cvs", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    run(args.cvs, args.max_workers)
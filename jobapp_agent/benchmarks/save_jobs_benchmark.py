@@ -0,0 +1,90 @@
+"""Benchmark saving a batch of scraped jobs: per-row INSERT against COPY into a staging table.
+
+Creates a session-local TEMP table named ``jobs`` (it shadows the real table on this
+connection only) and saves the same synthetic batch twice per mode: once into an
+empty table and once again on top of it, where every row hits ON CONFLICT. Rows
+are fingerprinted up front so only the database work is timed.
+
+Usage:
+    cd jobapp_agent
+    python benchmarks/save_jobs_benchmark.py --rows 10000
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from jobapp_agent.db.bulk import bulk_insert_jobs
+from jobapp_agent.db.config import GenerateConfig
+from jobapp_agent.dedup import fingerprint_job
+
+ROW_INSERT_QUERY = """
+    INSERT INTO jobs (title, company, link, descript, source, scraped_date,
+                      canonical_link, posting_key, simhash, duplicate_of)
+    VALUES (%(title)s, %(company)s, %(link)s, %(snippet)s, %(source)s,
+            TO_DATE(%(scraped_date)s, 'DD/MM/YYYY'),
+            %(canonical_link)s, %(posting_key)s, %(simhash)s, %(duplicate_of)s)
+    ON CONFLICT (company, title, link) DO NOTHING
+    RETURNING job_id
+"""
+
+TITLES = ["Data Engineer", "Machine Learning Engineer", "AI Engineer", "Data Scientist",
+          "Python Developer", "Backend Developer", "MLOps Engineer"]
+COMPANIES = ["Trendyol", "Getir", "Hepsiburada", "Insider", "Peak Games", "Papara", "Turkcell"]
+
+def synthetic_jobs(rows: int) -> list:
+    jobs = []
+    for i in range(rows):
+        job = {
+            "title": f"{TITLES[i % len(TITLES)]} {i}",
+            "company": f"{COMPANIES[i % len(COMPANIES)]} {i % 997}",
+            "link": f"https://www.linkedin.com/jobs/view/{3900000000 + i}/?trk=public_jobs",
+            "snippet": f"We build products with Python, SQL and cloud services. Posting {i}, Istanbul.",
+            "source": "linkedin",
+            "scraped_date": "18/10/2026",
+            "duplicate_of": None,
+        }
+        jobs.append(fingerprint_job(job))
+    return jobs
+
+def save_row_by_row(cursor, jobs: list) -> int:
+    inserted = 0
+    for job in jobs:
+        cursor.execute(ROW_INSERT_QUERY, job)
+        if cursor.fetchone() is not None:
+            inserted += 1
+    return inserted
+
+def save_bulk(cursor, jobs: list) -> int:
+    return len(bulk_insert_jobs(cursor, jobs))
+
+def run(rows: int) -> None:
+    jobs = synthetic_jobs(rows)
+    conn = psycopg2.connect(**GenerateConfig.config())
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("CREATE TEMP TABLE jobs (LIKE public.jobs INCLUDING ALL)")
+            conn.commit()
+            for mode, save in (("row_by_row", save_row_by_row), ("copy_staging", save_bulk)):
+                cursor.execute("TRUNCATE jobs")
+                conn.commit()
+                for batch in ("new", "conflicting"):
+                    start = time.perf_counter()
+                    inserted = save(cursor, jobs)
+                    conn.commit()
+                    elapsed = time.perf_counter() - start
+                    print(json.dumps({"mode": mode, "batch": batch, "rows": rows, "inserted": inserted,
+                                      "seconds": round(elapsed, 3), "rows_per_sec": round(rows / elapsed)}))
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+    run(args.rows)
@@ -0,0 +1,17 @@
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "JOBAPP_CACHE_DIR"
+DEFAULT_CACHE_ROOT = Path(__file__).resolve().parents[2] / ".cache"
+
+
+def cache_root() -> Path:
+    """Root directory for local caches, overridable with JOBAPP_CACHE_DIR"""
+    return Path(os.getenv(CACHE_DIR_ENV) or DEFAULT_CACHE_ROOT).expanduser().resolve()
+
+
+def cache_dir(name: str) -> Path:
+    """Directory for one named cache, created on first use"""
+    path = cache_root() / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,6 +1,12 @@
 from .db.database import CrewAIJobStorage
 from .tools.job_database_tool import JobDatabaseTool
 from .tools.pdf_generator_tool import PDFGeneratorTool
+from .tools.cv_search_tool import CVSearchTool
+from .tools.cv_profile_tool import CVProfileTool
+from .tools.serper_tool import CachedSerperDevTool
+from .tools.pg_search_tool import TracedPGSearchTool
+from .llm_cache import agent_llm
+from .tracing import install_crewai_listeners
 
 from typing import List
 import os
@@ -8,10 +14,12 @@ import os
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from crewai_tools import SerperDevTool, PGSearchTool, PDFSearchTool, FileReadTool
 
 from dotenv import load_dotenv
 load_dotenv()
+install_crewai_listeners()
+
+CV_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "knowledge", "ozgur_cv.pdf"))
 
 @CrewBase
 class JobappAgent():
@@ -22,39 +30,39 @@ class JobappAgent():
     @agent
     def researcher(self) -> Agent:
         db = CrewAIJobStorage()
-        cv_path = os.path.join(os.path.dirname(__file__), "..", "..", "knowledge", "ozgur_cv.pdf")
-        cv_path = os.path.abspath(cv_path)
+        cv_path = CV_PATH
         
         return Agent(
             config=self.agents_config['researcher'],
             verbose=True,
+            llm=agent_llm(),
             inject_date=True,
             date_format="%d-%m-%Y",
             max_iter=15,
             max_max_execution_time=3600,
-            tools=[SerperDevTool(),
-                   PGSearchTool(db_uri=db.connection_url,table_name='jobs'),
+            tools=[CachedSerperDevTool(),
+                   TracedPGSearchTool(db_uri=db.connection_url,table_name='jobs'),
                    JobDatabaseTool(),
-                   PDFSearchTool(pdf=cv_path)],
+                   CVSearchTool(file_path=cv_path)],
             respect_context_window=True
         )
         
     @agent
     def optimizer(self) -> Agent:
         db = CrewAIJobStorage()
-        cv_path = os.path.join(os.path.dirname(__file__), "..", "..", "knowledge", "ozgur_cv.pdf")
-        cv_path = os.path.abspath(cv_path)
+        cv_path = CV_PATH
         
         return Agent(
             config=self.agents_config['optimizer'],
             verbose=True,
+            llm=agent_llm(),
             inject_date=True,
             date_format="%d-%m-%Y",
             max_iter=15,
             max_max_execution_time=3600,
-            tools=[PGSearchTool(db_uri=db.connection_url,table_name='jobs'),
-                   JobDatabaseTool(),
-                   FileReadTool(file_path=cv_path),
+            tools=[TracedPGSearchTool(db_uri=db.connection_url,table_name='jobs'),
+                   JobDatabaseTool(cv_path=cv_path),
+                   CVProfileTool(file_path=cv_path),
                    PDFGeneratorTool()],
             respect_context_window=True
         )
@@ -71,6 +79,12 @@ class JobappAgent():
             config=self.tasks_config['optimization_task'],
             context=[self.research_task()],
         )
+    
+    @task
+    def job_optimization_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['job_optimization_task'],
+        )
 
 
     @crew
@@ -83,3 +97,25 @@ class JobappAgent():
             process=Process.sequential,
             verbose=True,
         )
+
+    def research_crew(self, **crew_kwargs) -> Crew:
+        """Creates a crew that only discovers and saves jobs"""
+
+        return Crew(
+            agents=[self.researcher()],
+            tasks=[self.research_task()],
+            process=Process.sequential,
+            verbose=True,
+            **crew_kwargs
+        )
+
+    def job_optimization_crew(self, **crew_kwargs) -> Crew:
+        """Creates a crew that optimizes the CV for the single job given in the kickoff inputs"""
+
+        return Crew(
+            agents=[self.optimizer()],
+            tasks=[self.job_optimization_task()],
+            process=Process.sequential,
+            verbose=True,
+            **crew_kwargs
+        )
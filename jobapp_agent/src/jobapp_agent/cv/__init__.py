@@ -0,0 +1,13 @@
+from .files import extract_text, file_sha256
+from .profile import (
+    CVProfile,
+    get_cv_profile,
+    get_cv_text,
+    match_skills,
+)
+from .index import (
+    CVIndex,
+    EmbeddingConfig,
+    get_cv_index,
+    load_embedding_config,
+)
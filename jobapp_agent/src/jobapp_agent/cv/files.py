@@ -0,0 +1,37 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Tuple
+
+from pypdf import PdfReader
+
+_hashes: Dict[str, Tuple[int, int, str]] = {}
+_hashes_lock = threading.Lock()
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's content, memoized per process until its size or mtime changes"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    with _hashes_lock:
+        cached = _hashes.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    sha256 = digest.hexdigest()
+    with _hashes_lock:
+        _hashes[path] = (stat.st_mtime_ns, stat.st_size, sha256)
+    return sha256
+
+
+def extract_text(path: str) -> str:
+    """Plain text of a knowledge file; PDFs are extracted page by page"""
+    if path.lower().endswith(".pdf"):
+        reader = PdfReader(path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        return handle.read()
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..cache_paths import cache_dir
+from ..tracing import SPAN_EMBEDDING, span
+from .files import file_sha256
+from .profile import get_cv_text
+
+logger = logging.getLogger(__name__)
+
+# Bump when chunking or the on-disk layout changes so old indexes are rebuilt
+INDEX_FORMAT_VERSION = "1"
+EMBEDDING_BATCH_SIZE = 64
+
+
+@dataclass(frozen=True)
+class EmbeddingConfig:
+    model: str = "text-embedding-3-small"
+    chunk_size: int = 1000
+    chunk_overlap: int = 200
+
+
+def load_embedding_config() -> EmbeddingConfig:
+    """Embedding settings, overridable with CV_EMBEDDING_MODEL / CV_CHUNK_SIZE / CV_CHUNK_OVERLAP"""
+    defaults = EmbeddingConfig()
+    return EmbeddingConfig(
+        model=os.getenv("CV_EMBEDDING_MODEL", defaults.model),
+        chunk_size=int(os.getenv("CV_CHUNK_SIZE", defaults.chunk_size)),
+        chunk_overlap=int(os.getenv("CV_CHUNK_OVERLAP", defaults.chunk_overlap)),
+    )
+
+
+def index_key(file_hash: str, config: EmbeddingConfig) -> str:
+    """Identity of an index: any change to the file or the embedding config gives a new key"""
+    payload = json.dumps([INDEX_FORMAT_VERSION, file_hash, asdict(config)], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """Split text into overlapping character windows, preferring to break on whitespace"""
+    text = " ".join(text.split())
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            space = text.rfind(" ", start + chunk_overlap + 1, end)
+            if space != -1:
+                end = space
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - chunk_overlap, start + 1)
+    return [chunk for chunk in chunks if chunk]
+
+
+def embed_texts(texts: List[str], model: str) -> np.ndarray:
+    """Embed texts with the configured provider model; rows are L2-normalised"""
+    import litellm
+
+    vectors = []
+    for i in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+        batch = texts[i:i + EMBEDDING_BATCH_SIZE]
+        bytes_in = sum(len(text.encode("utf-8")) for text in batch)
+        with span(SPAN_EMBEDDING, model, items=len(batch), bytes_in=bytes_in) as current:
+            response = litellm.embedding(model=model, input=batch)
+            usage = getattr(response, "usage", None)
+            current.set(prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0)
+        vectors.extend(item["embedding"] for item in response.data)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+@lru_cache(maxsize=256)
+def _query_vector(model: str, query: str) -> np.ndarray:
+    return embed_texts([query], model)[0]
+
+
+class CVIndex:
+    """Chunks of one knowledge file with their embeddings, searchable by cosine similarity"""
+
+    def __init__(self, key: str, source: str, config: EmbeddingConfig, chunks: List[str], vectors: np.ndarray):
+        self.key = key
+        self.source = source
+        self.config = config
+        self.chunks = chunks
+        self.vectors = vectors
+
+    def search(self, query: str, k: int = 5) -> List[Dict]:
+        """Return the k chunks most similar to query, best first"""
+        if not self.chunks:
+            return []
+        scores = self.vectors @ _query_vector(self.config.model, query)
+        top = np.argsort(-scores)[:k]
+        return [{"chunk": self.chunks[i], "score": float(scores[i])} for i in top]
+
+    def save(self, root: Path) -> None:
+        """Write the index atomically as root/<key>/{chunks.json,vectors.npy}"""
+        target = root / self.key
+        if target.exists():
+            return
+        tmp_dir = Path(tempfile.mkdtemp(dir=root, prefix=".tmp-"))
+        try:
+            with open(tmp_dir / "chunks.json", "w", encoding="utf-8") as handle:
+                json.dump({"source": self.source, "config": asdict(self.config), "chunks": self.chunks}, handle)
+            np.save(tmp_dir / "vectors.npy", self.vectors)
+            os.rename(tmp_dir, target)
+        except OSError:
+            # Another process finished the same index first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not target.exists():
+                raise
+
+    @classmethod
+    def load(cls, root: Path, key: str) -> Optional["CVIndex"]:
+        target = root / key
+        try:
+            with open(target / "chunks.json", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            vectors = np.load(target / "vectors.npy")
+        except FileNotFoundError:
+            return None
+        return cls(key, meta["source"], EmbeddingConfig(**meta["config"]), meta["chunks"], vectors)
+
+
+_indexes: Dict[str, CVIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_cv_index(path: str, config: EmbeddingConfig = None) -> CVIndex:
+    """Return the embedding index of a knowledge file, building it only when the file changed.
+
+    Lookups go process memo -> on-disk index -> build, so repeated agent builds
+    and new processes reuse the stored embeddings and only a changed file (or
+    embedding config) pays for chunking and embedding again.
+    """
+    config = config or load_embedding_config()
+    key = index_key(file_sha256(path), config)
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            return index
+
+        root = cache_dir("cv_index")
+        index = CVIndex.load(root, key)
+        if index is None:
+            logger.info(f"Building embedding index for {path} with {config.model}")
+            chunks = chunk_text(get_cv_text(path), config.chunk_size, config.chunk_overlap)
+            vectors = embed_texts(chunks, config.model) if chunks else np.zeros((0, 0), dtype=np.float32)
+            index = CVIndex(key, os.path.abspath(path), config, chunks, vectors)
+            index.save(root)
+        _indexes[key] = index
+        return index
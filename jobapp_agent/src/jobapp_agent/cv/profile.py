@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from ..cache_paths import cache_dir
+from .files import extract_text, file_sha256
+
+logger = logging.getLogger(__name__)
+
+# Bump when parsing changes so cached profiles are rebuilt
+PROFILE_VERSION = "1"
+
+SECTION_ALIASES = {
+    "summary": ["summary", "profile", "objective", "about", "about me", "professional summary"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history"],
+    "skills": ["skills", "technical skills", "core competencies", "expertise", "technologies"],
+    "projects": ["projects", "key projects", "notable projects", "personal projects"],
+    "education": ["education", "academic background", "qualifications", "certifications", "certificates"],
+    "languages": ["languages"],
+}
+_SECTION_BY_ALIAS = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+# Technologies recognised anywhere in the CV, in their canonical spelling
+SKILL_VOCABULARY = [
+    "Python", "JavaScript", "TypeScript", "Go", "Java", "C++", "C#", "Rust", "SQL", "R", "Scala", "Bash",
+    "FastAPI", "Flask", "Django", "Node.js", "React", "Vue", "Next.js",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "SQLite", "Snowflake", "BigQuery",
+    "Pandas", "NumPy", "scikit-learn", "PyTorch", "TensorFlow", "Keras", "Hugging Face", "Transformers",
+    "LangChain", "LlamaIndex", "CrewAI", "OpenAI API", "LLM", "RAG", "NLP", "Computer Vision",
+    "Machine Learning", "Deep Learning", "MLOps", "MLflow", "Airflow", "dbt", "Spark", "Kafka", "Hadoop",
+    "Docker", "Kubernetes", "Terraform", "AWS", "GCP", "Azure", "Linux", "Git", "CI/CD", "REST", "GraphQL",
+]
+# Short names ("Go", "R") are ordinary words in lowercase, so they must match case-sensitively
+_SKILL_PATTERNS = [
+    (skill, re.compile(r"(?<![\w+#.])" + re.escape(skill) + r"(?![\w+#&])",
+                       0 if len(skill) <= 2 else re.IGNORECASE))
+    for skill in SKILL_VOCABULARY
+]
+_BULLET_RE = re.compile(r"^[•\-\*▪●◦]\s*")
+_SKILL_SPLIT_RE = re.compile(r"[,;|•/\n]")
+
+
+@dataclass
+class CVProfile:
+    file_hash: str
+    name: str = ""
+    summary: str = ""
+    skills: List[str] = field(default_factory=list)
+    experience: List[Dict] = field(default_factory=list)
+    projects: List[Dict] = field(default_factory=list)
+    education: List[str] = field(default_factory=list)
+    languages: List[str] = field(default_factory=list)
+
+    def to_text(self, section: str = "all") -> str:
+        """Compact text rendering of the profile, or of one section of it"""
+        parts = []
+        if section in ("all", "summary") and (self.name or self.summary):
+            parts.append(f"NAME: {self.name}\nSUMMARY: {self.summary}".strip())
+        if section in ("all", "skills") and self.skills:
+            parts.append("SKILLS: " + ", ".join(self.skills))
+        for key in ("experience", "projects"):
+            if section in ("all", key) and getattr(self, key):
+                lines = [key.upper() + ":"]
+                for entry in getattr(self, key):
+                    lines.append(f"- {entry['title']}")
+                    lines.extend(f"    * {detail}" for detail in entry["details"])
+                parts.append("\n".join(lines))
+        for key in ("education", "languages"):
+            if section in ("all", key) and getattr(self, key):
+                parts.append(f"{key.upper()}: " + "; ".join(getattr(self, key)))
+        return "\n\n".join(parts)
+
+
+def _section_of(line: str) -> str:
+    normalized = line.lower().strip(" :").strip()
+    if len(normalized) > 40:
+        return ""
+    return _SECTION_BY_ALIAS.get(normalized, "")
+
+
+def match_skills(text: str) -> List[str]:
+    """Vocabulary skills mentioned in text, in vocabulary order"""
+    return [skill for skill, pattern in _SKILL_PATTERNS if pattern.search(text)]
+
+
+def parse_profile(text: str, file_hash: str = "") -> CVProfile:
+    """Split CV text into sections and pull out skills, experience and projects"""
+    profile = CVProfile(file_hash=file_hash)
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        section = _section_of(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+
+    header = sections.get("header", [])
+    profile.name = header[0] if header else ""
+    profile.summary = " ".join(sections.get("summary", []))
+
+    listed = []
+    for line in sections.get("skills", []):
+        # "Languages: Python, Go" -> "Python", "Go"
+        values = line.split(":", 1)[1] if ":" in line else line
+        listed.extend(item.strip() for item in _SKILL_SPLIT_RE.split(_BULLET_RE.sub("", values)))
+    skills = match_skills(text)
+    known = {skill.lower() for skill in skills}
+    skills.extend(item for item in dict.fromkeys(listed) if item and len(item) <= 40 and item.lower() not in known)
+    profile.skills = skills
+
+    for key in ("experience", "projects"):
+        entries = []
+        for line in sections.get(key, []):
+            if _BULLET_RE.match(line) and entries:
+                entries[-1]["details"].append(_BULLET_RE.sub("", line))
+            else:
+                entries.append({"title": _BULLET_RE.sub("", line), "details": []})
+        setattr(profile, key, entries)
+
+    profile.education = [_BULLET_RE.sub("", line) for line in sections.get("education", [])]
+    profile.languages = [_BULLET_RE.sub("", line) for line in sections.get("languages", [])]
+    return profile
+
+
+_texts: Dict[str, str] = {}
+_profiles: Dict[str, CVProfile] = {}
+_lock = threading.Lock()
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def get_cv_text(path: str) -> str:
+    """Extracted plain text of a CV, extracted once per file content and cached on disk"""
+    file_hash = file_sha256(path)
+    text = _texts.get(file_hash)
+    if text is not None:
+        return text
+
+    with _lock:
+        if file_hash not in _texts:
+            cached = cache_dir("cv_text") / f"{file_hash}.txt"
+            if cached.exists():
+                _texts[file_hash] = cached.read_text(encoding="utf-8")
+            else:
+                logger.info(f"Extracting CV text from {path}")
+                _texts[file_hash] = extract_text(path)
+                _write_atomic(cached, _texts[file_hash])
+        return _texts[file_hash]
+
+
+def get_cv_profile(path: str) -> CVProfile:
+    """Structured profile of a CV, parsed once per file content and cached on disk"""
+    file_hash = file_sha256(path)
+    profile = _profiles.get(file_hash)
+    if profile is not None:
+        return profile
+
+    text = get_cv_text(path)
+    with _lock:
+        if file_hash not in _profiles:
+            cached = cache_dir("cv_profile") / f"{file_hash}-v{PROFILE_VERSION}.json"
+            if cached.exists():
+                _profiles[file_hash] = CVProfile(**json.loads(cached.read_text(encoding="utf-8")))
+            else:
+                _profiles[file_hash] = parse_profile(text, file_hash)
+                _write_atomic(cached, json.dumps(asdict(_profiles[file_hash])))
+        return _profiles[file_hash]
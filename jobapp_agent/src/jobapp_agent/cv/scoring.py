@@ -0,0 +1,163 @@
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .profile import CVProfile, SKILL_VOCABULARY, match_skills
+
+REQUIRED_WEIGHT = 60
+PREFERRED_WEIGHT = 25
+EXPERIENCE_MATCH = 15
+EXPERIENCE_CLOSE = 10
+DEFAULT_MATCH_THRESHOLD = 50
+
+LEVELS = ["junior", "mid", "senior", "lead"]
+_LEVEL_PATTERNS = [
+    ("lead", re.compile(r"\b(lead|principal|staff|head of|architect)\b", re.IGNORECASE)),
+    ("senior", re.compile(r"\b(senior|sr\.?)\b", re.IGNORECASE)),
+    ("junior", re.compile(r"\b(junior|jr\.?|entry[- ]level|intern(ship)?|graduate)\b", re.IGNORECASE)),
+    ("mid", re.compile(r"\b(mid[- ]?level|mid|intermediate)\b", re.IGNORECASE)),
+]
+_YEARS_RE = re.compile(r"(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years?|yrs?|yıl)", re.IGNORECASE)
+# Everything after one of these markers lists preferred rather than required skills
+_PREFERRED_RE = re.compile(
+    r"\b(preferred|nice[- ]to[- ]have|bonus|a plus|is a plus|desirable|good to have|tercih)\b", re.IGNORECASE
+)
+_DATE_RANGE_RE = re.compile(r"((?:19|20)\d{2})\s*[-–]\s*((?:19|20)\d{2}|present|current|now|halen)", re.IGNORECASE)
+
+_SKILL_INDEX = {skill: i for i, skill in enumerate(SKILL_VOCABULARY)}
+
+
+@dataclass
+class JobScore:
+    job_id: int
+    match_score: int
+    required_matched: List[str] = field(default_factory=list)
+    required_missing: List[str] = field(default_factory=list)
+    preferred_matched: List[str] = field(default_factory=list)
+    preferred_missing: List[str] = field(default_factory=list)
+    job_level: Optional[str] = None
+    experience_score: int = 0
+
+    @property
+    def matched_skills(self) -> List[str]:
+        return self.required_matched + self.preferred_matched
+
+    @property
+    def missing_skills(self) -> List[str]:
+        return self.required_missing + self.preferred_missing
+
+
+def load_match_threshold() -> int:
+    """Minimum match score for a job to get a CV, overridable with CV_MATCH_THRESHOLD"""
+    return int(os.getenv("CV_MATCH_THRESHOLD", DEFAULT_MATCH_THRESHOLD))
+
+
+def level_from_years(years: float) -> str:
+    if years < 2:
+        return "junior"
+    if years < 5:
+        return "mid"
+    if years < 8:
+        return "senior"
+    return "lead"
+
+
+def job_level(title: str, description: str) -> Optional[str]:
+    """Seniority asked for by a posting: title keywords first, then years of experience"""
+    for text in (title, description):
+        for level, pattern in _LEVEL_PATTERNS:
+            if pattern.search(text or ""):
+                return level
+    years = [int(match) for match in _YEARS_RE.findall(description or "")]
+    return level_from_years(min(years)) if years else None
+
+
+def candidate_level(profile: CVProfile) -> str:
+    """Seniority of the candidate from the date ranges of their experience entries"""
+    current_year = datetime.now().year
+    years = 0
+    for entry in profile.experience:
+        match = _DATE_RANGE_RE.search(entry["title"])
+        if match:
+            start = int(match.group(1))
+            end = current_year if not match.group(2).isdigit() else int(match.group(2))
+            years += max(0, end - start)
+    return level_from_years(years)
+
+
+def split_requirements(description: str) -> Tuple[List[str], List[str]]:
+    """Vocabulary skills of a posting, split into (required, preferred)"""
+    description = description or ""
+    marker = _PREFERRED_RE.search(description)
+    required_text, preferred_text = (description[:marker.start()], description[marker.start():]) if marker else (description, "")
+    required = match_skills(required_text)
+    preferred = [skill for skill in match_skills(preferred_text) if skill not in required]
+    return required, preferred
+
+
+def skill_matrix(skill_lists: List[List[str]]) -> np.ndarray:
+    """Boolean (rows x vocabulary) membership matrix"""
+    matrix = np.zeros((len(skill_lists), len(SKILL_VOCABULARY)), dtype=bool)
+    for row, skills in enumerate(skill_lists):
+        matrix[row, [_SKILL_INDEX[skill] for skill in skills if skill in _SKILL_INDEX]] = True
+    return matrix
+
+
+def score_jobs(jobs: List[Dict[str, Any]], profile: CVProfile) -> List[JobScore]:
+    """Compute the match score formula for many jobs at once.
+
+    Score = required share x 60 + preferred share x 25 + experience (15 match,
+    10 one level off, 0 otherwise). Shares are taken over vocabulary skills; a
+    posting that names no skills in a category, or no seniority, gets half of
+    that category's weight, since the fit is unknown rather than zero.
+    """
+    if not jobs:
+        return []
+    splits = [split_requirements(job.get("description") or "") for job in jobs]
+    required = skill_matrix([split[0] for split in splits])
+    preferred = skill_matrix([split[1] for split in splits])
+    candidate = skill_matrix([profile.skills])[0]
+
+    def share(matrix: np.ndarray) -> np.ndarray:
+        totals = matrix.sum(axis=1)
+        hits = (matrix & candidate).sum(axis=1)
+        return np.where(totals > 0, hits / np.maximum(totals, 1), 0.5)
+
+    own_level = LEVELS.index(candidate_level(profile))
+    levels = [job_level(job.get("title") or "", job.get("description") or "") for job in jobs]
+    known = np.array([level is not None for level in levels])
+    distance = np.array([abs(LEVELS.index(level) - own_level) if level else 0 for level in levels])
+    experience = np.select([~known, distance == 0, distance == 1],
+                           [EXPERIENCE_MATCH / 2, EXPERIENCE_MATCH, EXPERIENCE_CLOSE], 0)
+
+    scores = np.clip(np.rint(share(required) * REQUIRED_WEIGHT + share(preferred) * PREFERRED_WEIGHT + experience), 0, 100)
+
+    results = []
+    have = set(profile.skills)
+    for i, job in enumerate(jobs):
+        required_skills, preferred_skills = splits[i]
+        results.append(JobScore(
+            job_id=job["job_id"],
+            match_score=int(scores[i]),
+            required_matched=[skill for skill in required_skills if skill in have],
+            required_missing=[skill for skill in required_skills if skill not in have],
+            preferred_matched=[skill for skill in preferred_skills if skill in have],
+            preferred_missing=[skill for skill in preferred_skills if skill not in have],
+            job_level=levels[i],
+            experience_score=int(np.rint(experience[i])),
+        ))
+    return results
+
+
+def rank_jobs(jobs: List[Dict[str, Any]], profile: CVProfile,
+              threshold: int = 0) -> Tuple[List[Tuple[Dict[str, Any], JobScore]], List[JobScore]]:
+    """Score jobs, keep those at or above threshold best first, and return the rest separately"""
+    scored = list(zip(jobs, score_jobs(jobs, profile)))
+    kept = sorted((pair for pair in scored if pair[1].match_score >= threshold),
+                  key=lambda pair: pair[1].match_score, reverse=True)
+    skipped = [score for _, score in scored if score.match_score < threshold]
+    return kept, skipped
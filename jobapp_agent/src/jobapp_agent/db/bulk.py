@@ -0,0 +1,76 @@
+import csv
+import io
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Staging columns, in COPY order; scraped_date stays text until TO_DATE in the insert
+STAGING_COLUMNS = [
+    "ord", "title", "company", "link", "descript", "source", "scraped_date",
+    "canonical_link", "posting_key", "simhash", "duplicate_of",
+]
+NULL_MARKER = "\\N"
+
+
+def _ensure_staging(cursor) -> None:
+    # Session-local, so concurrent savers on other connections never see each other's rows
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS jobs_staging (
+            ord INTEGER,
+            title TEXT,
+            company TEXT,
+            link TEXT,
+            descript TEXT,
+            source TEXT,
+            scraped_date TEXT,
+            canonical_link TEXT,
+            posting_key TEXT,
+            simhash BIGINT,
+            duplicate_of INTEGER
+        ) ON COMMIT DELETE ROWS
+    """)
+    cursor.execute("TRUNCATE jobs_staging")
+
+
+def copy_to_staging(cursor, jobs: Iterable[Dict[str, Any]]) -> int:
+    """Stream prepared jobs into jobs_staging with a single COPY"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+    for ord_, job in enumerate(jobs):
+        row = {**job, "ord": ord_, "descript": job.get("snippet")}
+        writer.writerow([NULL_MARKER if row.get(column) is None else row[column] for column in STAGING_COLUMNS])
+        count += 1
+    buffer.seek(0)
+
+    _ensure_staging(cursor)
+    cursor.copy_expert(
+        f"COPY jobs_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')",
+        buffer
+    )
+    return count
+
+
+def insert_staged_jobs(cursor) -> List[Tuple]:
+    """Insert staged jobs in one statement; returns (job_id, company, title, link, duplicate_of) of new rows.
+
+    Rows that already exist (company, title, link) are skipped by ON CONFLICT, so
+    the returned rows are exactly the inserted ones.
+    """
+    cursor.execute("""
+        INSERT INTO jobs (title, company, link, descript, source, scraped_date,
+                          canonical_link, posting_key, simhash, duplicate_of)
+        SELECT title, company, link, descript, source, TO_DATE(scraped_date, 'DD/MM/YYYY'),
+               canonical_link, posting_key, simhash, duplicate_of
+        FROM jobs_staging
+        ORDER BY ord
+        ON CONFLICT (company, title, link) DO NOTHING
+        RETURNING job_id, company, title, link, duplicate_of
+    """)
+    return cursor.fetchall()
+
+
+def bulk_insert_jobs(cursor, jobs: List[Dict[str, Any]]) -> List[Tuple]:
+    """COPY jobs into staging and insert the new ones: two round trips for any batch size"""
+    if not jobs:
+        return []
+    copy_to_staging(cursor, jobs)
+    return insert_staged_jobs(cursor)
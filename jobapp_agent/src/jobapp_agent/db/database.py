@@ -1,45 +1,69 @@
-import psycopg2
+import threading
+import time
 from psycopg2 import DatabaseError
 from .config import GenerateConfig
-from pathlib import Path
+from .pool import get_pool
+from ..tracing import SPAN_DB, Span, tracer
 
 
 
 class CrewAIJobStorage:
     _instance = None
-    
+    _local = threading.local()
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(CrewAIJobStorage, cls).__new__(cls)
             cls._instance.db_config = GenerateConfig.config()
         return cls._instance
-    
+
     def __init__(self):
         self.connection_url = f"postgresql://{self.db_config['user']}:{self.db_config['password']}@{self.db_config['host']}:{self.db_config['port']}/{self.db_config['database']}"
-    
+
+    def _sessions(self) -> list:
+        # The instance is a process-wide singleton, so each thread keeps its own
+        # stack of (connection, cursor, span) entries instead of sharing self.conn/self.cursor
+        if not hasattr(self._local, "sessions"):
+            self._local.sessions = []
+        return self._local.sessions
+
+    @property
+    def conn(self):
+        sessions = self._sessions()
+        return sessions[-1][0] if sessions else None
+
+    @property
+    def cursor(self):
+        sessions = self._sessions()
+        return sessions[-1][1] if sessions else None
+
     def __enter__(self):
-        self.conn = psycopg2.connect(**self.db_config)
-        self.cursor = self.conn.cursor()
+        # Timed from checkout to release, so pool waits show up in the db span too
+        session_span = Span(SPAN_DB, "job_storage_session")
+        conn = get_pool().getconn()
+        try:
+            cursor = conn.cursor()
+        except Exception:
+            get_pool().putconn(conn, discard=True)
+            raise
+        self._sessions().append((conn, cursor, session_span))
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
+        conn, cursor, session_span = self._sessions().pop()
+        discard = False
+        try:
+            cursor.close()
             if exc_type is None:
-                self.conn.commit()
+                conn.commit()
             else:
-                self.conn.rollback()
-            self.conn.close()
-        
-    def create_schema(self):
-        sql_path = Path(__file__).resolve().parent / "sql" / "create_schema.sql"
-        with sql_path.open("r") as file:
-            query = file.read()
-        try:
-            self.cursor.execute(query)
-            self.conn.commit()
-        except DatabaseError as e:
-            self.conn.rollback()
-            raise e
-        
\ No newline at end of file
+                conn.rollback()
+        except DatabaseError:
+            discard = True
+            raise
+        finally:
+            get_pool().putconn(conn, discard=discard or conn.closed)
+            session_span.duration = time.perf_counter() - session_span.started
+            if exc_type is not None or discard:
+                session_span.status = "error"
+            tracer.record(session_span)
@@ -0,0 +1,174 @@
+import argparse
+import hashlib
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from .pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "sql" / "migrations"
+# Serializes migrators across processes (backend workers, CLI, agent runs)
+MIGRATION_LOCK_KEY = 0x6A6F6261
+_MIGRATION_FILE_RE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+_schema_verified = False
+_verify_lock = threading.Lock()
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text()
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+
+def discover_migrations() -> List[Migration]:
+    """Numbered migrations in sql/migrations, ordered by version"""
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        match = _MIGRATION_FILE_RE.match(path.name)
+        if not match:
+            raise ValueError(f"Invalid migration file name: {path.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {MIGRATIONS_DIR}")
+    return migrations
+
+
+def latest_version() -> int:
+    migrations = discover_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def _ensure_version_table(cursor) -> None:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def applied_migrations(cursor) -> dict:
+    """version -> checksum of every applied migration"""
+    _ensure_version_table(cursor)
+    cursor.execute("SELECT version, checksum FROM schema_version")
+    return dict(cursor.fetchall())
+
+
+def migrate(target: Optional[int] = None) -> List[Migration]:
+    """Apply pending migrations up to target (default: latest), each in its own transaction.
+
+    Runs under a session-level advisory lock, so concurrent starters wait for the
+    first one instead of racing. Migrations are written idempotently, which lets a
+    database created before versioning existed be brought under it by running them
+    all once. Returns the migrations applied by this call.
+    """
+    global _schema_verified
+    migrations = discover_migrations()
+    applied = []
+
+    with get_pool().connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+            try:
+                done = applied_migrations(cursor)
+                conn.commit()
+                for migration in migrations:
+                    if target is not None and migration.version > target:
+                        break
+                    if migration.version in done:
+                        if done[migration.version].strip() != migration.checksum:
+                            logger.warning(f"Migration {migration.version:04d}_{migration.name} "
+                                           f"changed after it was applied")
+                        continue
+                    logger.info(f"Applying migration {migration.version:04d}_{migration.name}")
+                    try:
+                        cursor.execute(migration.sql)
+                        cursor.execute("""
+                            INSERT INTO schema_version (version, name, checksum)
+                            VALUES (%s, %s, %s)
+                        """, (migration.version, migration.name, migration.checksum))
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        logger.error(f"Migration {migration.version:04d}_{migration.name} failed")
+                        raise
+                    applied.append(migration)
+            finally:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+                conn.commit()
+
+    if target is None or target >= latest_version():
+        _schema_verified = True
+    return applied
+
+
+def ensure_schema() -> None:
+    """Bring the schema up to date once per process; later calls return without querying.
+
+    The first call reads schema_version and only migrates if it is behind, so hot
+    paths can call this freely. Raises if the schema could not be brought up to date.
+    """
+    global _schema_verified
+    if _schema_verified:
+        return
+    with _verify_lock:
+        if _schema_verified:
+            return
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+                current = 0
+                if cursor.fetchone()[0]:
+                    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+                    current = cursor.fetchone()[0]
+        if current < latest_version():
+            migrate()
+        _schema_verified = True
+
+
+def schema_verified() -> bool:
+    return _schema_verified
+
+
+def migrate_cli():
+    """
+    Apply pending schema migrations, or list them with --status.
+    """
+    parser = argparse.ArgumentParser(description="Apply pending database schema migrations")
+    parser.add_argument("--target", type=int, default=None, help="Stop after this migration version")
+    parser.add_argument("--status", action="store_true", help="List applied and pending migrations")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.status:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                done = applied_migrations(cursor)
+        for migration in discover_migrations():
+            state = "applied" if migration.version in done else "pending"
+            print(f"{migration.version:04d}_{migration.name}: {state}")
+        return
+
+    applied = migrate(target=args.target)
+    if applied:
+        print(f"Applied {len(applied)} migrations: " + ", ".join(f"{m.version:04d}_{m.name}" for m in applied))
+    else:
+        print("Schema is up to date.")
@@ -0,0 +1,10 @@
+DATA_CHANGED_CHANNEL = "jobapp_data_changed"
+
+
+def notify_data_changed(cursor, table: str) -> None:
+    """Queue a NOTIFY for listeners (e.g. backend response caches) that job/CV data changed.
+
+    Postgres delivers the notification only when the surrounding transaction commits,
+    so listeners never observe a version bump before the data is visible.
+    """
+    cursor.execute("SELECT pg_notify(%s, %s)", (DATA_CHANGED_CHANNEL, table))
@@ -0,0 +1,290 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import psycopg2
+from psycopg2 import extensions
+
+from .config import GenerateConfig
+
+logger = logging.getLogger(__name__)
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection becomes available before the checkout timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe PostgreSQL connection pool shared by the backend and the agent tools.
+
+    Connections are health-checked on checkout, idle connections above ``minconn``
+    are reaped after ``max_idle`` seconds and usage counters are kept for metrics.
+    """
+
+    def __init__(self, db_config: Dict[str, str], minconn: int = 1, maxconn: int = 10,
+                 max_idle: float = 300.0, health_check_after: float = 30.0,
+                 checkout_timeout: float = 30.0, reap_interval: float = 60.0):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError(f"Invalid pool size: minconn={minconn}, maxconn={maxconn}")
+
+        self.db_config = db_config
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        self.checkout_timeout = checkout_timeout
+        self.reap_interval = reap_interval
+
+        self._cond = threading.Condition()
+        self._idle: List[tuple] = []  # (connection, last_used_monotonic), most recent last
+        self._in_use = set()
+        self._pending = 0  # slots reserved by threads that are still connecting
+        self._closed = False
+        self._metrics = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "checkout_waits": 0,
+            "checkout_timeouts": 0,
+            "health_check_failures": 0,
+            "idle_reaped": 0,
+        }
+
+        with self._cond:
+            for _ in range(minconn):
+                self._idle.append((self._connect(), time.monotonic()))
+
+        self._reaper = threading.Thread(target=self._reap_loop, name="db-pool-reaper", daemon=True)
+        self._reaper.start()
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.db_config)
+        with self._cond:
+            self._metrics["connections_created"] += 1
+        return conn
+
+    def _close(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled connection: {e}")
+        with self._cond:
+            self._metrics["connections_closed"] += 1
+
+    def _is_healthy(self, conn, idle_for: float) -> bool:
+        if conn.closed:
+            return False
+        if idle_for < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to ``checkout_timeout`` seconds"""
+        deadline = time.monotonic() + self.checkout_timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolExhaustedError("Connection pool is closed")
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    self._in_use.add(conn)
+                    break
+
+                if len(self._in_use) + self._pending < self.maxconn:
+                    # Reserve the slot before connecting outside of the lock
+                    conn = None
+                    self._pending += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics["checkout_timeouts"] += 1
+                    raise PoolExhaustedError(
+                        f"No database connection available within {self.checkout_timeout}s "
+                        f"(maxconn={self.maxconn})"
+                    )
+                if not waited:
+                    self._metrics["checkout_waits"] += 1
+                    waited = True
+                self._cond.wait(remaining)
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._pending -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._pending -= 1
+                self._in_use.add(conn)
+                self._metrics["checkouts"] += 1
+            return conn
+
+        if not self._is_healthy(conn, time.monotonic() - last_used):
+            logger.info("Discarding unhealthy pooled connection")
+            with self._cond:
+                self._metrics["health_check_failures"] += 1
+                self._in_use.discard(conn)
+                self._pending += 1
+            self._close(conn)
+            try:
+                fresh = self._connect()
+            except Exception:
+                with self._cond:
+                    self._pending -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._pending -= 1
+                self._in_use.add(fresh)
+                self._metrics["checkouts"] += 1
+            return fresh
+
+        with self._cond:
+            self._metrics["checkouts"] += 1
+        return conn
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """Return a connection to the pool, rolling back any open transaction"""
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        with self._cond:
+            self._in_use.discard(conn)
+            if discard or conn.closed or self._closed:
+                close_it = True
+            else:
+                self._idle.append((conn, time.monotonic()))
+                close_it = False
+            self._cond.notify()
+
+        if close_it:
+            self._close(conn)
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks out a connection and always returns it"""
+        conn = self.getconn()
+        try:
+            yield conn
+        except Exception:
+            self.putconn(conn, discard=conn.closed)
+            raise
+        else:
+            self.putconn(conn)
+
+    def reap_idle(self) -> int:
+        """Close connections idle for longer than ``max_idle`` while keeping ``minconn`` open"""
+        now = time.monotonic()
+        reaped = []
+        with self._cond:
+            total = len(self._idle) + len(self._in_use) + self._pending
+            keep = []
+            # Oldest connections sit at the front of the idle list
+            for conn, last_used in self._idle:
+                if total > self.minconn and now - last_used > self.max_idle:
+                    reaped.append(conn)
+                    total -= 1
+                else:
+                    keep.append((conn, last_used))
+            self._idle = keep
+            self._metrics["idle_reaped"] += len(reaped)
+
+        for conn in reaped:
+            self._close(conn)
+        return len(reaped)
+
+    def _reap_loop(self) -> None:
+        while True:
+            time.sleep(self.reap_interval)
+            with self._cond:
+                if self._closed:
+                    return
+            try:
+                self.reap_idle()
+            except Exception as e:
+                logger.warning(f"Idle connection reaping failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of pool size and usage counters"""
+        with self._cond:
+            return {
+                "minconn": self.minconn,
+                "maxconn": self.maxconn,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                **self._metrics,
+            }
+
+    def closeall(self) -> None:
+        """Close idle connections and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle = []
+            self._cond.notify_all()
+        for conn in idle:
+            self._close(conn)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+POOL_DEFAULTS = {
+    "minconn": 1,
+    "maxconn": 10,
+    "max_idle": 300.0,
+    "health_check_after": 30.0,
+    "checkout_timeout": 30.0,
+    "reap_interval": 60.0,
+}
+
+
+def load_pool_settings() -> Dict[str, float]:
+    """Read the optional [pool] section of database.ini, falling back to defaults"""
+    settings = dict(POOL_DEFAULTS)
+    try:
+        overrides = GenerateConfig.config(section="pool")
+    except Exception:
+        return settings
+    for key, value in overrides.items():
+        if key in settings:
+            settings[key] = type(POOL_DEFAULTS[key])(value)
+    return settings
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(GenerateConfig.config(), **load_pool_settings())
+                logger.info(f"Database connection pool created: {_pool.stats()}")
+    return _pool
+
+
+def close_pool() -> None:
+    """Close the process-wide pool if it was created"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
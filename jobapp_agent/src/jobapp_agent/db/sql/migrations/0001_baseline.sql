@@ -29,4 +29,4 @@ CREATE INDEX IF NOT EXISTS idx_jobs_processed ON jobs(is_processed);
 
 -- Indexes for optimized_cvs table
 CREATE INDEX IF NOT EXISTS idx_optimized_cvs_job_id ON optimized_cvs(job_id);
-CREATE INDEX IF NOT EXISTS idx_optimized_cvs_match_score ON optimized_cvs(match_score);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_optimized_cvs_match_score ON optimized_cvs(match_score);
@@ -0,0 +1,4 @@
+-- Keyset pagination indexes (ORDER BY created_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at_job_id ON jobs(created_at DESC, job_id DESC);
+CREATE INDEX IF NOT EXISTS idx_optimized_cvs_created_at_cv_id ON optimized_cvs(created_at DESC, cv_id DESC);
+CREATE INDEX IF NOT EXISTS idx_optimized_cvs_job_id_created_at ON optimized_cvs(job_id, created_at DESC, cv_id DESC);
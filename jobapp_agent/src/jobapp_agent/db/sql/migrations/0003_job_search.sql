@@ -0,0 +1,14 @@
+-- Full-text and fuzzy job search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(descript, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_search_vector ON jobs USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_jobs_title_trgm ON jobs USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_jobs_company_trgm ON jobs USING GIN (company gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_jobs_source_trgm ON jobs USING GIN (source gin_trgm_ops);
@@ -0,0 +1,5 @@
+-- CV download metadata: content hash for ETags and byte size for Range requests
+ALTER TABLE optimized_cvs ADD COLUMN IF NOT EXISTS cv_sha256 CHAR(64);
+ALTER TABLE optimized_cvs ADD COLUMN IF NOT EXISTS cv_size INTEGER;
+-- Keep PDFs uncompressed out of line so substring() reads only the requested chunk
+ALTER TABLE optimized_cvs ALTER COLUMN cv_data SET STORAGE EXTERNAL;
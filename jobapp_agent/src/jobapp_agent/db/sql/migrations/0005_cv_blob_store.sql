@@ -0,0 +1,15 @@
+-- Content-addressed CV blob store (Postgres backend); optimized_cvs keeps only hash, size and metadata
+CREATE TABLE IF NOT EXISTS cv_blobs (
+    sha256 CHAR(64) PRIMARY KEY,
+    encoding VARCHAR(16) NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL,
+    data BYTEA NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+-- Blobs are compressed by the application, so skip TOAST compression
+ALTER TABLE cv_blobs ALTER COLUMN data SET STORAGE EXTERNAL;
+
+ALTER TABLE optimized_cvs ALTER COLUMN cv_data DROP NOT NULL;
+ALTER TABLE optimized_cvs ADD COLUMN IF NOT EXISTS content_type VARCHAR(100) DEFAULT 'application/pdf';
+CREATE INDEX IF NOT EXISTS idx_optimized_cvs_cv_sha256 ON optimized_cvs(cv_sha256);
@@ -0,0 +1,219 @@
+-- Incrementally maintained statistics for /api/stats, kept in sync by statement-level triggers
+CREATE TABLE IF NOT EXISTS job_stats (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_jobs BIGINT NOT NULL DEFAULT 0,
+    processed_jobs BIGINT NOT NULL DEFAULT 0,
+    unique_companies BIGINT NOT NULL DEFAULT 0,
+    unique_sources BIGINT NOT NULL DEFAULT 0,
+    scored_cvs BIGINT NOT NULL DEFAULT 0,
+    match_score_sum BIGINT NOT NULL DEFAULT 0,
+    max_match_score INTEGER,
+    min_match_score INTEGER,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS company_job_counts (
+    company VARCHAR(200) PRIMARY KEY,
+    job_count BIGINT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_company_job_counts_job_count ON company_job_counts(job_count DESC, company);
+
+CREATE TABLE IF NOT EXISTS source_job_counts (
+    source VARCHAR(50) PRIMARY KEY,
+    job_count BIGINT NOT NULL
+);
+
+-- Apply a set of signed job rows (+1 inserted, -1 deleted) to the counters
+CREATE OR REPLACE FUNCTION stats_apply_job_delta(delta JSONB) RETURNS void AS $$
+DECLARE
+    new_companies BIGINT;
+    gone_companies BIGINT;
+    new_sources BIGINT;
+    gone_sources BIGINT;
+BEGIN
+    IF delta IS NULL OR jsonb_array_length(delta) = 0 THEN
+        RETURN;
+    END IF;
+
+    -- Updating the single stats row first serialises concurrent writers
+    UPDATE job_stats s
+    SET total_jobs = s.total_jobs + d.jobs,
+        processed_jobs = s.processed_jobs + d.processed,
+        updated_at = NOW()
+    FROM (
+        SELECT COALESCE(SUM(sign), 0) AS jobs,
+               COALESCE(SUM(sign) FILTER (WHERE is_processed), 0) AS processed
+        FROM jsonb_to_recordset(delta) AS x(company TEXT, source TEXT, is_processed BOOLEAN, sign INTEGER)
+    ) d
+    WHERE s.id = 1;
+
+    SELECT COUNT(*) INTO new_companies
+    FROM (
+        SELECT DISTINCT company
+        FROM jsonb_to_recordset(delta) AS x(company TEXT, source TEXT, is_processed BOOLEAN, sign INTEGER)
+        WHERE company IS NOT NULL
+    ) t
+    WHERE NOT EXISTS (SELECT 1 FROM company_job_counts c WHERE c.company = t.company);
+
+    INSERT INTO company_job_counts (company, job_count)
+    SELECT company, SUM(sign)
+    FROM jsonb_to_recordset(delta) AS x(company TEXT, source TEXT, is_processed BOOLEAN, sign INTEGER)
+    WHERE company IS NOT NULL
+    GROUP BY company
+    ON CONFLICT (company) DO UPDATE SET job_count = company_job_counts.job_count + EXCLUDED.job_count;
+
+    WITH gone AS (
+        DELETE FROM company_job_counts
+        WHERE job_count <= 0
+          AND company IN (SELECT company FROM jsonb_to_recordset(delta) AS x(company TEXT))
+        RETURNING 1
+    )
+    SELECT COUNT(*) INTO gone_companies FROM gone;
+
+    SELECT COUNT(*) INTO new_sources
+    FROM (
+        SELECT DISTINCT source
+        FROM jsonb_to_recordset(delta) AS x(company TEXT, source TEXT, is_processed BOOLEAN, sign INTEGER)
+        WHERE source IS NOT NULL
+    ) t
+    WHERE NOT EXISTS (SELECT 1 FROM source_job_counts c WHERE c.source = t.source);
+
+    INSERT INTO source_job_counts (source, job_count)
+    SELECT source, SUM(sign)
+    FROM jsonb_to_recordset(delta) AS x(company TEXT, source TEXT, is_processed BOOLEAN, sign INTEGER)
+    WHERE source IS NOT NULL
+    GROUP BY source
+    ON CONFLICT (source) DO UPDATE SET job_count = source_job_counts.job_count + EXCLUDED.job_count;
+
+    WITH gone AS (
+        DELETE FROM source_job_counts
+        WHERE job_count <= 0
+          AND source IN (SELECT source FROM jsonb_to_recordset(delta) AS x(source TEXT))
+        RETURNING 1
+    )
+    SELECT COUNT(*) INTO gone_sources FROM gone;
+
+    UPDATE job_stats
+    SET unique_companies = unique_companies + new_companies - gone_companies,
+        unique_sources = unique_sources + new_sources - gone_sources
+    WHERE id = 1;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION stats_jobs_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM stats_apply_job_delta(
+            (SELECT jsonb_agg(jsonb_build_object('company', company, 'source', source,
+                                                 'is_processed', is_processed, 'sign', 1))
+             FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM stats_apply_job_delta(
+            (SELECT jsonb_agg(jsonb_build_object('company', company, 'source', source,
+                                                 'is_processed', is_processed, 'sign', -1))
+             FROM old_rows));
+    ELSE
+        -- Only rows whose counted columns changed contribute to the delta
+        PERFORM stats_apply_job_delta(
+            (SELECT jsonb_agg(d) FROM (
+                SELECT jsonb_build_object('company', o.company, 'source', o.source,
+                                          'is_processed', o.is_processed, 'sign', -1) AS d
+                FROM old_rows o JOIN new_rows n ON n.job_id = o.job_id
+                WHERE (o.company, o.source, o.is_processed) IS DISTINCT FROM (n.company, n.source, n.is_processed)
+                UNION ALL
+                SELECT jsonb_build_object('company', n.company, 'source', n.source,
+                                          'is_processed', n.is_processed, 'sign', 1)
+                FROM old_rows o JOIN new_rows n ON n.job_id = o.job_id
+                WHERE (o.company, o.source, o.is_processed) IS DISTINCT FROM (n.company, n.source, n.is_processed)
+            ) changed));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION stats_optimized_cvs_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE job_stats s
+        SET scored_cvs = s.scored_cvs + d.cnt,
+            match_score_sum = s.match_score_sum + d.total,
+            max_match_score = GREATEST(s.max_match_score, d.max_score),
+            min_match_score = LEAST(s.min_match_score, d.min_score),
+            updated_at = NOW()
+        FROM (
+            SELECT COUNT(match_score) AS cnt, COALESCE(SUM(match_score), 0) AS total,
+                   MAX(match_score) AS max_score, MIN(match_score) AS min_score
+            FROM new_rows
+        ) d
+        WHERE s.id = 1;
+    ELSE
+        -- Updates and deletes are rare; recompute the CV aggregates exactly
+        UPDATE job_stats s
+        SET scored_cvs = d.cnt,
+            match_score_sum = d.total,
+            max_match_score = d.max_score,
+            min_match_score = d.min_score,
+            updated_at = NOW()
+        FROM (
+            SELECT COUNT(match_score) AS cnt, COALESCE(SUM(match_score), 0) AS total,
+                   MAX(match_score) AS max_score, MIN(match_score) AS min_score
+            FROM optimized_cvs
+        ) d
+        WHERE s.id = 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Seed the counters from existing data the first time they are created
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM job_stats) THEN
+        LOCK TABLE jobs, optimized_cvs IN SHARE MODE;
+
+        INSERT INTO company_job_counts (company, job_count)
+        SELECT company, COUNT(*) FROM jobs WHERE company IS NOT NULL GROUP BY company;
+
+        INSERT INTO source_job_counts (source, job_count)
+        SELECT source, COUNT(*) FROM jobs WHERE source IS NOT NULL GROUP BY source;
+
+        INSERT INTO job_stats (id, total_jobs, processed_jobs, unique_companies, unique_sources,
+                               scored_cvs, match_score_sum, max_match_score, min_match_score)
+        SELECT 1,
+               (SELECT COUNT(*) FROM jobs),
+               (SELECT COUNT(*) FROM jobs WHERE is_processed),
+               (SELECT COUNT(*) FROM company_job_counts),
+               (SELECT COUNT(*) FROM source_job_counts),
+               COUNT(match_score), COALESCE(SUM(match_score), 0), MAX(match_score), MIN(match_score)
+        FROM optimized_cvs;
+    END IF;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_jobs_stats_insert ON jobs;
+CREATE TRIGGER trg_jobs_stats_insert AFTER INSERT ON jobs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_jobs_changed();
+
+DROP TRIGGER IF EXISTS trg_jobs_stats_update ON jobs;
+CREATE TRIGGER trg_jobs_stats_update AFTER UPDATE ON jobs
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_jobs_changed();
+
+DROP TRIGGER IF EXISTS trg_jobs_stats_delete ON jobs;
+CREATE TRIGGER trg_jobs_stats_delete AFTER DELETE ON jobs
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_jobs_changed();
+
+DROP TRIGGER IF EXISTS trg_optimized_cvs_stats_insert ON optimized_cvs;
+CREATE TRIGGER trg_optimized_cvs_stats_insert AFTER INSERT ON optimized_cvs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_optimized_cvs_changed();
+
+DROP TRIGGER IF EXISTS trg_optimized_cvs_stats_update ON optimized_cvs;
+CREATE TRIGGER trg_optimized_cvs_stats_update AFTER UPDATE OF match_score, job_id ON optimized_cvs
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_optimized_cvs_changed();
+
+DROP TRIGGER IF EXISTS trg_optimized_cvs_stats_delete ON optimized_cvs;
+CREATE TRIGGER trg_optimized_cvs_stats_delete AFTER DELETE ON optimized_cvs
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_optimized_cvs_changed();
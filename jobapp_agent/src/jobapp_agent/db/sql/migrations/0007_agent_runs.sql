@@ -0,0 +1,14 @@
+-- Agent run history written by the backend run queue
+CREATE TABLE IF NOT EXISTS agent_runs (
+    run_id VARCHAR(32) PRIMARY KEY,
+    kind VARCHAR(32) NOT NULL,
+    state VARCHAR(16) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    jobs_found INTEGER NOT NULL DEFAULT 0,
+    cvs_created INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_agent_runs_created_at ON agent_runs(created_at DESC);
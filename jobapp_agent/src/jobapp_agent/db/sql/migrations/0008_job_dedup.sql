@@ -0,0 +1,14 @@
+-- Ingest-time deduplication: near-duplicate postings point at their canonical job
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS canonical_link VARCHAR(1000);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS posting_key CHAR(40);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS simhash BIGINT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS duplicate_of INTEGER REFERENCES jobs(job_id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_canonical_link ON jobs(canonical_link) WHERE duplicate_of IS NULL;
+CREATE INDEX IF NOT EXISTS idx_jobs_posting_key ON jobs(posting_key) WHERE duplicate_of IS NULL;
+-- One index per 16-bit SimHash band (LSH): hashes within 3 bits share at least one band
+CREATE INDEX IF NOT EXISTS idx_jobs_simhash_band0 ON jobs(((simhash >> 0) & 65535)) WHERE duplicate_of IS NULL;
+CREATE INDEX IF NOT EXISTS idx_jobs_simhash_band1 ON jobs(((simhash >> 16) & 65535)) WHERE duplicate_of IS NULL;
+CREATE INDEX IF NOT EXISTS idx_jobs_simhash_band2 ON jobs(((simhash >> 32) & 65535)) WHERE duplicate_of IS NULL;
+CREATE INDEX IF NOT EXISTS idx_jobs_simhash_band3 ON jobs(((simhash >> 48) & 65535)) WHERE duplicate_of IS NULL;
+CREATE INDEX IF NOT EXISTS idx_jobs_unprocessed ON jobs(scraped_date DESC) WHERE is_processed = FALSE AND duplicate_of IS NULL;
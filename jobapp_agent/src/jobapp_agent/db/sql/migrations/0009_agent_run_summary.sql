@@ -0,0 +1,2 @@
+-- Per-run summary metrics (e.g. search cache hits/misses) reported by the run queue
+ALTER TABLE agent_runs ADD COLUMN IF NOT EXISTS summary JSONB NOT NULL DEFAULT '{}'::jsonb;
@@ -0,0 +1,5 @@
+-- CV generation runs claim the jobs they optimize, so concurrent runs never pick the same job
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(32);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claimed_by ON jobs(claimed_by) WHERE claimed_by IS NOT NULL;
@@ -0,0 +1,3 @@
+-- SimHash no longer boosts title and company words; clear the old fingerprints so
+-- `dedup_jobs` recomputes them and re-links duplicates with the new rule
+UPDATE jobs SET simhash = NULL WHERE simhash IS NOT NULL;
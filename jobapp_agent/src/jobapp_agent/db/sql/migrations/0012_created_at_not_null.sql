@@ -0,0 +1,8 @@
+-- Keyset pagination orders and builds cursors on created_at, so it can never be NULL
+UPDATE jobs SET created_at = COALESCE(scraped_date, NOW()) WHERE created_at IS NULL;
+ALTER TABLE jobs ALTER COLUMN created_at SET DEFAULT NOW();
+ALTER TABLE jobs ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE optimized_cvs SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE optimized_cvs ALTER COLUMN created_at SET DEFAULT NOW();
+ALTER TABLE optimized_cvs ALTER COLUMN created_at SET NOT NULL;
@@ -0,0 +1,276 @@
+import argparse
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+BAND_BITS = 16
+BANDS = SIMHASH_BITS // BAND_BITS
+# With 4 bands of 16 bits, any two hashes within 3 bits share at least one band exactly
+MAX_HAMMING_DISTANCE = BANDS - 1
+MIN_TITLE_OVERLAP = 0.5
+
+TRACKING_PARAMS = {
+    "ref", "refid", "src", "source", "trk", "trkinfo", "trackingid", "tracking_id", "gclid", "fbclid",
+    "msclkid", "lipi", "position", "pagenum", "originalsubdomain", "from", "cmp", "campaign", "sid",
+}
+TRACKING_PREFIXES = ("utm_", "mc_", "_hs")
+# Legal-form and filler words that differ between sites for the same employer
+COMPANY_SUFFIXES = {
+    "inc", "ltd", "llc", "corp", "co", "gmbh", "bv", "plc", "as", "a", "ş", "şti", "sti", "tic", "san",
+    "ticaret", "sanayi", "group", "grup", "holding", "teknoloji", "technology", "technologies",
+    "yazilim", "yazılım", "bilisim", "bilişim", "hizmetleri",
+}
+TITLE_NOISE = {"m", "f", "d", "w", "x", "remote", "hybrid", "onsite", "uzaktan", "hibrit"}
+_LINKEDIN_JOB_RE = re.compile(r"^/jobs/view/(?:[^/]*?-)?(\d+)/?$")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalise a job link so tracking parameters and host aliases do not create new jobs"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "m.", "tr."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+
+    linkedin_job = _LINKEDIN_JOB_RE.match(path) if host == "linkedin.com" else None
+    if linkedin_job:
+        # /jobs/view/senior-data-engineer-at-acme-3912345678 -> /jobs/view/3912345678
+        path = f"/jobs/view/{linkedin_job.group(1)}"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=False)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD_RE.findall((text or "").lower())
+
+
+def posting_key(title: str, company: str) -> str:
+    """Exact key for the same role at the same employer, as listed on different sites"""
+    title_words = [word for word in _tokens(title) if word not in TITLE_NOISE]
+    company_words = [word for word in _tokens(company) if word not in COMPANY_SUFFIXES]
+    if not title_words or not company_words:
+        return ""
+    normalized = " ".join(title_words) + "|" + " ".join(company_words)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def simhash(title: str, company: str, description: str) -> int:
+    """64-bit SimHash over word shingles of a posting plus its title and company words.
+
+    Title and company words count like any other feature, so the description
+    decides: the same title at the same employer with a different text is
+    another opening, not a duplicate.
+    """
+    weights: Dict[str, int] = {}
+    words = _tokens(description)
+    shingles = [" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 0))] or words
+    for feature in shingles:
+        weights[feature] = weights.get(feature, 0) + 1
+    for feature in _tokens(title) + _tokens(company):
+        weights["#" + feature] = weights.get("#" + feature, 0) + 1
+
+    vector = [0] * SIMHASH_BITS
+    for feature, weight in weights.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += weight if value >> bit & 1 else -weight
+
+    fingerprint = 0
+    for bit in range(SIMHASH_BITS):
+        if vector[bit] > 0:
+            fingerprint |= 1 << bit
+    return to_signed(fingerprint)
+
+
+def to_signed(value: int) -> int:
+    """Map an unsigned 64-bit value to the signed range of a Postgres BIGINT"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def bands(fingerprint: int) -> List[int]:
+    """16-bit bands of a fingerprint; band i equals SQL ((simhash >> 16*i) & 65535)"""
+    unsigned = fingerprint & ((1 << 64) - 1)
+    return [(unsigned >> (BAND_BITS * i)) & 0xFFFF for i in range(BANDS)]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << 64) - 1)).count("1")
+
+
+def title_overlap(a: str, b: str) -> float:
+    """Jaccard overlap of title words, guarding against boilerplate-heavy descriptions"""
+    words_a, words_b = set(_tokens(a)), set(_tokens(b))
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+@dataclass
+class Fingerprint:
+    job_id: Optional[int]
+    title: str
+    canonical_link: str
+    posting_key: str
+    simhash: int
+
+
+class FingerprintIndex:
+    """Lookup of canonical jobs by canonical link, posting key and SimHash band (LSH)"""
+
+    def __init__(self, max_distance: int = MAX_HAMMING_DISTANCE):
+        self.max_distance = max_distance
+        self._by_link: Dict[str, Fingerprint] = {}
+        self._by_key: Dict[str, List[Fingerprint]] = {}
+        self._bands: List[Dict[int, List[Fingerprint]]] = [{} for _ in range(BANDS)]
+
+    def add(self, fingerprint: Fingerprint) -> None:
+        if fingerprint.canonical_link:
+            self._by_link.setdefault(fingerprint.canonical_link, fingerprint)
+        if fingerprint.posting_key:
+            self._by_key.setdefault(fingerprint.posting_key, []).append(fingerprint)
+        for i, band in enumerate(bands(fingerprint.simhash)):
+            self._bands[i].setdefault(band, []).append(fingerprint)
+
+    def find(self, title: str, canonical_link: str, key: str, fingerprint: int) -> Optional[Fingerprint]:
+        """The canonical job this posting duplicates, or None if it is new.
+
+        Checked in order: same canonical link (tracking variants), same posting key
+        with a SimHash within max_distance bits (the same role cross-posted on
+        another site), then a SimHash within max_distance bits with overlapping
+        titles (reworded or reposted ads). A posting key alone is not enough: the
+        same title at the same employer may be another city or a new requisition.
+        """
+        if canonical_link and canonical_link in self._by_link:
+            return self._by_link[canonical_link]
+        if key and key in self._by_key:
+            distance, candidate = min(((hamming_distance(candidate.simhash, fingerprint), candidate)
+                                       for candidate in self._by_key[key]), key=lambda pair: pair[0])
+            if distance <= self.max_distance:
+                return candidate
+        seen: Set[int] = set()
+        best = None
+        for i, band in enumerate(bands(fingerprint)):
+            for candidate in self._bands[i].get(band, []):
+                # By identity: postings from the batch being saved have no job_id yet
+                if id(candidate) in seen:
+                    continue
+                seen.add(id(candidate))
+                distance = hamming_distance(candidate.simhash, fingerprint)
+                if distance <= self.max_distance and title_overlap(candidate.title, title) >= MIN_TITLE_OVERLAP:
+                    if best is None or distance < best[0]:
+                        best = (distance, candidate)
+        return best[1] if best else None
+
+
+def load_candidates(cursor, jobs: Iterable[Dict]) -> FingerprintIndex:
+    """Build an index of existing canonical jobs that could match any of the given postings.
+
+    Only rows sharing a canonical link, posting key or SimHash band with the batch
+    are read, using idx_jobs_canonical_link, idx_jobs_posting_key and the
+    idx_jobs_simhash_band* indexes.
+    """
+    jobs = list(jobs)
+    index = FingerprintIndex()
+    if not jobs:
+        return index
+    links = [job["canonical_link"] for job in jobs if job["canonical_link"]]
+    keys = [job["posting_key"] for job in jobs if job["posting_key"]]
+    job_bands = [bands(job["simhash"]) for job in jobs]
+    band_filters = " OR ".join(f"((simhash >> {BAND_BITS * i}) & 65535) = ANY(%s)" for i in range(BANDS))
+    cursor.execute(f"""
+        SELECT job_id, title, canonical_link, posting_key, simhash
+        FROM jobs
+        WHERE duplicate_of IS NULL
+          AND (canonical_link = ANY(%s) OR posting_key = ANY(%s)
+               OR (simhash IS NOT NULL AND ({band_filters})))
+    """, [links, keys] + [[b[i] for b in job_bands] for i in range(BANDS)])
+    for job_id, title, canonical_link, key, fingerprint in cursor.fetchall():
+        index.add(Fingerprint(job_id, title or "", canonical_link or "", key or "", fingerprint or 0))
+    return index
+
+
+def fingerprint_job(job: Dict) -> Dict:
+    """Add canonical_link, posting_key and simhash to a prepared job dict"""
+    job["canonical_link"] = canonicalize_url(job["link"])
+    job["posting_key"] = posting_key(job["title"], job["company"])
+    job["simhash"] = simhash(job["title"], job["company"], job.get("snippet", ""))
+    return job
+
+
+def backfill_fingerprints(batch_size: int = 500) -> Dict[str, int]:
+    """Fingerprint jobs saved before dedup existed and link the duplicates among them"""
+    from .db.database import CrewAIJobStorage
+    from .db.notify import notify_data_changed
+
+    fingerprinted = linked = 0
+    with CrewAIJobStorage() as db:
+        index = FingerprintIndex()
+        db.cursor.execute("""
+            SELECT job_id, title, canonical_link, posting_key, simhash
+            FROM jobs
+            WHERE simhash IS NOT NULL AND duplicate_of IS NULL
+        """)
+        for job_id, title, canonical_link, key, fingerprint in db.cursor.fetchall():
+            index.add(Fingerprint(job_id, title or "", canonical_link or "", key or "", fingerprint))
+
+        while True:
+            db.cursor.execute("""
+                SELECT job_id, title, company, link, descript
+                FROM jobs
+                WHERE simhash IS NULL
+                ORDER BY job_id
+                LIMIT %s
+            """, (batch_size,))
+            rows = db.cursor.fetchall()
+            if not rows:
+                break
+            for job_id, title, company, link, descript in rows:
+                canonical_link = canonicalize_url(link)
+                key = posting_key(title, company)
+                fingerprint = simhash(title, company, descript)
+                match = index.find(title or "", canonical_link, key, fingerprint)
+                duplicate_of = match.job_id if match else None
+                db.cursor.execute("""
+                    UPDATE jobs SET canonical_link = %s, posting_key = %s, simhash = %s, duplicate_of = %s
+                    WHERE job_id = %s
+                """, (canonical_link, key, fingerprint, duplicate_of, job_id))
+                if match is None:
+                    index.add(Fingerprint(job_id, title or "", canonical_link, key, fingerprint))
+                else:
+                    linked += 1
+                fingerprinted += 1
+            # duplicate_of changes which jobs the listings show
+            notify_data_changed(db.cursor, "jobs")
+            db.conn.commit()
+            logger.info(f"Fingerprinted {fingerprinted} jobs, linked {linked} duplicates")
+
+    return {"fingerprinted": fingerprinted, "linked": linked}
+
+
+def backfill_cli():
+    """
+    Fingerprint existing jobs and link near-duplicates to their canonical job.
+    """
+    parser = argparse.ArgumentParser(description="Fingerprint existing jobs and link near-duplicates")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    result = backfill_fingerprints(batch_size=args.batch_size)
+    print(f"Fingerprinted {result['fingerprinted']} jobs, linked {result['linked']} duplicates.")
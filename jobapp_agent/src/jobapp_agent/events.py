@@ -0,0 +1,58 @@
+import logging
+import threading
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Event types published by the agent side
+JOBS_SAVED = "jobs_saved"
+CV_SAVED = "cv_saved"
+AGENT_STATUS = "agent_status"
+SEARCH_CACHE_LOOKUP = "search_cache_lookup"
+
+# Set by the backend runner on the thread executing a run, so events published by
+# tools are attributed to that run without threading the id through the crew
+current_run_id: ContextVar[Optional[str]] = ContextVar("current_run_id", default=None)
+
+
+class EventBus:
+    """In-process publish/subscribe bus for agent progress events.
+
+    Subscribers are called synchronously on the publisher's thread, so they must be
+    quick and must not block (hand work off to a queue or event loop instead).
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """Register a callback and return a function that unregisters it"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, event_type: str, **data: Any) -> Dict[str, Any]:
+        """Deliver an event to every subscriber; a failing subscriber does not affect the others"""
+        if data.get("run_id") is None and current_run_id.get() is not None:
+            data["run_id"] = current_run_id.get()
+        event = {"type": event_type, "timestamp": datetime.now().isoformat(), "data": data}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"Event subscriber failed for {event_type}: {e}")
+        return event
+
+
+event_bus = EventBus()
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import LLM
+from litellm.integrations.custom_logger import CustomLogger
+
+from .cache_paths import cache_dir
+from .tracing import SPAN_LLM, Span, payload_size, span
+
+logger = logging.getLogger(__name__)
+
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODE_STRICT = "strict"
+LLM_CACHE_MODES = (MODE_OFF, MODE_RECORD, MODE_REPLAY, MODE_STRICT)
+DEFAULT_MODEL = "gpt-4o-mini"
+CACHE_FORMAT_VERSION = "1"
+
+# Agents inject today's date into their prompts; masked so recordings replay on later days
+_DATE_RE = re.compile(r"\b(\d{2}[-/.]\d{2}[-/.]\d{4}|\d{4}-\d{2}-\d{2}|\d{4}-\d{2})\b")
+
+
+class LLMCacheMiss(Exception):
+    """Raised in strict mode when a call has no recorded response"""
+
+    def __init__(self, model: str, key: str):
+        super().__init__(f"No recorded response for {model} call {key[:12]} (LLM_CACHE_MODE=strict)")
+        self.model = model
+        self.key = key
+
+
+def tools_hash(tools: Optional[List[dict]]) -> str:
+    return hashlib.sha256(json.dumps(tools or [], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def llm_cache_key(model: str, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None,
+                  **params: Any) -> str:
+    """Cache key of a call: model, sampling params, date-masked messages and the tool-schema hash"""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    material = json.dumps({
+        "version": CACHE_FORMAT_VERSION,
+        "model": model,
+        "params": params,
+        "messages": [{**message, "content": _DATE_RE.sub("<date>", str(message.get("content", "")))}
+                     for message in messages],
+        "tools": tools_hash(tools),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _last_content(messages: Any) -> str:
+    if isinstance(messages, str):
+        return messages
+    if isinstance(messages, list) and messages and isinstance(messages[-1], dict):
+        return str(messages[-1].get("content", ""))
+    return ""
+
+
+def _usage_count(usage: Any, key: str) -> int:
+    value = usage.get(key) if isinstance(usage, dict) else getattr(usage, key, None)
+    return value if isinstance(value, int) else 0
+
+
+class _UsageRecorder(CustomLogger):
+    """litellm callback that copies the token usage of one completion onto its span.
+
+    crewAI passes the callback to the call directly but also registers it on
+    litellm process-wide, so concurrent calls can see each other's recorders;
+    a recorder only counts the first completion whose last message matches its own.
+    """
+
+    def __init__(self, current: Span, messages: Any):
+        super().__init__()
+        self.current = current
+        self.last_message = _last_content(messages)
+        self._recorded = False
+        self._lock = threading.Lock()
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        if _last_content((kwargs or {}).get("messages")) != self.last_message:
+            return
+        usage = response_obj.get("usage") if isinstance(response_obj, dict) else getattr(response_obj, "usage", None)
+        if not usage:
+            return
+        with self._lock:
+            if self._recorded:
+                return
+            self._recorded = True
+        self.current.add(prompt_tokens=_usage_count(usage, "prompt_tokens"),
+                         completion_tokens=_usage_count(usage, "completion_tokens"))
+
+
+class CachedLLM(LLM):
+    """crewAI LLM that records responses to local disk and replays them.
+
+    Modes: ``off`` always calls the model; ``record`` always calls it and stores
+    the response; ``replay`` answers from the cache and records on a miss;
+    ``strict`` answers only from the cache and raises LLMCacheMiss otherwise, so a
+    recorded pipeline can be re-run offline and deterministically. Calls that let
+    the model execute functions are never cached, since replaying them would skip
+    the functions' side effects. Every call is traced as an llm span with its
+    token usage; replayed responses are traced under "<model> (cached)".
+    """
+
+    def __init__(self, model: str, mode: str = MODE_REPLAY, cache_root: Optional[Path] = None, **kwargs):
+        super().__init__(model=model, **kwargs)
+        if mode not in LLM_CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode {mode!r}, expected one of {', '.join(LLM_CACHE_MODES)}")
+        self.cache_mode = mode
+        self.cache_root = Path(cache_root) if cache_root is not None else cache_dir("llm")
+        self._cache_lock = threading.Lock()
+        self._cache_metrics = {"hits": 0, "misses": 0, "writes": 0}
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_root / key[:2] / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[str]:
+        try:
+            return json.loads(self._cache_path(key).read_text())["response"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {key[:12]}: {e}")
+            return None
+
+    def _write(self, key: str, response: str) -> None:
+        path = self._cache_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump({"model": self.model, "created_at": time.time(), "response": response}, file)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        with self._cache_lock:
+            self._cache_metrics["writes"] += 1
+
+    def _traced_call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        with span(SPAN_LLM, self.model, bytes_in=payload_size(messages)) as current:
+            callbacks = list(callbacks or []) + [_UsageRecorder(current, messages)]
+            response = super().call(messages, tools=tools, callbacks=callbacks,
+                                    available_functions=available_functions, **kwargs)
+            current.set(bytes_out=payload_size(response))
+            return response
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        if self.cache_mode == MODE_OFF or available_functions:
+            return self._traced_call(messages, tools=tools, callbacks=callbacks,
+                                     available_functions=available_functions, **kwargs)
+
+        key = llm_cache_key(self.model, messages, tools, temperature=self.temperature, stop=self.stop,
+                            seed=self.seed, max_tokens=self.max_tokens or self.max_completion_tokens)
+        if self.cache_mode != MODE_RECORD:
+            response = self._read(key)
+            with self._cache_lock:
+                self._cache_metrics["hits" if response is not None else "misses"] += 1
+            if response is not None:
+                with span(SPAN_LLM, f"{self.model} (cached)", bytes_in=payload_size(messages),
+                          bytes_out=payload_size(response)):
+                    return response
+            if self.cache_mode == MODE_STRICT:
+                raise LLMCacheMiss(self.model, key)
+
+        response = self._traced_call(messages, tools=tools, callbacks=callbacks, **kwargs)
+        if isinstance(response, str) and response:
+            self._write(key, response)
+        return response
+
+    def cache_stats(self) -> Dict[str, Any]:
+        with self._cache_lock:
+            return {"mode": self.cache_mode, **self._cache_metrics}
+
+
+def load_llm_cache_mode() -> str:
+    mode = os.getenv("LLM_CACHE_MODE", MODE_OFF).strip().lower()
+    if mode not in LLM_CACHE_MODES:
+        raise ValueError(f"Unknown LLM_CACHE_MODE {mode!r}, expected one of {', '.join(LLM_CACHE_MODES)}")
+    return mode
+
+
+def agent_llm() -> LLM:
+    """LLM for the crew's agents: a CachedLLM in LLM_CACHE_MODE (off by default), traced in every mode.
+
+    The model is resolved from the same environment variables crewAI uses
+    (MODEL, MODEL_NAME, OPENAI_MODEL_NAME), so the wrapper does not change which
+    model is called.
+    """
+    mode = load_llm_cache_mode()
+    model = os.getenv("MODEL") or os.getenv("MODEL_NAME") or os.getenv("OPENAI_MODEL_NAME") or DEFAULT_MODEL
+    base_url = os.getenv("BASE_URL") or os.getenv("OPENAI_API_BASE") or os.getenv("OPENAI_BASE_URL")
+    return CachedLLM(model=model, mode=mode, base_url=base_url)
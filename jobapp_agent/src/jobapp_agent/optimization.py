@@ -0,0 +1,157 @@
+import contextvars
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .crew import CV_PATH, JobappAgent
+from .cv import get_cv_profile
+from .cv.scoring import JobScore, load_match_threshold, rank_jobs
+from .events import current_run_id
+from .tools.job_database_tool import JobDatabaseTool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPTIMIZER_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 2
+RETRY_BACKOFF_SECONDS = 2.0
+
+
+@dataclass
+class JobOptimizationResult:
+    job_id: int
+    success: bool
+    attempts: int
+    duration_seconds: float
+    error: Optional[str] = None
+    output: Optional[str] = None
+
+
+def load_fanout_settings() -> Dict[str, int]:
+    """Fan-out settings, overridable with CV_OPTIMIZER_WORKERS / CV_OPTIMIZER_MAX_ATTEMPTS / CV_MATCH_THRESHOLD"""
+    return {
+        "max_workers": int(os.getenv("CV_OPTIMIZER_WORKERS", DEFAULT_OPTIMIZER_WORKERS)),
+        "max_attempts": int(os.getenv("CV_OPTIMIZER_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)),
+        "match_threshold": load_match_threshold(),
+    }
+
+
+def _job_inputs(job: Dict[str, Any], score: JobScore, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **inputs,
+        "job_id": job["job_id"],
+        "title": job["title"] or "",
+        "company": job["company"] or "",
+        "link": job["link"] or "",
+        "description": job["description"] or "",
+        "match_score": score.match_score,
+        "matched_skills": ", ".join(score.matched_skills) or "none detected",
+        "missing_skills": ", ".join(score.missing_skills) or "none detected",
+    }
+
+
+def optimize_job(job: Dict[str, Any], score: JobScore, inputs: Dict[str, Any], max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 step_callback: Optional[Callable] = None,
+                 should_stop: Optional[Callable[[], bool]] = None) -> JobOptimizationResult:
+    """Run a short-lived optimizer crew for one job, retrying until its CV is saved.
+
+    Each attempt gets a fresh JobappAgent so no conversation state leaks between
+    jobs or attempts. An attempt only counts as successful once the job is marked
+    processed, since the agent can finish without having saved anything.
+    """
+    job_id = job["job_id"]
+    started = time.monotonic()
+    error = None
+    output = None
+
+    for attempt in range(1, max_attempts + 1):
+        if should_stop is not None and should_stop():
+            error = "stopped before completion"
+            break
+        try:
+            crew_kwargs = {"step_callback": step_callback} if step_callback is not None else {}
+            crew = JobappAgent().job_optimization_crew(**crew_kwargs)
+            output = str(crew.kickoff(inputs=_job_inputs(job, score, inputs)))
+            if JobDatabaseTool().is_job_processed(job_id):
+                return JobOptimizationResult(job_id, True, attempt, time.monotonic() - started, output=output)
+            error = "optimizer finished without saving a CV"
+        except Exception as e:
+            error = str(e)
+
+        logger.warning(f"CV optimization for job {job_id} failed (attempt {attempt}/{max_attempts}): {error}")
+        if attempt < max_attempts and not (should_stop is not None and should_stop()):
+            time.sleep(RETRY_BACKOFF_SECONDS * attempt)
+
+    return JobOptimizationResult(job_id, False, attempt, time.monotonic() - started, error=error, output=output)
+
+
+def optimize_jobs(jobs: List[Dict[str, Any]], inputs: Dict[str, Any], max_workers: int = None,
+                  max_attempts: int = None, match_threshold: int = None, step_callback: Optional[Callable] = None,
+                  should_stop: Optional[Callable[[], bool]] = None) -> List[JobOptimizationResult]:
+    """Optimize CVs for many jobs in parallel, one optimizer execution per job.
+
+    Jobs are scored locally against the CV profile first; those below
+    match_threshold never reach the LLM and the rest run best match first.
+    Jobs are spread over a bounded thread pool; a failing job is retried on its
+    own and never aborts the rest of the batch. Workers run in a copy of the
+    caller's context, so events they publish keep the caller's run attribution.
+    """
+    settings = load_fanout_settings()
+    max_workers = max(1, max_workers or settings["max_workers"])
+    max_attempts = max(1, max_attempts or settings["max_attempts"])
+    if match_threshold is None:
+        match_threshold = settings["match_threshold"]
+    if not jobs:
+        return []
+
+    ranked, skipped = rank_jobs(jobs, get_cv_profile(CV_PATH), threshold=match_threshold)
+    if skipped:
+        logger.info(f"Skipping {len(skipped)} jobs scoring below {match_threshold}: "
+                    + ", ".join(f"{score.job_id} ({score.match_score})" for score in skipped))
+    if not ranked:
+        return []
+    jobs = [job for job, _ in ranked]
+
+    logger.info(f"Optimizing CVs for {len(jobs)} jobs with {min(max_workers, len(jobs))} workers")
+    results = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)), thread_name_prefix="cv-optimizer") as executor:
+        futures = {
+            executor.submit(contextvars.copy_context().run, optimize_job, job, score, inputs,
+                            max_attempts, step_callback, should_stop): job["job_id"]
+            for job, score in ranked
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = JobOptimizationResult(futures[future], False, 0, 0.0, error=str(e))
+            results.append(result)
+            status = "done" if result.success else f"failed: {result.error}"
+            logger.info(f"Job {result.job_id} {status} ({len(results)}/{len(jobs)})")
+
+    return results
+
+
+def optimize_unprocessed_jobs(inputs: Dict[str, Any], claimed_by: Optional[str] = None,
+                              **kwargs) -> List[JobOptimizationResult]:
+    """Fan out CV optimization over every job that has no CV yet.
+
+    The jobs are claimed for claimed_by (the current run by default) for the
+    duration of the batch, so concurrent runs split the unprocessed jobs
+    instead of generating duplicate CVs.
+    """
+    claimed_by = claimed_by or current_run_id.get() or uuid.uuid4().hex
+    tool = JobDatabaseTool()
+    jobs = tool.claim_unprocessed_jobs(claimed_by)
+    if jobs is None:
+        raise RuntimeError("Failed to ensure database schema exists")
+    try:
+        return optimize_jobs(jobs, inputs, **kwargs)
+    finally:
+        try:
+            tool.release_job_claims(claimed_by)
+        except Exception as e:
+            logger.warning(f"Failed to release job claims of {claimed_by}: {e}")
@@ -0,0 +1,11 @@
+from .pdf_engine import (
+    TEMPLATE_VERSION,
+    render_cv_pdf,
+    render_many,
+    shutdown_render_pool,
+)
+from .cache import (
+    RenderCache,
+    get_render_cache,
+    render_key,
+)
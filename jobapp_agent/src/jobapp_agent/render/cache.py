@@ -0,0 +1,201 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..cache_paths import cache_dir
+from ..tracing import SPAN_RENDER, span
+from .pdf_engine import TEMPLATE_VERSION, render_cv_pdf, render_many
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMORY_BYTES = 32 * 1024 * 1024
+
+
+def render_key(cv_text: str, template_version: str = TEMPLATE_VERSION) -> str:
+    """Cache key of a rendered PDF: same text and template always give the same bytes"""
+    return hashlib.sha256(f"{template_version}\0{cv_text}".encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Two-tier LRU cache of rendered CV PDFs keyed by render_key.
+
+    A small in-memory tier serves repeated renders without touching the disk; the
+    on-disk tier survives restarts and is shared by processes using the same
+    directory. Both tiers are bounded by total bytes and evict least recently
+    used entries.
+    """
+
+    def __init__(self, root: Path, max_disk_bytes: int = DEFAULT_DISK_BYTES,
+                 max_memory_bytes: int = DEFAULT_MEMORY_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._metrics = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._load_index()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pdf"
+
+    def _load_index(self) -> None:
+        # Oldest first, using mtime as the last-access time (bumped on every hit)
+        entries = []
+        for path in self.root.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _remember(self, key: str, pdf: bytes) -> None:
+        if len(pdf) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = pdf
+        self._memory_bytes += len(pdf)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached PDF bytes for key, or None on a miss"""
+        with self._lock:
+            pdf = self._memory.get(key)
+            if pdf is not None:
+                self._memory.move_to_end(key)
+                self._metrics["memory_hits"] += 1
+                return pdf
+
+        path = self._path(key)
+        try:
+            pdf = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process sharing the directory
+            with self._lock:
+                size = self._disk.pop(key, None)
+                if size is not None:
+                    self._disk_bytes -= size
+                self._metrics["misses"] += 1
+            return None
+
+        with self._lock:
+            if key not in self._disk:
+                self._disk_bytes += len(pdf)
+            self._disk[key] = len(pdf)
+            self._disk.move_to_end(key)
+            self._remember(key, pdf)
+            self._metrics["disk_hits"] += 1
+        return pdf
+
+    def put(self, key: str, pdf: bytes) -> None:
+        """Store PDF bytes under key in both tiers, evicting least recently used files"""
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(pdf)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        evicted = []
+        with self._lock:
+            previous = self._disk.pop(key, None)
+            if previous is not None:
+                self._disk_bytes -= previous
+            self._disk[key] = len(pdf)
+            self._disk_bytes += len(pdf)
+            self._remember(key, pdf)
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                self._memory_bytes -= len(self._memory.pop(old_key, b""))
+                self._metrics["evictions"] += 1
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                self._path(old_key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def render(self, cv_text: str) -> bytes:
+        """Return the PDF for cv_text, rendering and caching it on a miss"""
+        key = render_key(cv_text)
+        pdf = self.get(key)
+        if pdf is None:
+            with span(SPAN_RENDER, "render_cv_pdf", items=1, bytes_in=len(cv_text.encode("utf-8"))) as current:
+                pdf = render_cv_pdf(cv_text)
+                current.set(bytes_out=len(pdf))
+            self.put(key, pdf)
+        return pdf
+
+    def render_many(self, cv_texts: Iterable[str], max_workers: int = None) -> List[bytes]:
+        """Batch render through the process pool, rendering only texts not already cached"""
+        cv_texts = list(cv_texts)
+        keys = [render_key(cv_text) for cv_text in cv_texts]
+        pdfs = [self.get(key) for key in keys]
+
+        missing = {}
+        for i, pdf in enumerate(pdfs):
+            if pdf is None:
+                missing.setdefault(keys[i], cv_texts[i])
+        if missing:
+            with span(SPAN_RENDER, "render_many", items=len(missing)) as current:
+                rendered = dict(zip(missing, render_many(missing.values(), max_workers=max_workers)))
+                current.set(bytes_out=sum(len(pdf) for pdf in rendered.values()))
+            for key, pdf in rendered.items():
+                self.put(key, pdf)
+            pdfs = [pdf if pdf is not None else rendered[key] for key, pdf in zip(keys, pdfs)]
+        return pdfs
+
+    def stats(self) -> Dict:
+        """Get cache sizes and hit/miss metrics"""
+        with self._lock:
+            hits = self._metrics["memory_hits"] + self._metrics["disk_hits"]
+            lookups = hits + self._metrics["misses"]
+            return {
+                "template_version": TEMPLATE_VERSION,
+                "entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                **self._metrics
+            }
+
+
+_cache: Optional[RenderCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """Return the process-wide render cache, sized by PDF_RENDER_CACHE_BYTES if set"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                max_disk_bytes = int(os.getenv("PDF_RENDER_CACHE_BYTES", DEFAULT_DISK_BYTES))
+                _cache = RenderCache(cache_dir("pdf_render"), max_disk_bytes=max_disk_bytes)
+    return _cache
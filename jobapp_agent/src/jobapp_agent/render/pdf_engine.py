@@ -0,0 +1,184 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Iterable, List, Optional
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever styles or layout change so cached PDFs are not reused
+TEMPLATE_VERSION = "1"
+
+# Built once per process; ParagraphStyle objects are read-only during rendering
+_BASE_STYLES = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CVTitle',
+    parent=_BASE_STYLES['Title'],
+    fontSize=18,
+    spaceAfter=12,
+    alignment=1,  # Center alignment
+    textColor='#333333'
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'CVHeading',
+    parent=_BASE_STYLES['Heading2'],
+    fontSize=14,
+    spaceAfter=8,
+    spaceBefore=12,
+    textColor='#444444',
+    borderWidth=1,
+    borderColor='#CCCCCC',
+    borderPadding=4
+)
+
+NORMAL_STYLE = ParagraphStyle(
+    'CVNormal',
+    parent=_BASE_STYLES['Normal'],
+    fontSize=11,
+    spaceAfter=6,
+    leading=14,
+    textColor='#222222'
+)
+
+BULLET_STYLE = ParagraphStyle(
+    'CVBullet',
+    parent=_BASE_STYLES['Normal'],
+    fontSize=10,
+    spaceAfter=4,
+    leading=12,
+    leftIndent=20,
+    bulletIndent=10,
+    textColor='#333333'
+)
+
+# Common CV section headers, matched anywhere in the lowercased line
+SECTION_HEADERS = [
+    'experience', 'work experience', 'professional experience', 'employment',
+    'education', 'academic background', 'qualifications',
+    'skills', 'technical skills', 'core competencies', 'expertise',
+    'projects', 'key projects', 'notable projects',
+    'certifications', 'certificates', 'awards',
+    'summary', 'profile', 'objective', 'about',
+    'contact', 'contact information', 'personal details',
+    'languages', 'publications', 'references'
+]
+_SECTION_HEADER_RE = re.compile("|".join(re.escape(header) for header in SECTION_HEADERS))
+
+# A line containing any of these is contact details or a header, never the name
+_NOT_NAME_RE = re.compile("|".join(re.escape(keyword) for keyword in
+                                   ['email', 'phone', 'address', 'experience', 'education',
+                                    'skills', '@', 'www', 'http']))
+
+BULLET_PREFIXES = ('•', '-', '*')
+
+
+def is_name_title(line: str, line_index: int) -> bool:
+    """Check if this line is likely the person's name (usually first few lines)"""
+    if line_index > 3:
+        return False
+    if _NOT_NAME_RE.search(line.lower()):
+        return False
+    # Reasonably short and not all caps (unless it's very short)
+    return len(line) < 50 and (not line.isupper() or len(line) < 20)
+
+
+def is_section_header(line: str) -> bool:
+    """Check if this line is a section header"""
+    if _SECTION_HEADER_RE.search(line.lower()):
+        return True
+    # Short, all caps, or ends with a colon
+    return len(line) < 30 and (line.isupper() or line.endswith(':') or line.replace(' ', '').isupper())
+
+
+def build_story(cv_text: str) -> list:
+    """Turn CV text into reportlab flowables, one paragraph per non-empty line"""
+    story = []
+    for i, line in enumerate(cv_text.split('\n')):
+        line = line.strip()
+        if not line:
+            continue
+
+        if is_name_title(line, i):
+            story.append(Paragraph(line, TITLE_STYLE))
+            story.append(Spacer(1, 6))
+        elif is_section_header(line):
+            story.append(Spacer(1, 8))
+            story.append(Paragraph(line.upper(), HEADING_STYLE))
+            story.append(Spacer(1, 4))
+        elif line.startswith(BULLET_PREFIXES):
+            story.append(Paragraph(f"• {line[1:].strip()}", BULLET_STYLE))
+        else:
+            story.append(Paragraph(line, NORMAL_STYLE))
+    return story
+
+
+def render_cv_pdf(cv_text: str) -> bytes:
+    """Render CV text to PDF bytes"""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        topMargin=0.75*inch,
+        bottomMargin=0.75*inch,
+        leftMargin=0.75*inch,
+        rightMargin=0.75*inch
+    )
+    doc.build(build_story(cv_text))
+    return buffer.getvalue()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_render_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=True)
+            # spawn, not fork: callers are multi-threaded (agent runs, fan-out, db pool)
+            _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = max_workers
+            logger.info(f"PDF render pool started with {max_workers} processes")
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the worker processes used by render_many"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+            _pool_workers = 0
+
+
+atexit.register(shutdown_render_pool)
+
+
+def render_many(cv_texts: Iterable[str], max_workers: int = None, chunksize: int = 1) -> List[bytes]:
+    """Render many CVs to PDF, spread over a process pool, in input order.
+
+    reportlab holds the GIL while laying out pages, so threads cannot render in
+    parallel; worker processes can. The pool is kept between calls so worker
+    start-up (and style construction) is paid once per process, not per batch.
+    """
+    cv_texts = list(cv_texts)
+    max_workers = max(1, max_workers or os.cpu_count() or 1)
+    if max_workers == 1 or len(cv_texts) <= 1:
+        return [render_cv_pdf(cv_text) for cv_text in cv_texts]
+    pool = _get_render_pool(max_workers)
+    return list(pool.map(render_cv_pdf, cv_texts, chunksize=chunksize))
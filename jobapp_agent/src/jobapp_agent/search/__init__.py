@@ -0,0 +1,26 @@
+from .rate_limit import AdaptiveRateLimiter, TokenBucket, backoff_delay
+from .cache import (
+    SearchCache,
+    get_search_cache,
+    normalize_query,
+    search_key,
+)
+
+# seen_links needs the database driver and engine the DuckDuckGo client; both are
+# imported on first use so the rate limiter and cache import without them
+_LAZY_EXPORTS = {
+    "SeenLinkIndex": "seen_links",
+    "get_seen_links": "seen_links",
+    "link_hash": "seen_links",
+    "SearchEngine": "engine",
+    "duckduckgo_text": "engine",
+    "get_search_engine": "engine",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(f".{module}", __name__), name)
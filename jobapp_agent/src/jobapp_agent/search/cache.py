@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ..cache_paths import cache_dir
+from ..events import event_bus, SEARCH_CACHE_LOOKUP
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+_MISSING = object()
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, so trivial rewrites still hit"""
+    return " ".join((query or "").lower().split())
+
+
+def search_key(tool: str, query: str, region: str = "", **params: Any) -> str:
+    """Cache key of a search: tool, region, normalized query and any result-shaping params"""
+    extra = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(f"{tool}\0{region or ''}\0{normalize_query(query)}\0{extra}".encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """TTL cache of web search results in a local SQLite file.
+
+    Entries expire ``ttl`` seconds after they were stored; when more than
+    ``max_entries`` are kept the least recently used ones are evicted. SQLite in
+    WAL mode lets the backend and CLI runs share the same file.
+    """
+
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_results (
+                    key TEXT PRIMARY KEY,
+                    tool TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_search_results_accessed_at ON search_results(accessed_at)")
+            self._conn.commit()
+
+    def get(self, key: str) -> Any:
+        """Cached payload for key, or _MISSING if absent or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, stored_at FROM search_results WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM search_results WHERE key = ?", (key,))
+                self._conn.commit()
+                self._metrics["expired"] += 1
+                row = None
+            if row is None:
+                self._metrics["misses"] += 1
+                return _MISSING
+            self._conn.execute("UPDATE search_results SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._metrics["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, tool: str, query: str, payload: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO search_results (key, tool, query, payload, stored_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (key, tool, normalize_query(query), json.dumps(payload, default=str), now, now))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        self._conn.execute("DELETE FROM search_results WHERE stored_at < ?", (time.time() - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute("""
+                DELETE FROM search_results WHERE key IN (
+                    SELECT key FROM search_results ORDER BY accessed_at LIMIT ?
+                )
+            """, (excess,))
+            self._metrics["evictions"] += excess
+
+    def cached(self, tool: str, query: str, search: Callable[[], Any], region: str = "", **params: Any) -> Any:
+        """Return the cached result of a search, running and storing it on a miss.
+
+        Every lookup publishes a SEARCH_CACHE_LOOKUP event so the current run can
+        report its hit/miss counts. Empty results are not cached, since they are
+        more often a transient failure than a real answer.
+        """
+        key = search_key(tool, query, region, **params)
+        payload = self.get(key)
+        hit = payload is not _MISSING
+        event_bus.publish(SEARCH_CACHE_LOOKUP, tool=tool, hit=hit)
+        if hit:
+            return payload
+        payload = search()
+        if payload:
+            self.put(key, tool, query, payload)
+        return payload
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hit_rate": self._metrics["hits"] / lookups if lookups else 0.0,
+                **self._metrics
+            }
+
+
+_cache: Optional[SearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Process-wide search cache, configured by SEARCH_CACHE_TTL (seconds) and SEARCH_CACHE_MAX_ENTRIES"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SearchCache(
+                    cache_dir("search") / "search_cache.sqlite3",
+                    ttl=float(os.getenv("SEARCH_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+                    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                )
+    return _cache
@@ -0,0 +1,151 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from duckduckgo_search import DDGS
+
+from ..dedup import canonicalize_url
+from ..tracing import SPAN_SEARCH, span
+from .cache import SearchCache, get_search_cache
+from .rate_limit import AdaptiveRateLimiter, backoff_delay
+from .seen_links import SeenLinkIndex, get_seen_links
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_RATE = 0.5
+DEFAULT_SEARCH_BURST = 2
+DEFAULT_SEARCH_WORKERS = 4
+DEFAULT_SEARCH_RETRIES = 3
+
+SearchBackend = Callable[[str, int, str], List[Dict[str, Any]]]
+
+
+def duckduckgo_text(query: str, max_results: int, region: str) -> List[Dict[str, Any]]:
+    with DDGS() as ddgs:
+        return list(ddgs.text(
+            keywords=query,
+            max_results=max_results,
+            region=region,
+            safesearch='moderate',
+            timelimit=None
+        ))
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """DuckDuckGo signals rate limiting with RatelimitException (HTTP 202/429)"""
+    return "ratelimit" in type(error).__name__.lower() or "ratelimit" in str(error).lower().replace(" ", "")
+
+
+class SearchEngine:
+    """Runs web searches through a shared adaptive rate limiter.
+
+    ``search`` runs one query, retrying with jittered backoff; ``search_many`` runs
+    several in parallel and merges the results, dropping links already returned
+    by an earlier query. Queries start as fast as the limiter allows instead of
+    after a fixed sleep, so N queries take about N / rate seconds. With a cache,
+    repeated queries are answered locally without using the rate budget. With a
+    seen-link index, postings already saved as jobs are dropped from the results.
+    """
+
+    def __init__(self, backend: SearchBackend, limiter: AdaptiveRateLimiter,
+                 max_workers: int = DEFAULT_SEARCH_WORKERS, max_retries: int = DEFAULT_SEARCH_RETRIES,
+                 cache: Optional[SearchCache] = None, tool_name: str = "duckduckgo",
+                 seen_links: Optional[SeenLinkIndex] = None):
+        self.backend = backend
+        self.limiter = limiter
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max(1, max_retries)
+        self.cache = cache
+        self.tool_name = tool_name
+        self.seen_links = seen_links
+
+    def search(self, query: str, max_results: int, region: str) -> List[Dict[str, Any]]:
+        if self.cache is None:
+            return self._fetch(query, max_results, region)
+        return self.cache.cached(self.tool_name, query, lambda: self._fetch(query, max_results, region),
+                                 region, max_results=max_results)
+
+    def _fetch(self, query: str, max_results: int, region: str) -> List[Dict[str, Any]]:
+        for attempt in range(self.max_retries):
+            self.limiter.acquire()
+            try:
+                with span(SPAN_SEARCH, self.tool_name) as current:
+                    results = self.backend(query, max_results, region)
+                    current.set(items=len(results))
+                self.limiter.recover()
+                return results
+            except Exception as e:
+                if is_rate_limited(e):
+                    rate = self.limiter.throttle()
+                    logger.warning(f"Search rate limited for '{query}', slowing to {rate:.2f} queries/sec")
+                else:
+                    logger.warning(f"Search attempt {attempt + 1} for '{query}' failed: {e}")
+                if attempt == self.max_retries - 1:
+                    raise
+                time.sleep(backoff_delay(attempt))
+        return []
+
+    def search_many(self, queries: List[str], max_results: int, region: str) -> List[Dict[str, Any]]:
+        """Run queries in parallel; results are merged in query order and de-duplicated by link.
+
+        Each result gets a ``query`` key naming the first query that returned it. A
+        failing query is logged and skipped without failing the others.
+        """
+        queries = list(dict.fromkeys(query.strip() for query in queries if query and query.strip()))
+        if not queries:
+            return []
+
+        def run(query: str) -> List[Dict[str, Any]]:
+            try:
+                return self.search(query, max_results, region)
+            except Exception as e:
+                logger.warning(f"Search for '{query}' failed: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(queries)),
+                                thread_name_prefix="web-search") as executor:
+            # Each query runs in a copy of the caller's context so spans and cache events keep the run id
+            futures = [executor.submit(contextvars.copy_context().run, run, query) for query in queries]
+            result_lists = [future.result() for future in futures]
+
+        merged = []
+        seen = set()
+        for query, results in zip(queries, result_lists):
+            for result in results:
+                key = canonicalize_url(result.get("href", "")) or result.get("title", "")
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.append({**result, "query": query})
+        if self.seen_links is not None:
+            merged = self.seen_links.filter_unseen(merged, "href")
+        return merged
+
+
+_engine: Optional[SearchEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_search_engine() -> SearchEngine:
+    """Process-wide DuckDuckGo engine, tuned by DDG_SEARCH_RATE / _BURST / _WORKERS / _RETRIES"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                limiter = AdaptiveRateLimiter(
+                    max_rate=float(os.getenv("DDG_SEARCH_RATE", DEFAULT_SEARCH_RATE)),
+                    capacity=float(os.getenv("DDG_SEARCH_BURST", DEFAULT_SEARCH_BURST)),
+                )
+                _engine = SearchEngine(
+                    duckduckgo_text,
+                    limiter,
+                    max_workers=int(os.getenv("DDG_SEARCH_WORKERS", DEFAULT_SEARCH_WORKERS)),
+                    max_retries=int(os.getenv("DDG_SEARCH_RETRIES", DEFAULT_SEARCH_RETRIES)),
+                    cache=get_search_cache(),
+                    seen_links=get_seen_links(),
+                )
+    return _engine
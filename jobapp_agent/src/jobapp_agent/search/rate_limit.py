@@ -0,0 +1,73 @@
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts of up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"Invalid token bucket: rate={rate}, capacity={capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until tokens are available and take them; returns the seconds waited"""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return time.monotonic() - started
+                # Woken early by set_rate, otherwise sleeps exactly until the deficit refills
+                self._cond.wait((tokens - self._tokens) / self.rate)
+
+    def set_rate(self, rate: float) -> None:
+        with self._cond:
+            self._refill()
+            self.rate = rate
+            self._cond.notify_all()
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """Token bucket whose rate adapts to the remote side (AIMD).
+
+    ``throttle`` halves the rate when the service pushes back and ``recover`` adds
+    a small step after each success, up to ``max_rate``. Shared by all workers, so
+    one rate-limited query slows every query instead of each retrying blindly.
+    """
+
+    def __init__(self, max_rate: float, capacity: float = 1.0, min_rate: float = None,
+                 recovery_step: float = None):
+        super().__init__(max_rate, capacity)
+        self.max_rate = max_rate
+        self.min_rate = min_rate or max_rate / 16
+        self.recovery_step = recovery_step or max_rate / 8
+
+    def throttle(self) -> float:
+        with self._cond:
+            self.set_rate(max(self.min_rate, self.rate / 2))
+            # Drop any saved-up burst so the slower rate takes effect immediately
+            self._tokens = 0.0
+            return self.rate
+
+    def recover(self) -> float:
+        with self._cond:
+            if self.rate < self.max_rate:
+                self.set_rate(min(self.max_rate, self.rate + self.recovery_step))
+            return self.rate
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..cache_paths import cache_dir
+from ..dedup import canonicalize_url
+from ..db.migrations import ensure_schema
+from ..db.pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_SECONDS = 60.0
+FILE_MAGIC = b"SEEN1"
+_HEADER = struct.Struct("<5sq")
+
+
+def link_hash(url: str) -> int:
+    """64-bit hash of a link's canonical form; tracking variants of one posting share it"""
+    canonical = canonicalize_url(url)
+    return int.from_bytes(hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).digest(), "little") if canonical else 0
+
+
+class SeenLinkIndex:
+    """Set of canonical link hashes of every job already in the jobs table.
+
+    Search tools use it to drop postings the database already holds before the
+    researcher LLM reads them. The set is saved to disk with the highest job_id it
+    covers, so a restart only reads jobs inserted since; ``refresh`` catches up
+    the same way at most every ``refresh_seconds``, which also picks up jobs
+    saved by other processes.
+    """
+
+    def __init__(self, path: Path, refresh_seconds: float = DEFAULT_REFRESH_SECONDS):
+        self.path = Path(path)
+        self.refresh_seconds = refresh_seconds
+        self._hashes = set()
+        self._last_job_id = 0
+        self._refreshed_at = 0.0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = self.path.read_bytes()
+            magic, last_job_id = _HEADER.unpack_from(data)
+            if magic != FILE_MAGIC:
+                raise ValueError("unknown file format")
+            hashes = array("Q")
+            hashes.frombytes(data[_HEADER.size:])
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable seen-link index {self.path}: {e}")
+            return
+        self._hashes = set(hashes)
+        self._last_job_id = last_job_id
+
+    def save(self) -> None:
+        """Write the set atomically; readers never see a partial file"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = _HEADER.pack(FILE_MAGIC, self._last_job_id) + array("Q", self._hashes).tobytes()
+            self._dirty = False
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(payload)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            with self._lock:
+                self._dirty = True
+            raise
+
+    def refresh(self, force: bool = False) -> int:
+        """Add jobs inserted since the last refresh; returns how many were read"""
+        if not force and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return 0
+        ensure_schema()
+        with self._lock:
+            last_job_id = self._last_job_id
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT job_id, COALESCE(canonical_link, link)
+                    FROM jobs
+                    WHERE job_id > %s
+                    ORDER BY job_id
+                """, (last_job_id,))
+                rows = cursor.fetchall()
+        with self._lock:
+            for job_id, link in rows:
+                self._hashes.add(link_hash(link))
+                self._last_job_id = max(self._last_job_id, job_id)
+            self._hashes.discard(0)
+            self._refreshed_at = time.monotonic()
+            self._dirty = self._dirty or bool(rows)
+        if rows:
+            logger.info(f"Seen-link index caught up on {len(rows)} jobs ({len(self)} links)")
+        self.save()
+        return len(rows)
+
+    def add(self, links: Iterable[str]) -> None:
+        """Record links of jobs just saved, without waiting for the next refresh, and persist them"""
+        hashes = {link_hash(link) for link in links} - {0}
+        with self._lock:
+            new = hashes - self._hashes
+            self._hashes |= new
+            self._dirty = self._dirty or bool(new)
+        if new:
+            try:
+                self.save()
+            except OSError as e:
+                # The jobs are already saved; the next refresh re-reads them from the database
+                logger.warning(f"Failed to persist seen-link index {self.path}: {e}")
+
+    def __contains__(self, url: str) -> bool:
+        value = link_hash(url)
+        with self._lock:
+            return value != 0 and value in self._hashes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hashes)
+
+    def filter_unseen(self, results: List[Dict[str, Any]], link_key: str) -> List[Dict[str, Any]]:
+        """Drop results whose link is already a saved job; a failed refresh filters on the links known so far"""
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Seen-link index refresh failed: {e}")
+        kept = [result for result in results if result.get(link_key, "") not in self]
+        if len(kept) < len(results):
+            logger.info(f"Dropped {len(results) - len(kept)} search results for jobs already saved")
+        return kept
+
+
+_index: Optional[SeenLinkIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_seen_links() -> SeenLinkIndex:
+    """Process-wide seen-link index, refreshed at most every SEEN_LINKS_REFRESH_SECONDS"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SeenLinkIndex(
+                    cache_dir("search") / "seen_links.bin",
+                    refresh_seconds=float(os.getenv("SEEN_LINKS_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS)),
+                )
+    return _index
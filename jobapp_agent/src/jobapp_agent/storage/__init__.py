@@ -0,0 +1,8 @@
+from .blob_store import (
+    BlobInfo,
+    BlobNotFoundError,
+    BlobStore,
+    FilesystemBlobBackend,
+    PostgresBlobBackend,
+    get_blob_store,
+)
@@ -0,0 +1,336 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from ..db.config import GenerateConfig
+from ..db.pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+ENCODING_IDENTITY = "identity"
+ENCODING_ZLIB = "zlib"
+READ_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass(frozen=True)
+class BlobInfo:
+    sha256: str
+    size: int
+    stored_size: Optional[int]
+    encoding: str
+    created: bool
+
+
+class BlobNotFoundError(KeyError):
+    """Raised when a blob hash is not present in the store"""
+
+
+class FilesystemBlobBackend:
+    """Stores blobs as files under ``root/ab/cd/<sha256>.<encoding>``"""
+
+    def __init__(self, root: str):
+        self.root = Path(root).expanduser().resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, sha256: str, encoding: str) -> Path:
+        return self.root / sha256[:2] / sha256[2:4] / f"{sha256}.{encoding}"
+
+    def _find(self, sha256: str) -> Optional[Path]:
+        for encoding in (ENCODING_ZLIB, ENCODING_IDENTITY):
+            path = self._path(sha256, encoding)
+            if path.exists():
+                return path
+        return None
+
+    def exists(self, sha256: str) -> bool:
+        return self._find(sha256) is not None
+
+    def touch(self, sha256: str) -> bool:
+        """Reset the blob's age so garbage collection treats it as new; False if it is absent"""
+        path = self._find(sha256)
+        if path is None:
+            return False
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def write(self, sha256: str, stored: bytes, encoding: str, size: int) -> bool:
+        path = self._path(sha256, encoding)
+        if path.exists():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(stored)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return True
+
+    def encoding(self, sha256: str) -> str:
+        path = self._find(sha256)
+        if path is None:
+            raise BlobNotFoundError(sha256)
+        return path.suffix[1:]
+
+    def read_stored(self, sha256: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        path = self._find(sha256)
+        if path is None:
+            raise BlobNotFoundError(sha256)
+        with path.open("rb") as handle:
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def delete(self, sha256: str, older_than: Optional[float] = None) -> bool:
+        path = self._find(sha256)
+        if path is None:
+            return False
+        if older_than is None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                return False
+            return True
+
+        # Move the blob out of sight before checking its age: a put touching it
+        # earlier shows in the mtime, and a later put no longer finds it and
+        # stores a fresh copy, so a reused blob is never lost
+        tombstone = path.with_name(f".tmp-gc-{path.name}")
+        try:
+            os.rename(path, tombstone)
+        except FileNotFoundError:
+            return False
+        if tombstone.stat().st_mtime > time.time() - older_than:
+            os.replace(tombstone, path)
+            return False
+        tombstone.unlink()
+        return True
+
+    def list_hashes(self, older_than: float = 0.0) -> Iterator[str]:
+        cutoff = time.time() - older_than
+        for path in self.root.glob("*/*/*.*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            if path.stat().st_mtime <= cutoff:
+                yield path.name.split(".", 1)[0]
+
+
+class PostgresBlobBackend:
+    """Stores blobs in the cv_blobs table, separate from optimized_cvs rows"""
+
+    def exists(self, sha256: str) -> bool:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM cv_blobs WHERE sha256 = %s", (sha256,))
+                return cursor.fetchone() is not None
+
+    def touch(self, sha256: str) -> bool:
+        """Reset the blob's age so garbage collection treats it as new; False if it is absent"""
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("UPDATE cv_blobs SET created_at = NOW() WHERE sha256 = %s", (sha256,))
+                found = cursor.rowcount == 1
+            conn.commit()
+            return found
+
+    def write(self, sha256: str, stored: bytes, encoding: str, size: int) -> bool:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO cv_blobs (sha256, encoding, size_bytes, stored_bytes, data)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (sha256) DO NOTHING
+                """, (sha256, encoding, size, len(stored), stored))
+                created = cursor.rowcount == 1
+            conn.commit()
+            return created
+
+    def encoding(self, sha256: str) -> str:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT encoding FROM cv_blobs WHERE sha256 = %s", (sha256,))
+                row = cursor.fetchone()
+                if row is None:
+                    raise BlobNotFoundError(sha256)
+                return row[0]
+
+    def read_stored(self, sha256: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT stored_bytes FROM cv_blobs WHERE sha256 = %s", (sha256,))
+                row = cursor.fetchone()
+        if row is None:
+            raise BlobNotFoundError(sha256)
+
+        stored_size = row[0]
+        offset = 0
+        while offset < stored_size:
+            # Check out per chunk so a slow consumer does not pin a pooled connection
+            with get_pool().connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT substring(data FROM %s FOR %s) FROM cv_blobs WHERE sha256 = %s",
+                        (offset + 1, chunk_size, sha256)
+                    )
+                    row = cursor.fetchone()
+            chunk = bytes(row[0]) if row else b""
+            if not chunk:
+                break
+            offset += len(chunk)
+            yield chunk
+
+    def delete(self, sha256: str, older_than: Optional[float] = None) -> bool:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                if older_than is None:
+                    cursor.execute("DELETE FROM cv_blobs WHERE sha256 = %s", (sha256,))
+                else:
+                    # Age and references are re-checked in the same statement, so a
+                    # blob reused or referenced since the GC snapshot is kept
+                    cursor.execute("""
+                        DELETE FROM cv_blobs b
+                        WHERE b.sha256 = %s
+                          AND b.created_at <= NOW() - make_interval(secs => %s)
+                          AND NOT EXISTS (SELECT 1 FROM optimized_cvs c WHERE c.cv_sha256 = b.sha256)
+                    """, (sha256, older_than))
+                deleted = cursor.rowcount == 1
+            conn.commit()
+            return deleted
+
+    def list_hashes(self, older_than: float = 0.0) -> Iterator[str]:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT sha256 FROM cv_blobs WHERE created_at <= NOW() - make_interval(secs => %s)",
+                    (older_than,)
+                )
+                hashes = [row[0].strip() for row in cursor.fetchall()]
+        yield from hashes
+
+
+class BlobStore:
+    """Content-addressed, compressed blob storage keyed by SHA-256 of the raw bytes.
+
+    Identical content is stored once; callers keep only the hash and size.
+    """
+
+    def __init__(self, backend, compression_level: int = 6):
+        self.backend = backend
+        self.compression_level = compression_level
+
+    def put(self, data: bytes) -> BlobInfo:
+        """Store data if it is not already present and return its content address.
+
+        A deduplicated hit refreshes the blob's age, so garbage collection cannot
+        delete it between this call and the insert of the row that references it.
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        if self.backend.touch(sha256):
+            return BlobInfo(sha256, len(data), None, self.backend.encoding(sha256), created=False)
+
+        stored, encoding = data, ENCODING_IDENTITY
+        if self.compression_level > 0:
+            compressed = zlib.compress(data, self.compression_level)
+            # Already-compressed content is kept as is
+            if len(compressed) < len(data):
+                stored, encoding = compressed, ENCODING_ZLIB
+
+        created = self.backend.write(sha256, stored, encoding, len(data))
+        return BlobInfo(sha256, len(data), len(stored), encoding, created=created)
+
+    def iter_bytes(self, sha256: str) -> Iterator[bytes]:
+        """Yield the original (decompressed) content in chunks"""
+        encoding = self.backend.encoding(sha256)
+        stored_chunks = self.backend.read_stored(sha256)
+        if encoding == ENCODING_IDENTITY:
+            yield from stored_chunks
+            return
+
+        decompressor = zlib.decompressobj()
+        for chunk in stored_chunks:
+            data = decompressor.decompress(chunk, READ_CHUNK_SIZE)
+            while data:
+                yield data
+                data = decompressor.decompress(decompressor.unconsumed_tail, READ_CHUNK_SIZE)
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    def iter_range(self, sha256: str, start: int, end: int) -> Iterator[bytes]:
+        """Yield the inclusive byte range [start, end] of the original content"""
+        position = 0
+        for chunk in self.iter_bytes(sha256):
+            chunk_end = position + len(chunk)
+            if chunk_end > start:
+                yield chunk[max(start - position, 0):end - position + 1]
+            position = chunk_end
+            if position > end:
+                break
+
+    def get(self, sha256: str) -> bytes:
+        """Return the full original content"""
+        return b"".join(self.iter_bytes(sha256))
+
+    def exists(self, sha256: str) -> bool:
+        return self.backend.exists(sha256)
+
+    def delete(self, sha256: str, older_than: Optional[float] = None) -> bool:
+        """Delete a blob; with older_than, only if it has not been stored or reused more recently"""
+        return self.backend.delete(sha256, older_than)
+
+    def list_hashes(self, older_than: float = 0.0) -> Iterator[str]:
+        return self.backend.list_hashes(older_than)
+
+
+BLOBSTORE_DEFAULTS = {
+    "backend": "postgres",
+    "path": str(Path(__file__).resolve().parents[3] / "knowledge" / "blobs"),
+    "compression_level": "6",
+}
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def load_blobstore_settings() -> Dict[str, str]:
+    """Read the optional [blobstore] section of database.ini, falling back to defaults"""
+    settings = dict(BLOBSTORE_DEFAULTS)
+    try:
+        settings.update(GenerateConfig.config(section="blobstore"))
+    except Exception:
+        pass
+    return settings
+
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store configured in database.ini"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                settings = load_blobstore_settings()
+                if settings["backend"] == "filesystem":
+                    backend = FilesystemBlobBackend(settings["path"])
+                elif settings["backend"] == "postgres":
+                    backend = PostgresBlobBackend()
+                else:
+                    raise ValueError(f"Unknown blobstore backend: {settings['backend']}")
+                _store = BlobStore(backend, compression_level=int(settings["compression_level"]))
+                logger.info(f"Blob store initialised with {settings['backend']} backend")
+    return _store
@@ -0,0 +1,110 @@
+import argparse
+import logging
+
+from ..db.pool import get_pool
+from .blob_store import get_blob_store
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_inline_cvs(batch_size: int = 50) -> int:
+    """Move PDF bytes stored inline in optimized_cvs.cv_data into the blob store.
+
+    Rows keep their cv_sha256/cv_size and have cv_data set to NULL. Each batch is
+    committed separately, so the migration can be interrupted and resumed.
+    """
+    store = get_blob_store()
+    migrated = 0
+    last_cv_id = 0
+
+    while True:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT cv_id, cv_data
+                    FROM optimized_cvs
+                    WHERE cv_data IS NOT NULL AND cv_id > %s
+                    ORDER BY cv_id
+                    LIMIT %s
+                """, (last_cv_id, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+
+                for cv_id, cv_data in rows:
+                    blob = store.put(bytes(cv_data))
+                    cursor.execute("""
+                        UPDATE optimized_cvs
+                        SET cv_sha256 = %s, cv_size = %s, cv_data = NULL
+                        WHERE cv_id = %s
+                    """, (blob.sha256, blob.size, cv_id))
+                    last_cv_id = cv_id
+            conn.commit()
+
+        migrated += len(rows)
+        logger.info(f"Migrated {migrated} CVs to the blob store")
+
+    return migrated
+
+
+def collect_orphaned_blobs(grace_seconds: float = 3600.0, dry_run: bool = False) -> int:
+    """Delete blobs no longer referenced by any optimized_cvs row.
+
+    Blobs younger than grace_seconds are skipped: a writer stores the blob before
+    inserting the row that references it, and a writer reusing an existing blob
+    resets its age. Age and references are checked again at delete time, so a
+    blob picked up by a writer after the snapshot below is kept.
+    """
+    store = get_blob_store()
+
+    with get_pool().connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT DISTINCT cv_sha256 FROM optimized_cvs WHERE cv_sha256 IS NOT NULL")
+            referenced = {row[0].strip() for row in cursor.fetchall()}
+
+    removed = 0
+    for sha256 in store.list_hashes(older_than=grace_seconds):
+        if sha256 in referenced or _is_referenced(sha256):
+            continue
+        if dry_run:
+            logger.info(f"Would delete orphaned blob {sha256}")
+        elif not store.delete(sha256, older_than=grace_seconds):
+            continue
+        removed += 1
+
+    logger.info(f"{'Found' if dry_run else 'Deleted'} {removed} orphaned blobs")
+    return removed
+
+
+def _is_referenced(sha256: str) -> bool:
+    with get_pool().connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM optimized_cvs WHERE cv_sha256 = %s LIMIT 1", (sha256,))
+            return cursor.fetchone() is not None
+
+
+def migrate_cli():
+    """
+    Move inline CV PDFs into the blob store.
+    """
+    parser = argparse.ArgumentParser(description="Move inline optimized_cvs.cv_data into the blob store")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    migrated = migrate_inline_cvs(batch_size=args.batch_size)
+    print(f"Migrated {migrated} CVs. Run VACUUM FULL optimized_cvs to reclaim the freed space.")
+
+
+def gc_cli():
+    """
+    Remove blobs that no CV references anymore.
+    """
+    parser = argparse.ArgumentParser(description="Delete orphaned blobs from the blob store")
+    parser.add_argument("--grace-seconds", type=float, default=3600.0)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    removed = collect_orphaned_blobs(grace_seconds=args.grace_seconds, dry_run=args.dry_run)
+    print(f"{'Found' if args.dry_run else 'Deleted'} {removed} orphaned blobs.")
@@ -0,0 +1,39 @@
+from crewai.tools import BaseTool
+from typing import Type
+from pydantic import BaseModel, Field
+
+from ..cv import get_cv_profile, get_cv_text
+from ..tracing import traced_tool
+
+PROFILE_SECTIONS = ["all", "summary", "skills", "experience", "projects", "education", "languages", "full_text"]
+
+
+class CVProfileToolInput(BaseModel):
+    section: str = Field(
+        default="all",
+        description="Profile section to return: " + ", ".join(f"'{section}'" for section in PROFILE_SECTIONS)
+    )
+
+
+class CVProfileTool(BaseTool):
+    name: str = "cv_profile_tool"
+    description: str = (
+        "Returns the candidate's CV as a compact structured profile: summary, skills, "
+        "experience, projects, education and languages. Request a single section to keep "
+        "the answer short, or 'full_text' for the complete extracted CV text."
+    )
+    args_schema: Type[BaseModel] = CVProfileToolInput
+    file_path: str
+
+    @traced_tool
+    def _run(self, section: str = "all") -> str:
+        try:
+            section = (section or "all").strip().lower()
+            if section not in PROFILE_SECTIONS:
+                return f"Invalid section: {section}. Use one of {', '.join(PROFILE_SECTIONS)}"
+            # Both are extracted once per CV file content and then served from memory
+            if section == "full_text":
+                return get_cv_text(self.file_path)
+            return get_cv_profile(self.file_path).to_text(section) or f"No {section} found in the CV"
+        except Exception as e:
+            return f"Error reading CV profile: {str(e)}"
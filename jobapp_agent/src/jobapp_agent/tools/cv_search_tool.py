@@ -0,0 +1,34 @@
+from crewai.tools import BaseTool
+from typing import Type
+from pydantic import BaseModel, Field
+
+from ..cv import get_cv_index
+from ..tracing import traced_tool
+
+
+class CVSearchToolInput(BaseModel):
+    query: str = Field(..., description="What to look up in the CV, e.g. 'technical skills section'")
+    top_k: int = Field(default=5, description="Number of CV passages to return")
+
+
+class CVSearchTool(BaseTool):
+    name: str = "cv_search_tool"
+    description: str = (
+        "Semantic search over the candidate's CV. Returns the CV passages most relevant "
+        "to the query, e.g. work experience, technical skills, projects or education."
+    )
+    args_schema: Type[BaseModel] = CVSearchToolInput
+    file_path: str
+
+    @traced_tool
+    def _run(self, query: str, top_k: int = 5) -> str:
+        try:
+            # Loaded on first use and reused across agent builds; embeddings are only
+            # recomputed when the CV file or embedding settings change
+            index = get_cv_index(self.file_path)
+            results = index.search(query, k=top_k)
+            if not results:
+                return "No content found in the CV"
+            return "\n\n".join(f"[{i + 1}] {result['chunk']}" for i, result in enumerate(results))
+        except Exception as e:
+            return f"Error searching CV: {str(e)}"
@@ -1,28 +1,34 @@
 from crewai.tools import BaseTool
-from typing import Type, List, Dict, Any
+from typing import Type, List, Dict, Any, Optional
 from pydantic import BaseModel, Field
-from duckduckgo_search import DDGS
-import time
-import random
+from ..search import get_search_engine
+from ..tracing import traced_tool
 
 
 class DuckDuckGoToolInput(BaseModel):
     query: str = Field(..., description="Search query for DuckDuckGo web search")
     max_results: int = Field(default=15, description="Maximum number of search results to return")
     region: str = Field(default="tr-tr", description="Search region (e.g., 'tr-tr' for Turkey, 'us-en' for US)")
+    queries: List[str] = Field(
+        default_factory=list,
+        description="Additional search queries run in parallel with 'query'; results are merged without duplicate links"
+    )
 
 class DuckDuckGoTool(BaseTool):
     name: str = "duckduckgo_search"
     description: str = (
         "Search the web using DuckDuckGo for job postings, company information, and general web content. "
         "Useful for finding job listings, company details, and industry information. "
+        "Pass several queries at once through 'queries' to search them in parallel. "
         "Returns formatted search results with titles, URLs, and snippets."
     )
     args_schema: Type[BaseModel] = DuckDuckGoToolInput
 
-    def _run(self, query: str, max_results: int = 15, region: str = "tr-tr") -> str:
+    @traced_tool
+    def _run(self, query: str, max_results: int = 15, region: str = "tr-tr",
+             queries: Optional[List[str]] = None) -> str:
         try:
-            search_results = self.perform_search(query, max_results, region)
+            search_results = self.perform_search(query, max_results, region, queries)
             
             if not search_results:
                 return f"No search results found for query: '{query}'"
@@ -34,34 +40,11 @@ class DuckDuckGoTool(BaseTool):
         except Exception as e:
             return f"Error performing DuckDuckGo search for '{query}': {str(e)}"
     
-    def perform_search(self, query: str, max_results: int, region: str) -> List[Dict[str, Any]]:
-        max_retries = 3
-        base_delay = 2
-        
-        for attempt in range(max_retries):
-            try:
-                # Add random delay to avoid rate limiting
-                delay = base_delay + random.uniform(0, 2) + (attempt * 2)
-                time.sleep(delay)
-                
-                with DDGS() as ddgs:
-                    # Perform text search
-                    results = list(ddgs.text(
-                        keywords=query,
-                        max_results=max_results,
-                        region=region,
-                        safesearch='moderate',
-                        timelimit=None  # No time limit
-                    ))
-                    
-                    return results
-            except Exception as e:
-                print(f"DuckDuckGo search attempt {attempt + 1} failed: {e}")
-                if attempt == max_retries - 1:
-                    return []
-                time.sleep(base_delay * (attempt + 1))
-        
-        return []
+    def perform_search(self, query: str, max_results: int, region: str,
+                       queries: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        # Rate limiting and retries live in the shared engine, so parallel tool calls
+        # and multi-query calls all draw from the same request budget
+        return get_search_engine().search_many([query] + list(queries or []), max_results, region)
     
     def format_search_results(self, results: List[Dict[str, Any]], query: str) -> str:
         if not results:
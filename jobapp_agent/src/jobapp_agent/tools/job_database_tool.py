@@ -2,11 +2,24 @@ from crewai.tools import BaseTool
 from typing import Type, List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 from ..db.database import CrewAIJobStorage
+from ..db.bulk import bulk_insert_jobs
+from ..db.migrations import ensure_schema
+from ..db.notify import notify_data_changed
+from ..events import event_bus, JOBS_SAVED, CV_SAVED
+from ..storage import get_blob_store
+from ..dedup import Fingerprint, fingerprint_job, load_candidates
+from ..cv import get_cv_profile
+from ..cv.scoring import load_match_threshold, rank_jobs
+from ..search.seen_links import get_seen_links
+from ..tracing import traced_tool
 from datetime import datetime
 from psycopg2 import DatabaseError
 
 import re
 
+# A claim older than this is assumed to be left by a crashed process and can be taken over
+CLAIM_TTL_SECONDS = 6 * 60 * 60
+
 
 class JobDatabaseToolInput(BaseModel):
     action: str = Field(..., description="Action: 'save_jobs', 'get_unprocessed_jobs', 'save_cv_and_mark_processed'")
@@ -22,14 +35,17 @@ class JobDatabaseTool(BaseTool):
         "1. 'save_jobs': Save job listings to database\n"
         "   - Requires: jobs_list with job objects\n\n"
         "2. 'get_unprocessed_jobs': Get jobs where is_processed = FALSE\n"
-        "   - Returns: Job details for CV optimization\n\n"
+        "   - Returns: Job details for CV optimization, best match first, each with its\n"
+        "     precomputed match_score and matched/missing skills\n\n"
         "3. 'save_cv_and_mark_processed': Save optimized CV and mark job as processed\n"
         "   - Requires: job_id, cv_data (bytes), match_score\n"
         "   - Saves CV to optimized_cvs table AND marks job as processed\n\n"
         "All operations handle schema creation and use transactions for data integrity."
     )
     args_schema: Type[BaseModel] = JobDatabaseToolInput
+    cv_path: Optional[str] = None
 
+    @traced_tool
     def _run(self, action: str, jobs_list: Optional[List[Dict[str,Any]]] = None, job_id: Optional[int] = None, cv_data: Optional[bytes] = None, match_score: Optional[int] = None) -> str:
         try:
             if action in ["save_jobs","save jobs","save Jobs","Save jobs"]:
@@ -102,64 +118,159 @@ class JobDatabaseTool(BaseTool):
                 if prepared_job:
                     prepared_jobs.append(prepared_job)
                     
+            if not self.check_schema():
+                return "Failed to ensure database schema exists"
+            
             with CrewAIJobStorage() as db:
-                if not self.check_schema(db):
-                    return "Failed to ensure database schema exists"
+                for job in prepared_jobs:
+                    fingerprint_job(job)
+                index = load_candidates(db.cursor, prepared_jobs)
                 
-                insert_query = """
-                    INSERT INTO jobs (title, company, link, descript, source, scraped_date)
-                    VALUES (%(title)s, %(company)s, %(link)s, %(snippet)s, %(source)s, 
-                            TO_DATE(%(scraped_date)s, 'DD/MM/YYYY'))
-                    ON CONFLICT (company, title, link) DO NOTHING
-                """
+                # Near-duplicates are stored but linked to their canonical job, so they are
+                # not queued for another CV generation pass. A posting duplicating another
+                # one from this batch waits for a second pass, once that job has an id.
+                first_pass, second_pass = [], []
+                pending = {}
+                for job in prepared_jobs:
+                    match = index.find(job['title'], job['canonical_link'], job['posting_key'], job['simhash'])
+                    if match is None:
+                        job['duplicate_of'] = None
+                        fingerprint = Fingerprint(None, job['title'], job['canonical_link'],
+                                                  job['posting_key'], job['simhash'])
+                        index.add(fingerprint)
+                        pending[(job['company'], job['title'], job['link'])] = fingerprint
+                        first_pass.append(job)
+                    elif match.job_id is None:
+                        second_pass.append((job, match))
+                    else:
+                        job['duplicate_of'] = match.job_id
+                        first_pass.append(job)
                 
-                db.cursor.executemany(insert_query, prepared_jobs)
+                inserted_rows = bulk_insert_jobs(db.cursor, first_pass)
+                for job_id, company, title, link, _ in inserted_rows:
+                    if (company, title, link) in pending:
+                        pending[(company, title, link)].job_id = job_id
                 
-                inserted_count = db.cursor.rowcount
-                duplicate_count = len(prepared_jobs) - inserted_count
+                for job, match in second_pass:
+                    # None if the canonical posting itself already existed and was skipped
+                    job['duplicate_of'] = match.job_id
+                inserted_rows += bulk_insert_jobs(db.cursor, [job for job, _ in second_pass])
                 
+                inserted_ids = [row[0] for row in inserted_rows if row[4] is None]
+                linked_ids = [row[0] for row in inserted_rows if row[4] is not None]
+                inserted_count, linked_count = len(inserted_ids), len(linked_ids)
+                duplicate_count = len(prepared_jobs) - inserted_count - linked_count
+                
+                notify_data_changed(db.cursor, "jobs")
                 db.conn.commit()
                 
-                return f"Successfully saved {inserted_count} jobs to database. Skipped {duplicate_count} duplicates."
+                # Later searches in this run skip these postings without waiting for a refresh
+                get_seen_links().add(job['link'] for job in prepared_jobs)
+                
+                event_bus.publish(JOBS_SAVED, inserted=inserted_count, linked=linked_count, skipped=duplicate_count,
+                                  inserted_ids=inserted_ids, linked_ids=linked_ids)
+                
+                return (f"Successfully saved {inserted_count} jobs to database (job IDs: {inserted_ids}). "
+                        f"Linked {linked_count} near-duplicates to existing jobs (job IDs: {linked_ids}). "
+                        f"Skipped {duplicate_count} duplicates.")
             
         except DatabaseError as e:
             return f"Failed to save jobs - maximum retries exceeded {e}"
     
     def query_unprocessed_jobs(self):
         try:
-            with CrewAIJobStorage() as db:
-                if not self.check_schema(db):
-                    return "Failed to ensure database schema exists"
+            jobs = self.fetch_unprocessed_jobs()
+            if jobs is None:
+                return "Failed to ensure database schema exists"
+            if not jobs:
+                return "No unprocessed jobs found in database"
+            if not self.cv_path:
+                return {"status": "success", "count": len(jobs), "jobs": jobs}
             
-                query = """
-                    SELECT job_id, title, company, descript, link, scraped_date
-                    FROM jobs 
-                    WHERE is_processed = FALSE 
-                    ORDER BY scraped_date DESC 
-                """
-                
-                db.cursor.execute(query)
-                jobs = db.cursor.fetchall()
-                
-                if not jobs:
-                    return "No unprocessed jobs found in database"
-                
-                job_list = []
-                for job in jobs:
-                    job_dict = {
-                        "job_id": job[0],
-                        "title": job[1],
-                        "company": job[2], 
-                        "description": job[3],
-                        "link": job[4],
-                        "scraped_date": str(job[5])
-                    }
-                    job_list.append(job_dict)
-                    
-                return {"status": "success", "count": len(jobs), "jobs": job_list}   
+            # Scored and ranked the same way as the per-job optimizer runs, so the LLM never computes the score
+            threshold = load_match_threshold()
+            ranked, skipped = rank_jobs(jobs, get_cv_profile(self.cv_path), threshold=threshold)
+            return {
+                "status": "success",
+                "count": len(ranked),
+                "jobs": [{**job, "match_score": score.match_score,
+                          "matched_skills": score.matched_skills, "missing_skills": score.missing_skills}
+                         for job, score in ranked],
+                "skipped_below_threshold": [{"job_id": score.job_id, "match_score": score.match_score}
+                                            for score in skipped],
+                "match_threshold": threshold,
+            }
         except DatabaseError as e:
             print(f"Error querying table: {e}")
     
+    def fetch_unprocessed_jobs(self) -> Optional[List[Dict[str, Any]]]:
+        """Unprocessed jobs not claimed by a running CV generation, newest first; None if the schema could not be ensured"""
+        if not self.check_schema():
+            return None
+        
+        with CrewAIJobStorage() as db:
+            query = """
+                SELECT job_id, title, company, descript, link, scraped_date
+                FROM jobs 
+                WHERE is_processed = FALSE AND duplicate_of IS NULL
+                  AND (claimed_by IS NULL OR claimed_at < NOW() - make_interval(secs => %s))
+                ORDER BY scraped_date DESC 
+            """
+            
+            db.cursor.execute(query, (CLAIM_TTL_SECONDS,))
+            return [self._job_dict(job) for job in db.cursor.fetchall()]
+    
+    def claim_unprocessed_jobs(self, claimed_by: str) -> Optional[List[Dict[str, Any]]]:
+        """Atomically claim unprocessed jobs for one run and return them, newest first.
+
+        Jobs claimed by another run are skipped until released or CLAIM_TTL_SECONDS
+        old (a claim left by a crashed process), so two concurrent runs never
+        generate CVs for the same job. None if the schema could not be ensured.
+        """
+        if not self.check_schema():
+            return None
+        
+        with CrewAIJobStorage() as db:
+            db.cursor.execute("""
+                UPDATE jobs SET claimed_by = %s, claimed_at = NOW()
+                WHERE job_id IN (
+                    SELECT job_id FROM jobs
+                    WHERE is_processed = FALSE AND duplicate_of IS NULL
+                      AND (claimed_by IS NULL OR claimed_at < NOW() - make_interval(secs => %s))
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING job_id, title, company, descript, link, scraped_date
+            """, (claimed_by, CLAIM_TTL_SECONDS))
+            jobs = db.cursor.fetchall()
+            db.conn.commit()
+        
+        jobs.sort(key=lambda job: str(job[5] or ""), reverse=True)
+        return [self._job_dict(job) for job in jobs]
+    
+    def release_job_claims(self, claimed_by: str) -> None:
+        """Release every job still claimed by a run, processed or not"""
+        with CrewAIJobStorage() as db:
+            db.cursor.execute("UPDATE jobs SET claimed_by = NULL, claimed_at = NULL WHERE claimed_by = %s",
+                              (claimed_by,))
+            db.conn.commit()
+    
+    @staticmethod
+    def _job_dict(job) -> Dict[str, Any]:
+        return {
+            "job_id": job[0],
+            "title": job[1],
+            "company": job[2], 
+            "description": job[3],
+            "link": job[4],
+            "scraped_date": str(job[5])
+        }
+    
+    def is_job_processed(self, job_id: int) -> bool:
+        with CrewAIJobStorage() as db:
+            db.cursor.execute("SELECT is_processed FROM jobs WHERE job_id = %s", (job_id,))
+            row = db.cursor.fetchone()
+            return bool(row and row[0])
+    
     def _save_cv_and_mark_processed(self, job_id: int, cv_data: bytes, match_score: int) -> str:
         return self.save_optimized_cv(job_id, cv_data, match_score)
     
@@ -167,19 +278,26 @@ class JobDatabaseTool(BaseTool):
         if not job_id or not cv_data or match_score is None:
             return "Missing required parameters: job_id, cv_data, and match_score are all required"
 
+        cv_bytes = cv_data.encode('utf-8') if isinstance(cv_data, str) else bytes(cv_data)
+
         try:
+            if not self.check_schema():
+                return "Failed to ensure database schema exists"
+            
+            # Stored (or deduplicated, which resets the blob's age) before the row is
+            # written, and before checking out the storage connection since the postgres
+            # backend uses its own; blobs left behind by a failed transaction are removed by gc_cv_blobs
+            blob = get_blob_store().put(cv_bytes)
+            
             with CrewAIJobStorage() as db:
-                if not self.check_schema(db):
-                    return "Failed to ensure database schema exists"
-                
                 try:
                     cv_insert_query = """
-                        INSERT INTO optimized_cvs (job_id, cv_data, match_score)
-                        VALUES (%s, %s, %s)
+                        INSERT INTO optimized_cvs (job_id, match_score, cv_sha256, cv_size)
+                        VALUES (%s, %s, %s, %s)
                         RETURNING cv_id
                     """
                     
-                    db.cursor.execute(cv_insert_query, (job_id, cv_data, match_score))
+                    db.cursor.execute(cv_insert_query, (job_id, match_score, blob.sha256, blob.size))
                     cv_id = db.cursor.fetchone()[0]
                     
                     job_update_query = """
@@ -194,8 +312,11 @@ class JobDatabaseTool(BaseTool):
                         db.conn.rollback()
                         return f"Job ID {job_id} not found in database"
                 
+                    notify_data_changed(db.cursor, "optimized_cvs")
                     db.conn.commit()
                     
+                    event_bus.publish(CV_SAVED, job_id=job_id, cv_id=cv_id, match_score=match_score)
+                    
                     return f"SUCCESS: CV saved (ID: {cv_id}) and job {job_id} marked as processed. Match score: {match_score}"
                     
                 except DatabaseError as e:
@@ -205,29 +326,13 @@ class JobDatabaseTool(BaseTool):
         except Exception as e:
             return f"Error saving CV and marking job processed: {str(e)}"
         
-    def check_schema(self, db) -> bool:
+    def check_schema(self) -> bool:
+        # Migrations run once per process (at backend startup or on first use);
+        # after that this is a flag check with no catalog queries. The first check
+        # uses its own pooled connection, so call it before opening CrewAIJobStorage.
         try:
-            check_query = """
-                SELECT 
-                    (SELECT EXISTS (
-                        SELECT FROM information_schema.tables 
-                        WHERE table_name = 'jobs'
-                    )) as jobs_exists,
-                    (SELECT EXISTS (
-                        SELECT FROM information_schema.tables 
-                        WHERE table_name = 'optimized_cvs'
-                    )) as cvs_exists;
-            """
-            db.cursor.execute(check_query)
-            result = db.cursor.fetchone()
-            jobs_exists, cvs_exists = result
-            
-            if not jobs_exists or not cvs_exists:
-                print(f"Tables status - jobs: {jobs_exists}, optimized_cvs: {cvs_exists}")
-                db.create_schema()
-                print("Missing tables created successfully")
-                
+            ensure_schema()
             return True
         except DatabaseError as e:
-            print(f"Error checking/creating schema: {e}")
-            return False
\ No newline at end of file
+            print(f"Error applying schema migrations: {e}")
+            return False
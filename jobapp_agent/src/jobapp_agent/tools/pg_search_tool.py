@@ -0,0 +1,10 @@
+from crewai_tools import PGSearchTool
+from ..tracing import traced_tool
+
+
+class TracedPGSearchTool(PGSearchTool):
+    """PGSearchTool whose semantic searches over the jobs table are traced like the other tools"""
+
+    @traced_tool
+    def _run(self, *args, **kwargs):
+        return super()._run(*args, **kwargs)
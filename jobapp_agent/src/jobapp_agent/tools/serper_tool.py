@@ -0,0 +1,37 @@
+from crewai_tools import SerperDevTool
+from ..search import get_search_cache, get_seen_links
+from ..tracing import SPAN_SEARCH, span, traced_tool
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """SerperDevTool answering repeated queries from the shared search cache.
+
+    Research runs generate nearly the same queries from the same CV, so cached
+    responses save both latency and Serper API credits until they expire. Organic
+    results for jobs already in the database are dropped before the agent reads them.
+    """
+
+    @traced_tool
+    def _run(self, **kwargs):
+        results = super()._run(**kwargs)
+        if isinstance(results, dict) and results.get("organic"):
+            results["organic"] = get_seen_links().filter_unseen(results["organic"], "link")
+        return results
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        return get_search_cache().cached(
+            "serper",
+            search_query,
+            lambda: self._fetch(search_query, search_type),
+            region=self.country or "",
+            search_type=search_type,
+            n_results=self.n_results,
+            location=self.location or "",
+            locale=self.locale or "",
+        )
+
+    def _fetch(self, search_query: str, search_type: str) -> dict:
+        with span(SPAN_SEARCH, "serper") as current:
+            results = super()._make_api_request(search_query, search_type)
+            current.set(items=len(results.get("organic", [])) if isinstance(results, dict) else 0)
+            return results
@@ -0,0 +1,218 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .events import current_run_id
+
+logger = logging.getLogger(__name__)
+
+SPAN_TOOL = "tool"
+SPAN_LLM = "llm"
+SPAN_TASK = "task"
+SPAN_DB = "db"
+SPAN_SEARCH = "search"
+SPAN_EMBEDDING = "embedding"
+SPAN_RENDER = "render"
+
+# Numeric span attributes summed into counters; anything else is ignored by the aggregates
+COUNTED_ATTRIBUTES = ("prompt_tokens", "completion_tokens", "bytes_in", "bytes_out", "items")
+DURATION_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+MAX_TRACKED_RUNS = 100
+
+
+class Span:
+    """One timed operation; attributes such as token counts can be added while it is open"""
+
+    def __init__(self, kind: str, name: str, **attributes: Any):
+        self.kind = kind
+        self.name = name
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self.status = "ok"
+        self.run_id = current_run_id.get()
+        self.started = time.perf_counter()
+        self.duration = 0.0
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, **counts: int) -> None:
+        for key, value in counts.items():
+            self.attributes[key] = self.attributes.get(key, 0) + (value or 0)
+
+
+def _empty_totals() -> Dict[str, float]:
+    return {"count": 0, "errors": 0, "seconds": 0.0, **{key: 0 for key in COUNTED_ATTRIBUTES}}
+
+
+class Tracer:
+    """Aggregates finished spans process-wide (for /metrics) and per agent run.
+
+    Spans are grouped by (kind, name, status) with a duration histogram and
+    counter sums; per-run totals are kept for the most recent MAX_TRACKED_RUNS
+    runs so the run queue can store them in the run summary.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS, max_runs: int = MAX_TRACKED_RUNS):
+        self.buckets = buckets
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._runs: "OrderedDict[str, Dict[str, Dict[str, float]]]" = OrderedDict()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            series = self._series.get((span.kind, span.name, span.status))
+            if series is None:
+                series = {"bucket_counts": [0] * len(self.buckets), **_empty_totals()}
+                self._series[(span.kind, span.name, span.status)] = series
+            for i, bound in enumerate(self.buckets):
+                if span.duration <= bound:
+                    series["bucket_counts"][i] += 1
+            self._accumulate(series, span)
+
+            if span.run_id is not None:
+                run = self._runs.get(span.run_id)
+                if run is None:
+                    run = self._runs[span.run_id] = {}
+                    while len(self._runs) > self.max_runs:
+                        self._runs.popitem(last=False)
+                totals = run.setdefault(f"{span.kind}:{span.name}", _empty_totals())
+                self._accumulate(totals, span)
+
+    @staticmethod
+    def _accumulate(totals: Dict[str, Any], span: Span) -> None:
+        totals["count"] += 1
+        totals["seconds"] += span.duration
+        if span.status != "ok":
+            totals["errors"] += 1
+        for key in COUNTED_ATTRIBUTES:
+            value = span.attributes.get(key)
+            if isinstance(value, (int, float)):
+                totals[key] += value
+
+    def run_summary(self, run_id: str) -> Dict[str, Dict[str, float]]:
+        """Per-span totals of one run, keyed by "kind:name" and slowest first"""
+        with self._lock:
+            run = self._runs.get(run_id, {})
+            items = sorted(run.items(), key=lambda item: item[1]["seconds"], reverse=True)
+            return {key: {**totals, "seconds": round(totals["seconds"], 3)} for key, totals in items}
+
+    def render_prometheus(self) -> List[str]:
+        """Span metrics in the Prometheus text exposition format, one line per entry"""
+        with self._lock:
+            series = {key: {**value, "bucket_counts": list(value["bucket_counts"])}
+                      for key, value in self._series.items()}
+
+        lines = [
+            "# HELP jobapp_span_duration_seconds Duration of traced operations",
+            "# TYPE jobapp_span_duration_seconds histogram",
+        ]
+        for (kind, name, status), value in sorted(series.items()):
+            labels = f'kind="{_escape(kind)}",name="{_escape(name)}",status="{status}"'
+            for bound, count in zip(self.buckets, value["bucket_counts"]):
+                lines.append(f'jobapp_span_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'jobapp_span_duration_seconds_bucket{{{labels},le="+Inf"}} {value["count"]}')
+            lines.append(f"jobapp_span_duration_seconds_sum{{{labels}}} {value['seconds']:.6f}")
+            lines.append(f"jobapp_span_duration_seconds_count{{{labels}}} {value['count']}")
+
+        counters = [
+            ("jobapp_span_tokens_total", "LLM tokens used by traced operations", "type",
+             (("prompt", "prompt_tokens"), ("completion", "completion_tokens"))),
+            ("jobapp_span_payload_bytes_total", "Payload sizes of traced operations", "direction",
+             (("in", "bytes_in"), ("out", "bytes_out"))),
+        ]
+        for metric, help_text, label, fields in counters:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for (kind, name, status), value in sorted(series.items()):
+                for label_value, field in fields:
+                    if value[field]:
+                        lines.append(f'{metric}{{kind="{_escape(kind)}",name="{_escape(name)}",'
+                                     f'status="{status}",{label}="{label_value}"}} {value[field]}')
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+tracer = Tracer()
+
+
+@contextmanager
+def span(kind: str, name: str, **attributes: Any) -> Iterator[Span]:
+    """Time the enclosed block as a span attributed to the current run"""
+    current = Span(kind, name, **attributes)
+    try:
+        yield current
+    except BaseException:
+        current.status = "error"
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.started
+        try:
+            tracer.record(current)
+        except Exception as e:
+            logger.warning(f"Failed to record {kind} span {name}: {e}")
+
+
+def payload_size(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    try:
+        return len(json.dumps(value, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(value).encode("utf-8"))
+
+
+def traced_tool(run: Callable) -> Callable:
+    """Decorator for a tool's _run: one span per call, named after the tool, with payload sizes"""
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        with span(SPAN_TOOL, getattr(self, "name", type(self).__name__),
+                  bytes_in=payload_size([args, kwargs])) as current:
+            result = run(self, *args, **kwargs)
+            current.set(bytes_out=payload_size(result))
+            return result
+    return wrapper
+
+
+_crewai_listeners_installed = False
+_crewai_listeners_lock = threading.Lock()
+
+
+def install_crewai_listeners() -> None:
+    """Record a span for every crewAI task from its start/end times; safe to call repeatedly.
+
+    crewAI emits task events synchronously on the thread running the task, so the
+    spans are attributed to the current run like any other.
+    """
+    global _crewai_listeners_installed
+    with _crewai_listeners_lock:
+        if _crewai_listeners_installed:
+            return
+        from crewai.utilities.events import TaskCompletedEvent, TaskFailedEvent, crewai_event_bus
+
+        def on_task_finished(source, event):
+            task = event.task or source
+            current = Span(SPAN_TASK, getattr(task, "name", None) or str(getattr(task, "description", ""))[:60])
+            if getattr(task, "start_time", None) and getattr(task, "end_time", None):
+                current.duration = (task.end_time - task.start_time).total_seconds()
+            if isinstance(event, TaskFailedEvent):
+                current.status = "error"
+            else:
+                current.set(bytes_out=payload_size(getattr(event.output, "raw", None)))
+            tracer.record(current)
+
+        crewai_event_bus.on(TaskCompletedEvent)(on_task_finished)
+        crewai_event_bus.on(TaskFailedEvent)(on_task_finished)
+        _crewai_listeners_installed = True
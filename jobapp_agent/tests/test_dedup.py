@@ -0,0 +1,108 @@
+import pytest
+
+from jobapp_agent.dedup import (
+    MAX_HAMMING_DISTANCE,
+    Fingerprint,
+    FingerprintIndex,
+    bands,
+    canonicalize_url,
+    hamming_distance,
+    posting_key,
+    simhash,
+)
+
+DESCRIPTION = (
+    "We are looking for a data engineer to build and maintain batch and streaming pipelines "
+    "on Spark and Kafka, model our warehouse in dbt and work closely with analysts on reporting."
+)
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.example.com/jobs/123/?utm_source=x&ref=feed", "https://example.com/jobs/123"),
+    ("http://m.example.com//jobs///123", "https://example.com/jobs/123"),
+    ("https://example.com/search?b=2&a=1&gclid=abc", "https://example.com/search?a=1&b=2"),
+    ("https://tr.linkedin.com/jobs/view/senior-data-engineer-at-acme-3912345678/?trk=public",
+     "https://linkedin.com/jobs/view/3912345678"),
+    ("https://EXAMPLE.com", "https://example.com/"),
+    ("", ""),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_posting_key_ignores_legal_forms_and_title_noise():
+    assert posting_key("Data Engineer (m/f/d)", "Acme GmbH") == posting_key("data engineer", "ACME")
+    assert posting_key("Data Engineer", "Acme") != posting_key("Data Analyst", "Acme")
+    assert posting_key("", "Acme") == ""
+
+
+def test_simhash_is_deterministic_and_fits_bigint():
+    value = simhash("Data Engineer", "Acme", DESCRIPTION)
+    assert value == simhash("Data Engineer", "Acme", DESCRIPTION)
+    assert -(1 << 63) <= value < (1 << 63)
+
+
+def test_simhash_keeps_reworded_postings_close():
+    original = simhash("Data Engineer", "Acme", DESCRIPTION)
+    reworded = simhash("Data Engineer", "Acme", DESCRIPTION + " Apply now!")
+    unrelated = simhash("Pastry Chef", "Bakery", "Bake bread and pastries every morning in our shop.")
+    assert hamming_distance(original, reworded) <= MAX_HAMMING_DISTANCE
+    assert hamming_distance(original, unrelated) > MAX_HAMMING_DISTANCE
+
+
+def test_bands_split_unsigned_value():
+    assert bands(-1) == [0xFFFF] * 4
+    assert bands(0x0004000300020001) == [1, 2, 3, 4]
+
+
+def _fingerprint(job_id, title="Data Engineer", link="", key="", description=DESCRIPTION):
+    return Fingerprint(job_id, title, link, key, simhash(title, "Acme", description))
+
+
+def test_find_matches_canonical_link_first():
+    index = FingerprintIndex()
+    by_link = _fingerprint(1, link="https://example.com/jobs/1")
+    index.add(by_link)
+    index.add(_fingerprint(2, key="k"))
+    assert index.find("Anything", "https://example.com/jobs/1", "k", 0) is by_link
+
+
+def test_find_matches_posting_key_with_similar_description():
+    index = FingerprintIndex()
+    existing = _fingerprint(7, link="https://a.example/1", key="key")
+    index.add(existing)
+    cross_posted = simhash("Data Engineer", "Acme", DESCRIPTION + " Apply now!")
+    assert index.find("Data Engineer", "https://b.example/2", "key", cross_posted) is existing
+
+
+def test_find_keeps_same_title_with_different_description():
+    index = FingerprintIndex()
+    index.add(_fingerprint(7, link="https://a.example/1", key="key"))
+    other_city = simhash("Data Engineer", "Acme", "Join our Berlin office to run the payments ledger in Go "
+                                                 "and Postgres, with on-call rotations and mentoring duties.")
+    assert index.find("Data Engineer", "https://b.example/2", "key", other_city) is None
+
+
+def test_find_matches_near_duplicate_simhash_with_overlapping_title():
+    index = FingerprintIndex()
+    existing = _fingerprint(3, link="https://a.example/1")
+    index.add(existing)
+    candidate = simhash("Data Engineer", "Acme", DESCRIPTION + " Apply now!")
+    assert index.find("Senior Data Engineer", "https://b.example/2", "", candidate) is existing
+    # Same text but an unrelated title is not a duplicate
+    assert index.find("Office Manager", "https://b.example/2", "", candidate) is None
+
+
+def test_find_returns_new_posting_as_none():
+    index = FingerprintIndex()
+    index.add(_fingerprint(3, link="https://a.example/1"))
+    unrelated = simhash("Pastry Chef", "Bakery", "Bake bread and pastries every morning in our shop.")
+    assert index.find("Pastry Chef", "https://b.example/2", "", unrelated) is None
+
+
+def test_find_matches_unsaved_batch_entries_by_identity():
+    index = FingerprintIndex()
+    first, second = _fingerprint(None, link="https://a.example/1"), _fingerprint(None, link="https://a.example/2")
+    index.add(first)
+    index.add(second)
+    assert index.find("Data Engineer", "", "", first.simhash) is first
@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from jobapp_agent.search.rate_limit import AdaptiveRateLimiter, TokenBucket, backoff_delay
+
+
+@pytest.mark.parametrize("rate, capacity", [(0, 1), (-1, 1), (1, 0.5)])
+def test_token_bucket_rejects_invalid_settings(rate, capacity):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, capacity)
+
+
+def test_token_bucket_allows_burst_then_waits_for_refill():
+    bucket = TokenBucket(rate=20, capacity=3)
+    assert all(bucket.acquire() < 0.01 for _ in range(3))
+    waited = bucket.acquire()
+    assert 0.03 <= waited < 0.5
+
+
+def test_set_rate_wakes_blocked_acquire():
+    bucket = TokenBucket(rate=0.1, capacity=1)
+    bucket.acquire()
+    done = threading.Event()
+    waiter = threading.Thread(target=lambda: (bucket.acquire(), done.set()))
+    waiter.start()
+    time.sleep(0.05)
+    bucket.set_rate(100)
+    assert done.wait(1.0)
+    waiter.join()
+
+
+def test_throttle_halves_rate_down_to_minimum():
+    limiter = AdaptiveRateLimiter(max_rate=8, min_rate=1)
+    assert [limiter.throttle() for _ in range(5)] == [4, 2, 1, 1, 1]
+
+
+def test_throttle_drops_saved_burst():
+    limiter = AdaptiveRateLimiter(max_rate=20, capacity=5)
+    limiter.throttle()
+    assert limiter.acquire() >= 0.05
+
+
+def test_recover_steps_back_up_to_max_rate():
+    limiter = AdaptiveRateLimiter(max_rate=8, min_rate=1, recovery_step=1.5)
+    limiter.throttle()
+    limiter.throttle()
+    assert [limiter.recover() for _ in range(4)] == [3.5, 5.0, 6.5, 8]
+    assert limiter.recover() == 8
+
+
+def test_defaults_derive_from_max_rate():
+    limiter = AdaptiveRateLimiter(max_rate=16)
+    assert limiter.min_rate == 1
+    assert limiter.recovery_step == 2
+
+
+@pytest.mark.parametrize("attempt, cap", [(0, 1), (1, 2), (3, 8), (10, 30)])
+def test_backoff_delay_is_bounded(attempt, cap):
+    delays = [backoff_delay(attempt) for _ in range(200)]
+    assert all(0 <= delay <= cap for delay in delays)